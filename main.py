@@ -1,23 +1,174 @@
 # Main entry point for TikTok Planets System
 # Aplicación principal que inicia el sistema de planetas para TikTok Lives
 
+import os
 import sys
+import sqlite3
+import argparse
 import pygame
 from src.ui.main_window import MainWindow
 from src.core.session_manager import SessionManager
+from src.core.session_replay import SessionReplay
+from src.core.donation_importer import DonationImporter, ImportReport
+from src.database.database_manager import DatabaseManager
+from src.database.session_compactor import SessionCompactor
+from src.database.session_exporter import FORMAT_EXTENSIONS, SessionExporter
+from src.utils.config import config_manager
+
+def _print_import_progress(report: ImportReport):
+    print(f"\rImportando {report.path}: {report.fraction * 100:5.1f}% "
+          f"({report.imported} filas, {report.rows_per_second:.0f} filas/s)", end="", flush=True)
+
+def import_donation_log(main_window: MainWindow, session_manager: SessionManager, path: str):
+    """
+    Importa un registro de donaciones antes de abrir la ventana
+    """
+    importer = DonationImporter(main_window.planet_system, session_manager.db_manager,
+                                progress_callback=_print_import_progress)
+    try:
+        report = importer.import_file(path)
+    except (OSError, ValueError, OverflowError) as e:
+        print(f"Error importando {path}: {e}")
+        return
+    print()
+    print(f"Importadas {report.imported} donaciones ({report.rejected} rechazadas, "
+          f"{report.planets_created} planetas nuevos) en {report.elapsed_seconds:.1f}s")
+    for row, message in report.errors[:10]:
+        print(f"  fila {row}: {message}")
+    if not report.committed:
+        print("Error: la importación no se guardó en la base de datos")
+
+def export_session(db_path: str, session_id: str, directory: str, file_format: str):
+    """
+    Exporta una sesión guardada sin abrir la ventana
+    """
+    exporter = SessionExporter(db_path, session_id, chunk_size=config_manager.get("export.chunk_size", 5000))
+    try:
+        if os.path.exists(db_path):
+            DatabaseManager.upgrade_schema(db_path)
+        reports = exporter.export_session(directory, file_format, compress=config_manager.get("export.compress", False))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error exportando la sesión {session_id}: {e}")
+        return
+    for report in reports:
+        print(f"{report.path}: {report.rows} filas, {report.bytes_written / 1e6:.1f} MB "
+              f"en {report.elapsed_seconds:.1f}s ({report.rows_per_second:.0f} filas/s)")
+
+def list_sessions(db_path: str, limit: int):
+    """
+    Muestra el historial de sesiones guardadas sin abrir la ventana
+    """
+    if not os.path.exists(db_path):
+        print(f"No hay sesiones guardadas en {db_path}")
+        return
+    db_manager = DatabaseManager(db_path)
+    try:
+        DatabaseManager.upgrade_schema(db_path)
+        db_manager.connection = sqlite3.connect(db_path)
+        history = db_manager.get_session_history(limit)
+    except sqlite3.Error as e:
+        print(f"Error leyendo {db_path}: {e}")
+        return
+    finally:
+        db_manager.close()
+    for session in history:
+        start = session["start_time"].strftime("%Y-%m-%d %H:%M") if session["start_time"] else "-"
+        end = session["end_time"].strftime("%H:%M") if session["end_time"] else "-"
+        print(f"{session['session_id']}  {start} - {end}  {session['total_donations']} donaciones, "
+              f"{session['total_value']} coins, {session['unique_donors']} donadores")
+
+def compact_sessions(db_path: str):
+    """
+    Compacta las sesiones vencidas según la retención configurada y devuelve el espacio
+    """
+    if not os.path.exists(db_path):
+        print(f"No hay sesiones guardadas en {db_path}")
+        return
+    size_before = os.path.getsize(db_path)
+    db_manager = DatabaseManager(db_path)
+    try:
+        DatabaseManager.upgrade_schema(db_path)
+        db_manager.connection = sqlite3.connect(db_path)
+        compactor = SessionCompactor(db_manager,
+                                     retention_days=config_manager.get("retention.keep_days", 90),
+                                     archive_dir=config_manager.get("retention.archive_dir", "archives"),
+                                     rows_per_step=config_manager.get("retention.rows_per_step", 250)).run()
+        db_manager.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error compactando {db_path}: {e}")
+        return
+    finally:
+        db_manager.close()
+    print(f"Compactadas {compactor.sessions_compacted} sesiones ({compactor.rows_compacted} donaciones): "
+          f"{size_before / 1e6:.1f} MB -> {os.path.getsize(db_path) / 1e6:.1f} MB")
 
 def main():
     """
     Punto de entrada principal de la aplicación
     """
+    parser = argparse.ArgumentParser(description="TikTok Planets System")
+    parser.add_argument("--replay", metavar="SESSION_ID",
+                        help="reproduce una sesión guardada")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="velocidad de reproducción (1 = tiempo real, 0 = lo más rápido posible)")
+    parser.add_argument("--db", metavar="PATH", default=config_manager.get("database.path", "sessions.db"),
+                        help="base de datos de sesiones (por defecto database.path)")
+    parser.add_argument("--replay-db", metavar="PATH",
+                        help="base de datos de la sesión a reproducir (por defecto la de --db)")
+    parser.add_argument("--import-log", metavar="PATH",
+                        help="importa un registro de donaciones (CSV o NDJSON, opcionalmente .gz) a la sesión nueva")
+    parser.add_argument("--export", metavar="SESSION_ID",
+                        help="exporta planetas y donaciones de una sesión guardada y termina")
+    parser.add_argument("--export-format", choices=sorted(FORMAT_EXTENSIONS),
+                        default=config_manager.get("export.format", "jsonl"),
+                        help="formato de la exportación (csv, jsonl o npz columnar)")
+    parser.add_argument("--export-dir", metavar="PATH", default=config_manager.get("export.directory", "exports"),
+                        help="carpeta donde se escriben los archivos exportados")
+    parser.add_argument("--list-sessions", metavar="N", type=int, nargs="?", const=50,
+                        help="muestra las N sesiones más recientes con sus totales y termina")
+    parser.add_argument("--compact", action="store_true",
+                        help="compacta las sesiones más viejas que retention.keep_days y termina")
+    args = parser.parse_args()
+    
+    if args.compact:
+        compact_sessions(args.db)
+        return
+    
+    if args.list_sessions is not None:
+        list_sessions(args.db, args.list_sessions)
+        return
+    
+    if args.export:
+        export_session(args.db, args.export, args.export_dir, args.export_format)
+        return
+    
+    if args.replay:
+        # Validar antes de abrir la sesión en vivo: un id mal escrito no reproduce nada
+        try:
+            SessionReplay.open_database(args.replay_db or args.db, args.replay).close()
+        except (ValueError, sqlite3.Error) as e:
+            print(f"No se puede reproducir {args.replay}: {e}")
+            return
+    
     # Inicializar pygame
     pygame.init()
     
     # Crear gestor de sesión
-    session_manager = SessionManager()
+    journal_dir = None
+    if config_manager.get("journal.enabled", True):
+        journal_dir = config_manager.get("journal.directory", "journal")
+    session_manager = SessionManager(args.db, journal_dir=journal_dir,
+                                     journal_commit_ms=config_manager.get("journal.commit_interval_ms", 20),
+                                     journal_segment_bytes=config_manager.get("journal.segment_mb", 16) * 1024 * 1024)
     
     # Crear ventana principal
-    main_window = MainWindow(session_manager)
+    main_window = MainWindow(session_manager,
+                             replay_session_id=args.replay,
+                             replay_speed=args.speed if args.speed > 0 else None,
+                             replay_db_path=args.replay_db)
+    
+    if args.import_log:
+        import_donation_log(main_window, session_manager, args.import_log)
     
     # Ejecutar loop principal
     main_window.run()
@@ -0,0 +1 @@
+# API package - Servidores locales para integraciones externas
@@ -0,0 +1,279 @@
+# HTTP Protocol - Utilidades mínimas de HTTP/1.1 y WebSocket sobre asyncio
+# Evita dependencias externas para los servidores locales de la aplicación
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# GUID fijo del handshake WebSocket (RFC 6455)
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+MAX_HEADER_BYTES = 16 * 1024
+
+STATUS_REASONS = {
+    101: "Switching Protocols",
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    426: "Upgrade Required",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable"
+}
+
+class HttpError(Exception):
+    """Error de protocolo que se responde al cliente con un código HTTP"""
+    
+    def __init__(self, status: int, message: str, details: Optional[Dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        # Campos extra para el cuerpo de la respuesta de error
+        self.details = details or {}
+
+class HttpRequest:
+    """
+    Petición HTTP ya parseada (el cuerpo se lee bajo demanda)
+    
+    Futuras mejoras:
+    - Soporte de compresión (gzip) en el cuerpo
+    """
+    
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str],
+                 reader: asyncio.StreamReader):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.reader = reader
+        
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    
+    @property
+    def keep_alive(self) -> bool:
+        """Verifica si el cliente quiere mantener la conexión abierta"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+    
+    @property
+    def is_websocket_upgrade(self) -> bool:
+        """Verifica si la petición pide actualizar a WebSocket"""
+        return (self.headers.get("upgrade", "").lower() == "websocket" and
+                "sec-websocket-key" in self.headers)
+    
+    async def read_body(self, max_bytes: int) -> bytes:
+        """Lee el cuerpo completo (Content-Length o chunked)"""
+        chunks = []
+        async for chunk in self.iter_body(max_bytes):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def iter_body(self, max_bytes: int) -> AsyncIterator[bytes]:
+        """Itera el cuerpo en fragmentos sin cargarlo entero en memoria"""
+        total = 0
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self.reader.readline()
+                try:
+                    size = int(size_line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise HttpError(400, "invalid chunk size")
+                if size == 0:
+                    # Consumir trailers hasta la línea vacía
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                total += size
+                if total > max_bytes:
+                    raise HttpError(413, "body too large")
+                chunk = await self.reader.readexactly(size)
+                await self.reader.readline()
+                yield chunk
+        else:
+            try:
+                remaining = int(self.headers.get("content-length", "0"))
+            except ValueError:
+                raise HttpError(400, "invalid content-length")
+            if remaining > max_bytes:
+                raise HttpError(413, "body too large")
+            while remaining > 0:
+                chunk = await self.reader.read(min(remaining, 64 * 1024))
+                if not chunk:
+                    raise HttpError(400, "truncated body")
+                remaining -= len(chunk)
+                yield chunk
+    
+    async def iter_lines(self, max_bytes: int) -> AsyncIterator[bytes]:
+        """Itera el cuerpo línea a línea (NDJSON)"""
+        pending = b""
+        async for chunk in self.iter_body(max_bytes):
+            pending += chunk
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line
+        if pending:
+            yield pending
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HttpRequest]:
+    """Lee la línea de petición y cabeceras; retorna None si el cliente cerró"""
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(400, "headers too large")
+    
+    lines = raw.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "malformed request line")
+    
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    
+    return HttpRequest(method.upper(), target, version, headers, reader)
+
+def build_response(status: int, body: bytes = b"", content_type: str = "application/json",
+                   keep_alive: bool = True, extra_headers: Optional[Dict[str, str]] = None) -> bytes:
+    """Construye una respuesta HTTP completa"""
+    head = [f"HTTP/1.1 {status} {STATUS_REASONS.get(status, 'Unknown')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive" if keep_alive else "Connection: close"]
+    if extra_headers:
+        head.extend(f"{name}: {value}" for name, value in extra_headers.items())
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+def json_response(status: int, payload, keep_alive: bool = True) -> bytes:
+    """Construye una respuesta HTTP con cuerpo JSON compacto"""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return build_response(status, body, "application/json", keep_alive)
+
+def websocket_accept_key(client_key: str) -> str:
+    """Calcula Sec-WebSocket-Accept para el handshake"""
+    digest = hashlib.sha1((client_key + WEBSOCKET_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+def encode_ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """Codifica un frame WebSocket de servidor (sin máscara, FIN=1)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+class WebSocketConnection:
+    """
+    Conexión WebSocket del lado servidor
+    
+    Soporta frames de texto/binario, ping/pong y cierre. Los mensajes
+    fragmentados se rechazan (los clientes de la app no los usan).
+    """
+    
+    OPCODE_TEXT = 0x1
+    OPCODE_BINARY = 0x2
+    OPCODE_CLOSE = 0x8
+    OPCODE_PING = 0x9
+    OPCODE_PONG = 0xA
+    
+    MAX_MESSAGE_BYTES = 1024 * 1024
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+    
+    @classmethod
+    async def accept(cls, request: HttpRequest, writer: asyncio.StreamWriter) -> 'WebSocketConnection':
+        """Completa el handshake de actualización a WebSocket"""
+        accept_key = websocket_accept_key(request.headers["sec-websocket-key"])
+        response = ("HTTP/1.1 101 Switching Protocols\r\n"
+                    "Upgrade: websocket\r\n"
+                    "Connection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept_key}\r\n\r\n")
+        writer.write(response.encode("latin-1"))
+        await writer.drain()
+        return cls(request.reader, writer)
+    
+    async def send_text(self, text: str):
+        """Envía un mensaje de texto"""
+        await self.send_frame(text.encode("utf-8"), self.OPCODE_TEXT)
+    
+    async def send_frame(self, payload: bytes, opcode: int):
+        """Envía un frame y espera a que el buffer de salida se vacíe"""
+        if self.closed:
+            return
+        self.writer.write(encode_ws_frame(payload, opcode))
+        await self.writer.drain()
+    
+    async def receive(self) -> Optional[Tuple[int, bytes]]:
+        """
+        Recibe el siguiente mensaje de datos (opcode, payload)
+        
+        Responde pings automáticamente; retorna None al cerrarse.
+        """
+        while not self.closed:
+            try:
+                head = await self.reader.readexactly(2)
+                first, second = head
+                opcode = first & 0x0F
+                masked = second & 0x80
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+                if length > self.MAX_MESSAGE_BYTES or not first & 0x80:
+                    await self.close(1009)
+                    return None
+                mask = await self.reader.readexactly(4) if masked else b""
+                payload = await self.reader.readexactly(length)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.closed = True
+                return None
+            
+            if masked:
+                payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+            
+            if opcode == self.OPCODE_PING:
+                await self.send_frame(payload, self.OPCODE_PONG)
+            elif opcode == self.OPCODE_CLOSE:
+                await self.close()
+                return None
+            elif opcode in (self.OPCODE_TEXT, self.OPCODE_BINARY):
+                return opcode, payload
+        return None
+    
+    async def close(self, code: int = 1000):
+        """Cierra la conexión con un frame de cierre"""
+        if self.closed:
+            return
+        try:
+            self.writer.write(encode_ws_frame(struct.pack("!H", code), self.OPCODE_CLOSE))
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.closed = True
+        self.writer.close()
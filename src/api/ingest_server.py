@@ -0,0 +1,265 @@
+# Ingest Server - API local HTTP/WebSocket para recibir donaciones
+# Permite a bots, Stream Deck y herramientas de moderación enviar donaciones
+
+import asyncio
+import hmac
+import json
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from ..sources.base_source import DonationSource
+from ..sources.normalizers import normalize_event
+from .http_protocol import HttpError, HttpRequest, WebSocketConnection, json_response
+from .server_thread import LocalServerThread
+
+# Orígenes de navegador aceptados: páginas servidas desde esta misma máquina
+LOCAL_HOSTNAMES = frozenset({"localhost", "127.0.0.1", "::1"})
+
+def is_local_origin(origin: str) -> bool:
+    """Verifica si la cabecera Origin corresponde a una página local"""
+    try:
+        parts = urlsplit(origin)
+        return parts.scheme in ("http", "https") and parts.hostname in LOCAL_HOSTNAMES
+    except ValueError:
+        return False
+
+class ApiDonationSource(DonationSource):
+    """
+    Fuente pasiva alimentada por la API local
+    
+    Los lotes se normalizan completos y se encolan de una vez; si no caben
+    se rechazan enteros para que el cliente pueda reintentar.
+    """
+    
+    def __init__(self, name: str = "api", max_queue_size: int = 10000):
+        super().__init__(name, "api", max_queue_size)
+    
+    def push_batch(self, raws: Iterable[Dict]) -> Tuple[int, int]:
+        """Normaliza y encola un lote; retorna (aceptados, rechazados)"""
+        events = []
+        rejected = 0
+        for raw in raws:
+            event = normalize_event(self.platform, raw, self.name) if isinstance(raw, dict) else None
+            if event is None:
+                rejected += 1
+            else:
+                events.append(event)
+        
+        if len(self.queue) + len(events) > self.max_queue_size:
+            raise HttpError(429, "ingest queue full")
+        
+        self.queue.extend(events)
+        self.received_count += len(events)
+        self.rejected_count += rejected
+        return len(events), rejected
+
+class IngestApiServer(LocalServerThread):
+    """
+    Servidor local de ingesta de donaciones
+    
+    Endpoints:
+    - GET  /health              estado del servidor
+    - POST /donations           una donación JSON
+    - POST /donations/batch     lista JSON de donaciones
+    - POST /donations/stream    donaciones NDJSON (una por línea)
+    - GET  /state               estado actual de PlanetSystem
+    - GET  /events              WebSocket con cambios de planetas
+    
+    Formato de donación: {"donor_name": str, "gift_type": str opcional,
+    "value": int opcional, de 1 a MAX_DONATION_VALUE}
+    
+    Acceso: se rechaza (403) toda petición con cabecera Origin de una
+    página que no es local, así un sitio abierto en el navegador del
+    streamer no puede enviar donaciones a 127.0.0.1 (CSRF); bots y
+    herramientas no mandan Origin. Con token configurado, además cada
+    petición debe traer "Authorization: Bearer <token>" (401 si no).
+    
+    Futuras mejoras:
+    - Endpoint de moderación (anular donaciones)
+    """
+    
+    MAX_BODY_BYTES = 8 * 1024 * 1024
+    MAX_STREAM_BYTES = 512 * 1024 * 1024
+    SUBSCRIBER_QUEUE_SIZE = 1000
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, max_batch_size: int = 1000,
+                 source: Optional[ApiDonationSource] = None, token: str = ""):
+        super().__init__(host, port, name="ingest-api")
+        self.max_batch_size = max_batch_size
+        self.token = token
+        self.source = source or ApiDonationSource()
+        
+        # Estado publicado por el hilo de render (referencia inmutable)
+        self._state: Dict = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+        
+        # Contadores
+        self.request_count = 0
+        self.events_published = 0
+        self.events_dropped = 0
+    
+    def publish_state(self, state: Dict):
+        """Publica el estado actual (llamado desde el hilo de render)"""
+        self._state = state
+    
+    def publish_event(self, event: Dict):
+        """Envía un cambio de planeta a los suscriptores (desde el hilo de render)"""
+        if self._subscribers:
+            self.call_threadsafe(self._broadcast, event)
+    
+    def _broadcast(self, event: Dict):
+        """Reparte un evento a las colas de suscriptores (hilo del servidor)"""
+        message = json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+        self.events_published += 1
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Suscriptor lento: pierde eventos pero no frena al resto
+                self.events_dropped += 1
+    
+    async def handle_request(self, request: HttpRequest, writer: asyncio.StreamWriter) -> bool:
+        """Enruta la petición al endpoint correspondiente"""
+        self.request_count += 1
+        self._check_access(request)
+        route = (request.method, request.path.rstrip("/") or "/")
+        
+        if route == ("GET", "/events"):
+            if not request.is_websocket_upgrade:
+                raise HttpError(426, "websocket upgrade required")
+            await self._serve_events(request, writer)
+            return False
+        
+        if route == ("GET", "/health"):
+            status, payload = 200, {"status": "ok", "pending": self.source.pending_count()}
+        elif route == ("GET", "/state"):
+            status, payload = 200, self._state
+        elif route == ("POST", "/donations"):
+            status, payload = await self._ingest_single(request)
+        elif route == ("POST", "/donations/batch"):
+            status, payload = await self._ingest_batch(request)
+        elif route == ("POST", "/donations/stream"):
+            status, payload = await self._ingest_stream(request)
+        elif request.path.startswith("/donations") or request.path in ("/state", "/health"):
+            raise HttpError(405, "method not allowed")
+        else:
+            raise HttpError(404, "not found")
+        
+        writer.write(json_response(status, payload, request.keep_alive))
+        await writer.drain()
+        return request.keep_alive
+    
+    def _check_access(self, request: HttpRequest):
+        """Rechaza peticiones de páginas no locales y, con token, las que no lo traen"""
+        origin = request.headers.get("origin")
+        if origin is not None and not is_local_origin(origin):
+            raise HttpError(403, "cross-origin requests are not allowed")
+        if self.token:
+            scheme, _, supplied = request.headers.get("authorization", "").partition(" ")
+            if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode("utf-8"),
+                                                                      self.token.encode("utf-8")):
+                raise HttpError(401, "missing or invalid api token")
+    
+    async def _read_json(self, request: HttpRequest):
+        """Lee y decodifica un cuerpo JSON"""
+        body = await request.read_body(self.MAX_BODY_BYTES)
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise HttpError(400, "invalid json")
+    
+    async def _ingest_single(self, request: HttpRequest) -> Tuple[int, Dict]:
+        """POST /donations"""
+        data = await self._read_json(request)
+        accepted, rejected = self.source.push_batch([data])
+        if not accepted:
+            raise HttpError(400, "invalid donation")
+        return 202, {"accepted": accepted}
+    
+    async def _ingest_batch(self, request: HttpRequest) -> Tuple[int, Dict]:
+        """POST /donations/batch"""
+        data = await self._read_json(request)
+        if not isinstance(data, list):
+            raise HttpError(400, "expected a json array")
+        if len(data) > self.max_batch_size:
+            raise HttpError(413, f"batch larger than {self.max_batch_size}")
+        accepted, rejected = self.source.push_batch(data)
+        return 202, {"accepted": accepted, "rejected": rejected}
+    
+    async def _ingest_stream(self, request: HttpRequest) -> Tuple[int, Dict]:
+        """
+        POST /donations/stream - NDJSON encolado por lotes mientras llega
+        
+        Si la cola se llena a mitad del stream, el 429 incluye lo que ya
+        quedó encolado: accepted, rejected y processed_lines (líneas no
+        vacías ya consumidas). El cliente reintenta desde la línea
+        processed_lines + 1.
+        """
+        batch: List = []
+        accepted = rejected = processed_lines = 0
+        # Del lote en curso: líneas no vacías y líneas que no son JSON
+        batch_lines = batch_invalid = 0
+        
+        async for line in request.iter_lines(self.MAX_STREAM_BYTES):
+            line = line.strip()
+            if not line:
+                continue
+            batch_lines += 1
+            try:
+                batch.append(json.loads(line))
+            except ValueError:
+                batch_invalid += 1
+                continue
+            
+            if len(batch) >= self.max_batch_size:
+                batch_accepted, batch_rejected = self._push_stream_batch(batch, accepted, rejected, processed_lines)
+                accepted += batch_accepted
+                rejected += batch_rejected + batch_invalid
+                processed_lines += batch_lines
+                batch, batch_lines, batch_invalid = [], 0, 0
+        
+        if batch:
+            batch_accepted, batch_rejected = self._push_stream_batch(batch, accepted, rejected, processed_lines)
+            accepted += batch_accepted
+            rejected += batch_rejected
+        rejected += batch_invalid
+        
+        return 202, {"accepted": accepted, "rejected": rejected}
+    
+    def _push_stream_batch(self, batch: List, accepted: int, rejected: int,
+                           processed_lines: int) -> Tuple[int, int]:
+        """Encola un lote del stream; si no cabe, el error lleva el progreso hasta el lote anterior"""
+        try:
+            return self.source.push_batch(batch)
+        except HttpError as e:
+            raise HttpError(e.status, e.message, {"accepted": accepted, "rejected": rejected,
+                                                  "processed_lines": processed_lines})
+    
+    async def _serve_events(self, request: HttpRequest, writer: asyncio.StreamWriter):
+        """GET /events - envía cambios de planetas por WebSocket"""
+        websocket = await WebSocketConnection.accept(request, writer)
+        queue: asyncio.Queue = asyncio.Queue(self.SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        
+        # Detectar cierre del cliente mientras se envían eventos
+        receiver = asyncio.ensure_future(self._drain_client(websocket))
+        try:
+            await websocket.send_text(json.dumps({"type": "state", "state": self._state},
+                                                 separators=(",", ":"), ensure_ascii=False))
+            while not websocket.closed:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    break
+                await websocket.send_text(getter.result())
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+            receiver.cancel()
+            await websocket.close()
+    
+    async def _drain_client(self, websocket: WebSocketConnection):
+        """Consume mensajes del cliente hasta que cierre la conexión"""
+        while await websocket.receive() is not None:
+            pass
@@ -0,0 +1,117 @@
+# Server Thread - Servidor asyncio local en un hilo propio
+# Base común de los servidores HTTP/WebSocket para no bloquear el render
+
+import asyncio
+import threading
+from typing import Optional
+from .http_protocol import MAX_HEADER_BYTES, HttpError, HttpRequest, json_response, read_request
+
+class LocalServerThread:
+    """
+    Servidor HTTP asyncio que corre en su propio hilo con su propio loop
+    
+    Las subclases implementan handle_request. El hilo de render nunca
+    espera al servidor: la comunicación hacia el servidor se hace con
+    loop.call_soon_threadsafe y hacia el render con colas sin bloqueo.
+    
+    Futuras mejoras:
+    - Autenticación por token para integraciones
+    - TLS para acceso desde otros equipos de la red local
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, name: str = "local-server"):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+    
+    def start(self, timeout: float = 5.0) -> bool:
+        """Inicia el servidor y espera a que esté escuchando"""
+        if self._thread is not None:
+            return True
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._thread_main, name=self.name, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self._startup_error is not None:
+            print(f"Error starting {self.name}: {self._startup_error}")
+            self._thread = None
+            return False
+        return True
+    
+    def stop(self, timeout: float = 2.0):
+        """Detiene el servidor y su hilo"""
+        if self.loop is not None and self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def call_threadsafe(self, callback, *args):
+        """Programa una llamada en el loop del servidor desde otro hilo"""
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(callback, *args)
+    
+    def _thread_main(self):
+        """Punto de entrada del hilo: crea el loop y sirve hasta stop()"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES))
+            # Puerto real si se pidió el 0 (asignación automática)
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._startup_error = e
+            self._ready.set()
+            self.loop.close()
+            self.loop = None
+            return
+        
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._server.close()
+            self.loop.run_until_complete(self._server.wait_closed())
+            self.loop.run_until_complete(self.on_shutdown())
+            self.loop.close()
+            self.loop = None
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende peticiones keep-alive de una conexión"""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    keep_open = await self.handle_request(request, writer)
+                except HttpError as e:
+                    writer.write(json_response(e.status, {"error": e.message, **e.details}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if not keep_open:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def handle_request(self, request: HttpRequest, writer: asyncio.StreamWriter) -> bool:
+        """
+        Atiende una petición; retorna True si la conexión sigue abierta
+        
+        Implementado por las subclases.
+        """
+        writer.write(json_response(404, {"error": "not found"}, request.keep_alive))
+        await writer.drain()
+        return request.keep_alive
+    
+    async def on_shutdown(self):
+        """Limpieza asíncrona al detener el servidor (subclases)"""
+        pass
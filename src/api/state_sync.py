@@ -0,0 +1,213 @@
+# State Sync - Sincronización del estado de planetas con overlays de navegador
+# Publica deltas versionados y keyframes periódicos por WebSocket para OBS
+
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional, Set
+from ..models.planet import Planet, PlanetType
+from .http_protocol import HttpError, HttpRequest, WebSocketConnection, build_response
+from .server_thread import LocalServerThread
+
+# Código numérico de cada tipo de planeta (índice en esta lista)
+TYPE_CODES = {planet_type: code for code, planet_type in enumerate(PlanetType)}
+
+OVERLAY_CLIENT_PATH = os.path.join(os.path.dirname(__file__), "overlay_client.html")
+
+def _encode(message: Dict) -> str:
+    """Serializa un mensaje en JSON compacto"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+class StateSyncPublisher:
+    """
+    Calcula deltas compactos del carrusel visible y los agregados
+    
+    Se ejecuta en el hilo de render y solo cuando algo cambió. Cada
+    planeta viaja como [código_tipo, valor_total]; tamaño y color los
+    deriva el cliente de la tabla de tipos enviada en cada keyframe.
+    
+    Formato de mensaje:
+    - "v": versión, "b": versión base del delta (ausente en keyframes)
+    - "k": 1 si es keyframe (estado completo)
+    - "o": orden del carrusel (solo si cambió)
+    - "p": {nombre: [tipo, valor]} planetas nuevos o modificados
+    - "a": [total_planetas, valor_total] (solo si cambió)
+    
+    Futuras mejoras:
+    - Codificación binaria para muros de cientos de planetas
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self._order: List[str] = []
+        self._planets: Dict[str, List[int]] = {}
+        self._aggregates: List[int] = [0, 0]
+    
+    def capture(self, planet_system) -> Optional[Dict]:
+        """Compara con el estado anterior y retorna el delta, o None si no hay cambios"""
+        order = []
+        planets = {}
+        for planet in planet_system.get_visible_planets():
+            order.append(planet.donor_name)
+            planets[planet.donor_name] = [TYPE_CODES[planet.planet_type], planet.total_value]
+        aggregates = [len(planet_system.planets), planet_system.get_total_session_value()]
+        
+        delta: Dict = {}
+        if order != self._order:
+            delta["o"] = order
+        changed = {name: state for name, state in planets.items() if self._planets.get(name) != state}
+        if changed:
+            delta["p"] = changed
+        if aggregates != self._aggregates:
+            delta["a"] = aggregates
+        
+        if not delta:
+            return None
+        
+        delta["b"] = self.version
+        self.version += 1
+        delta["v"] = self.version
+        
+        self._order = order
+        self._planets = planets
+        self._aggregates = aggregates
+        return delta
+    
+    def keyframe(self) -> Dict:
+        """Retorna el estado completo de la versión actual"""
+        return {
+            "v": self.version,
+            "k": 1,
+            "types": [[planet_type.value, Planet.SIZE_BY_TYPE[planet_type],
+                       "#%02x%02x%02x" % Planet.COLOR_BY_TYPE[planet_type]]
+                      for planet_type in PlanetType],
+            "o": list(self._order),
+            "p": dict(self._planets),
+            "a": list(self._aggregates)
+        }
+
+class StateSyncServer(LocalServerThread):
+    """
+    Servidor del overlay de navegador
+    
+    - GET /       cliente HTML canvas (fuente de navegador de OBS)
+    - GET /sync   WebSocket con keyframe inicial y deltas posteriores
+    
+    El hilo de render solo entrega deltas ya calculados; la serialización
+    (una vez por mensaje, compartida entre todos los overlays) y el envío
+    ocurren en el hilo del servidor. Un overlay lento que llena su cola se
+    resincroniza con un keyframe en lugar de frenar al resto.
+    """
+    
+    SUBSCRIBER_QUEUE_SIZE = 256
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8766, keyframe_interval: float = 5.0):
+        super().__init__(host, port, name="state-sync")
+        self.publisher = StateSyncPublisher()
+        self.keyframe_interval = keyframe_interval
+        self._keyframe_message = _encode(self.publisher.keyframe())
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._keyframe_handle: Optional[asyncio.TimerHandle] = None
+        
+        # Contadores
+        self.deltas_sent = 0
+        self.delta_bytes = 0
+        self.keyframes_sent = 0
+        self.resyncs = 0
+    
+    def publish(self, planet_system) -> bool:
+        """Calcula el delta del estado actual y lo envía (hilo de render)"""
+        delta = self.publisher.capture(planet_system)
+        if delta is None:
+            return False
+        self.call_threadsafe(self._broadcast_delta, delta, self.publisher.keyframe())
+        return True
+    
+    def _broadcast_delta(self, delta: Dict, keyframe: Dict):
+        """Envía un delta a todos los overlays (hilo del servidor)"""
+        self._keyframe_message = _encode(keyframe)
+        if not self._subscribers:
+            return
+        message = _encode(delta)
+        self.deltas_sent += 1
+        self.delta_bytes += len(message)
+        for queue in self._subscribers:
+            self._enqueue(queue, message)
+    
+    def _broadcast_keyframe(self):
+        """Keyframe periódico para overlays que perdieron algún delta"""
+        for queue in self._subscribers:
+            self._enqueue(queue, self._keyframe_message)
+            self.keyframes_sent += 1
+        self._keyframe_handle = self.loop.call_later(self.keyframe_interval, self._broadcast_keyframe)
+    
+    def _enqueue(self, queue: asyncio.Queue, message: str):
+        """Encola un mensaje; si la cola está llena la reemplaza por un keyframe"""
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self._keyframe_message)
+            self.resyncs += 1
+    
+    async def handle_request(self, request: HttpRequest, writer: asyncio.StreamWriter) -> bool:
+        """Sirve el cliente HTML y el WebSocket de sincronización"""
+        if request.method != "GET":
+            raise HttpError(405, "method not allowed")
+        
+        if request.path == "/sync":
+            if not request.is_websocket_upgrade:
+                raise HttpError(426, "websocket upgrade required")
+            await self._serve_sync(request, writer)
+            return False
+        
+        if request.path in ("/", "/overlay"):
+            with open(OVERLAY_CLIENT_PATH, "rb") as f:
+                body = f.read()
+            writer.write(build_response(200, body, "text/html; charset=utf-8", request.keep_alive))
+            await writer.drain()
+            return request.keep_alive
+        
+        raise HttpError(404, "not found")
+    
+    async def _serve_sync(self, request: HttpRequest, writer: asyncio.StreamWriter):
+        """Atiende un overlay suscrito"""
+        websocket = await WebSocketConnection.accept(request, writer)
+        queue: asyncio.Queue = asyncio.Queue(self.SUBSCRIBER_QUEUE_SIZE)
+        queue.put_nowait(self._keyframe_message)
+        self._subscribers.add(queue)
+        if self._keyframe_handle is None:
+            self._keyframe_handle = self.loop.call_later(self.keyframe_interval, self._broadcast_keyframe)
+        
+        receiver = asyncio.ensure_future(self._read_client(websocket, queue))
+        try:
+            while not websocket.closed:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    break
+                await websocket.send_text(getter.result())
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+            receiver.cancel()
+            await websocket.close()
+    
+    async def _read_client(self, websocket: WebSocketConnection, queue: asyncio.Queue):
+        """Atiende peticiones de resincronización del overlay"""
+        while True:
+            message = await websocket.receive()
+            if message is None:
+                return
+            if message[1] == b"resync":
+                self.resyncs += 1
+                self._enqueue(queue, self._keyframe_message)
+    
+    async def on_shutdown(self):
+        """Cancela el temporizador de keyframes"""
+        if self._keyframe_handle is not None:
+            self._keyframe_handle.cancel()
+            self._keyframe_handle = None
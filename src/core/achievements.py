@@ -0,0 +1,249 @@
+# Achievements - Motor de logros e hitos por donación
+# Reglas compiladas en tablas de umbrales por métrica, consultadas con bisect
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+class AchievementRule:
+    """
+    Un logro que se desbloquea cuando una métrica alcanza un umbral
+    
+    Métricas por donador:
+    - donor_total: coins acumulados
+    - donor_donations: número de donaciones
+    - donor_streak: donaciones seguidas separadas como máximo por streak_gap_seconds
+    
+    Métricas de la sesión (metas colectivas):
+    - session_total, session_donations, session_donors
+    """
+    
+    DONOR_METRICS = ("donor_total", "donor_donations", "donor_streak")
+    SESSION_METRICS = ("session_total", "session_donations", "session_donors")
+    
+    __slots__ = ("rule_id", "name", "metric", "threshold")
+    
+    def __init__(self, rule_id: str, name: str, metric: str, threshold: int):
+        if metric not in self.DONOR_METRICS and metric not in self.SESSION_METRICS:
+            raise ValueError(f"unknown achievement metric: {metric}")
+        if threshold < 1:
+            raise ValueError(f"achievement threshold must be at least 1: {rule_id}")
+        self.rule_id = rule_id
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+    
+    @property
+    def session_wide(self) -> bool:
+        """Indica si es una meta de toda la sesión (se desbloquea una sola vez)"""
+        return self.metric in self.SESSION_METRICS
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AchievementRule':
+        """Crea una regla desde la configuración"""
+        return cls(data["id"], data.get("name", data["id"]), data["metric"], int(data["threshold"]))
+    
+    def to_dict(self) -> Dict:
+        return {"id": self.rule_id, "name": self.name, "metric": self.metric, "threshold": self.threshold}
+    
+    def __repr__(self) -> str:
+        return f"AchievementRule({self.rule_id!r}, {self.metric} >= {self.threshold})"
+
+# Reglas por defecto (achievements.rules en la configuración las reemplaza)
+DEFAULT_RULES = [
+    {"id": "first_gift", "name": "Primer regalo", "metric": "donor_donations", "threshold": 1},
+    {"id": "regular", "name": "Donador frecuente", "metric": "donor_donations", "threshold": 10},
+    {"id": "loyal", "name": "Donador leal", "metric": "donor_donations", "threshold": 50},
+    {"id": "coins_100", "name": "100 coins", "metric": "donor_total", "threshold": 100},
+    {"id": "coins_1000", "name": "1K coins", "metric": "donor_total", "threshold": 1000},
+    {"id": "coins_10000", "name": "10K coins", "metric": "donor_total", "threshold": 10000},
+    {"id": "streak_5", "name": "En racha", "metric": "donor_streak", "threshold": 5},
+    {"id": "streak_20", "name": "Imparable", "metric": "donor_streak", "threshold": 20},
+    {"id": "session_1000", "name": "Meta: 1K coins", "metric": "session_total", "threshold": 1000},
+    {"id": "session_10000", "name": "Meta: 10K coins", "metric": "session_total", "threshold": 10000},
+    {"id": "session_donors_100", "name": "Meta: 100 donadores", "metric": "session_donors", "threshold": 100}
+]
+
+class _ThresholdTable:
+    """Umbrales ordenados de una métrica con sus reglas en paralelo"""
+    
+    __slots__ = ("thresholds", "rules")
+    
+    def __init__(self, rules: Iterable[AchievementRule]):
+        ordered = sorted(rules, key=lambda rule: rule.threshold)
+        self.thresholds = [rule.threshold for rule in ordered]
+        self.rules = [rule for rule in ordered]
+    
+    def crossed(self, old: int, new: int) -> Sequence[AchievementRule]:
+        """Reglas con old < umbral <= new: dos bisect, O(log reglas)"""
+        thresholds = self.thresholds
+        low = bisect.bisect_right(thresholds, old)
+        high = bisect.bisect_right(thresholds, new, low)
+        if low == high:
+            return ()
+        return self.rules[low:high]
+
+class _DonorState:
+    """Contadores por donador que no están en el Planet"""
+    
+    __slots__ = ("donations", "streak", "best_streak", "last_at")
+    
+    def __init__(self):
+        self.donations = 0
+        self.streak = 0
+        self.best_streak = 0
+        self.last_at: Optional[float] = None
+
+class AchievementEngine:
+    """
+    Evalúa logros de forma incremental en cada donación
+    
+    Las reglas se compilan una vez en una tabla de umbrales ordenados por
+    métrica. Como cada métrica solo crece (para la racha se usa la mejor
+    racha del donador), una donación que lleva una métrica de `old` a
+    `new` desbloquea exactamente las reglas con old < umbral <= new, que
+    se encuentran con bisect sin recorrer las demás. Cada regla se
+    desbloquea una vez por donador (o una vez por sesión si es colectiva).
+    
+    Futuras mejoras:
+    - Logros por tipo de regalo
+    - Persistir los desbloqueos en la base de datos
+    """
+    
+    def __init__(self, rules: Optional[Iterable[AchievementRule]] = None, streak_gap_seconds: float = 30.0):
+        self.streak_gap_seconds = streak_gap_seconds
+        self.rules: List[AchievementRule] = list(rules or [])
+        self._tables: Dict[str, _ThresholdTable] = {}
+        self._donors: Dict[str, _DonorState] = {}
+        self._session_total = 0
+        self._session_donations = 0
+        self.unlocked_count = 0
+        self._compile()
+    
+    @classmethod
+    def from_config(cls, rules: Optional[List[Dict]] = None, streak_gap_seconds: float = 30.0) -> 'AchievementEngine':
+        """Crea el motor desde la lista de reglas de la configuración (o las por defecto)"""
+        definitions = DEFAULT_RULES if rules is None else rules
+        return cls([AchievementRule.from_dict(data) for data in definitions], streak_gap_seconds)
+    
+    def _compile(self):
+        """Agrupa las reglas por métrica en tablas de umbrales ordenados"""
+        seen = set()
+        by_metric: Dict[str, List[AchievementRule]] = {}
+        for rule in self.rules:
+            if rule.rule_id in seen:
+                raise ValueError(f"duplicate achievement id: {rule.rule_id}")
+            seen.add(rule.rule_id)
+            by_metric.setdefault(rule.metric, []).append(rule)
+        self._tables = {metric: _ThresholdTable(rules) for metric, rules in by_metric.items()}
+    
+    def on_donation(self, donor_key: str, old_total: int, new_total: int, at: float) -> List[AchievementRule]:
+        """
+        Registra una donación y retorna los logros que desbloquea
+        
+        donor_key: nombre normalizado del donador
+        old_total/new_total: coins del donador antes y después
+        at: hora de la donación en segundos (para las rachas)
+        """
+        tables = self._tables
+        if not tables:
+            return []
+        unlocked: List[AchievementRule] = []
+        
+        donor = self._donors.get(donor_key)
+        new_donor = donor is None
+        if new_donor:
+            donor = self._donors[donor_key] = _DonorState()
+        
+        # Métricas del donador
+        table = tables.get("donor_total")
+        if table is not None:
+            unlocked.extend(table.crossed(old_total, new_total))
+        
+        donor.donations += 1
+        table = tables.get("donor_donations")
+        if table is not None:
+            unlocked.extend(table.crossed(donor.donations - 1, donor.donations))
+        
+        if donor.last_at is not None and at - donor.last_at <= self.streak_gap_seconds:
+            donor.streak += 1
+        else:
+            donor.streak = 1
+        donor.last_at = at
+        if donor.streak > donor.best_streak:
+            table = tables.get("donor_streak")
+            if table is not None:
+                unlocked.extend(table.crossed(donor.best_streak, donor.streak))
+            donor.best_streak = donor.streak
+        
+        # Metas de la sesión
+        old_session_total = self._session_total
+        self._session_total += new_total - old_total
+        self._session_donations += 1
+        table = tables.get("session_total")
+        if table is not None:
+            unlocked.extend(table.crossed(old_session_total, self._session_total))
+        table = tables.get("session_donations")
+        if table is not None:
+            unlocked.extend(table.crossed(self._session_donations - 1, self._session_donations))
+        if new_donor:
+            table = tables.get("session_donors")
+            if table is not None:
+                donors = len(self._donors)
+                unlocked.extend(table.crossed(donors - 1, donors))
+        
+        self.unlocked_count += len(unlocked)
+        return unlocked
+    
+    def get_donor_progress(self, donor_key: str) -> Dict[str, int]:
+        """Contadores del donador (donaciones y rachas)"""
+        donor = self._donors.get(donor_key)
+        if donor is None:
+            return {"donations": 0, "streak": 0, "best_streak": 0}
+        return {"donations": donor.donations, "streak": donor.streak, "best_streak": donor.best_streak}
+    
+    def next_milestone(self, metric: str, value: int) -> Optional[Tuple[AchievementRule, int]]:
+        """Próxima regla de la métrica por encima de value y cuánto falta"""
+        table = self._tables.get(metric)
+        if table is None:
+            return None
+        index = bisect.bisect_right(table.thresholds, value)
+        if index >= len(table.rules):
+            return None
+        rule = table.rules[index]
+        return rule, rule.threshold - value
+    
+    def iter_donor_progress(self) -> Iterable[Tuple[str, int, int, int, Optional[float]]]:
+        """(clave, donaciones, racha, mejor racha, última donación) de cada donador"""
+        for key, state in self._donors.items():
+            yield key, state.donations, state.streak, state.best_streak, state.last_at
+    
+    def get_session_progress(self) -> Tuple[int, int]:
+        """(coins, donaciones) de la sesión contados por el motor"""
+        return self._session_total, self._session_donations
+    
+    def load_progress(self, session_total: int, session_donations: int, unlocked_count: int,
+                      donors: Iterable[Tuple[str, int, int, int, Optional[float]]]):
+        """
+        Restaura el progreso (snapshot de la sesión)
+        
+        donors: (clave, donaciones, racha, mejor racha, última donación).
+        Los logros ya desbloqueados no se guardan: quedan implícitos en las
+        métricas, que solo crecen.
+        """
+        self._donors = {}
+        for key, donations, streak, best_streak, last_at in donors:
+            state = self._donors[key] = _DonorState()
+            state.donations = donations
+            state.streak = streak
+            state.best_streak = best_streak
+            state.last_at = last_at
+        self._session_total = session_total
+        self._session_donations = session_donations
+        self.unlocked_count = unlocked_count
+    
+    def reset(self):
+        """Olvida el progreso (replay al retroceder); las reglas se conservan"""
+        self._donors = {}
+        self._session_total = 0
+        self._session_donations = 0
+        self.unlocked_count = 0
@@ -0,0 +1,230 @@
+# Donation Importer - Importación masiva de registros de donaciones
+# CSV o NDJSON en streaming, validación por fila y escritura en una sola transacción
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from ..database.database_manager import DatabaseManager
+from ..database.schema import to_epoch_us
+from ..models.donation import Donation
+from ..sources.normalizers import MAX_DONATION_VALUE, MAX_DONOR_NAME_LENGTH
+from .planet_system import DonationBatch, PlanetSystem
+
+# Donaciones por encima de esto se consideran datos corruptos (mismo tope que la API)
+MAX_IMPORT_VALUE = MAX_DONATION_VALUE
+
+class ImportReport:
+    """Progreso y resultado de una importación"""
+    
+    def __init__(self, path: str, total_bytes: int):
+        self.path = path
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.planets_created = 0
+        self.achievements_unlocked = 0
+        self.committed = False
+        self.elapsed_seconds = 0.0
+        # Primeros errores con su número de fila (acotado para no crecer con el archivo)
+        self.errors: List[Tuple[int, str]] = []
+    
+    @property
+    def fraction(self) -> float:
+        """Avance aproximado según los bytes leídos del archivo"""
+        return min(1.0, self.bytes_read / self.total_bytes) if self.total_bytes else 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds else 0.0
+    
+    def to_dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "rows_read": self.rows_read,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "planets_created": self.planets_created,
+            "achievements_unlocked": self.achievements_unlocked,
+            "committed": self.committed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": [{"row": row, "error": message} for row, message in self.errors]
+        }
+
+def parse_timestamp(raw) -> datetime.datetime:
+    """Hora de la donación: ISO 8601 o segundos desde epoch (número o texto)"""
+    if isinstance(raw, (int, float)):
+        return datetime.datetime.fromtimestamp(raw)
+    text = str(raw).strip()
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return datetime.datetime.fromtimestamp(float(text))
+
+def validate_row(raw: Dict) -> Tuple[str, str, int, Optional[datetime.datetime]]:
+    """
+    Valida y normaliza una fila del registro
+    
+    Campos: donor_name (o user/author), gift_type (opcional, "custom"),
+    value (o custom_value/coins; si falta, el valor del regalo) y
+    timestamp (opcional). Lanza ValueError con el motivo si no es válida.
+    """
+    donor_name = raw.get("donor_name") or raw.get("user") or raw.get("author")
+    if donor_name is None or not str(donor_name).strip():
+        raise ValueError("missing donor name")
+    donor_name = str(donor_name).strip()[:MAX_DONOR_NAME_LENGTH]
+    
+    gift_type = str(raw.get("gift_type") or "custom").strip().lower()
+    
+    value = raw.get("value")
+    if value in (None, ""):
+        value = raw.get("custom_value")
+    if value in (None, ""):
+        value = raw.get("coins")
+    if value in (None, ""):
+        if gift_type not in Donation.GIFT_VALUES:
+            raise ValueError(f"missing value for gift '{gift_type}'")
+        value = Donation.GIFT_VALUES[gift_type]
+    try:
+        value = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"invalid value: {value!r}")
+    if value < 1 or value > MAX_IMPORT_VALUE:
+        raise ValueError(f"value out of range: {value}")
+    
+    timestamp = raw.get("timestamp")
+    if timestamp in (None, ""):
+        return donor_name, gift_type, value, None
+    try:
+        return donor_name, gift_type, value, parse_timestamp(timestamp)
+    except (ValueError, OverflowError, OSError):
+        raise ValueError(f"invalid timestamp: {timestamp!r}")
+
+class DonationImporter:
+    """
+    Importa un registro de donaciones a la sesión actual
+    
+    El archivo se lee en streaming (CSV con encabezado o NDJSON, ambos
+    opcionalmente .gz) y cada fila se valida por separado: las inválidas se
+    cuentan y se reportan las primeras, sin abortar la importación. Las
+    válidas se aplican al PlanetSystem con un DonationBatch y se insertan
+    en lotes de batch_size con executemany, todo dentro de una única
+    transacción de la base.
+    
+    La memoria queda acotada por el número de donadores, no de filas: el
+    historial por planeta no se guarda en memoria (queda en la base) y
+    solo se mantiene un lote de filas a la vez.
+    
+    Si la transacción falla la base queda como estaba, pero los planetas
+    en memoria ya incluyen lo aplicado (report.committed es False).
+    """
+    
+    FORMATS = ("csv", "ndjson")
+    
+    def __init__(self, planet_system: PlanetSystem, db_manager: DatabaseManager, batch_size: int = 5000,
+                 progress_callback: Optional[Callable[[ImportReport], None]] = None, max_reported_errors: int = 100):
+        self.planet_system = planet_system
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.max_reported_errors = max_reported_errors
+    
+    @classmethod
+    def detect_format(cls, path: str) -> str:
+        """Formato según la extensión (.csv, .ndjson/.jsonl, con o sin .gz)"""
+        name = path.lower()
+        if name.endswith(".gz"):
+            name = name[:-3]
+        if name.endswith(".csv"):
+            return "csv"
+        if name.endswith((".ndjson", ".jsonl", ".json")):
+            return "ndjson"
+        raise ValueError(f"unknown donation log format: {path}")
+    
+    def import_file(self, path: str, file_format: Optional[str] = None) -> ImportReport:
+        """Importa un archivo completo y retorna el reporte"""
+        file_format = file_format or self.detect_format(path)
+        if file_format not in self.FORMATS:
+            raise ValueError(f"unsupported format: {file_format}")
+        
+        report = ImportReport(path, os.path.getsize(path))
+        batch = self.planet_system.begin_batch(keep_history=False)
+        started = time.perf_counter()
+        
+        with open(path, "rb") as raw_file:
+            binary = gzip.GzipFile(fileobj=raw_file) if path.lower().endswith(".gz") else raw_file
+            text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+            rows = self._iter_csv(text) if file_format == "csv" else self._iter_ndjson(text)
+            chunks = self._iter_chunks(rows, batch, report, raw_file, started)
+            try:
+                inserted = self.db_manager.bulk_import_donations(chunks, planets=batch.finish)
+            finally:
+                # Índices y carrusel coherentes aunque la base falle
+                batch.finish()
+        
+        report.committed = inserted >= 0
+        report.planets_created = batch.created
+        report.achievements_unlocked = batch.unlocked
+        report.bytes_read = report.total_bytes
+        report.elapsed_seconds = time.perf_counter() - started
+        if self.progress_callback:
+            self.progress_callback(report)
+        return report
+    
+    def _iter_csv(self, text: io.TextIOBase) -> Iterator[Dict]:
+        return csv.DictReader(text)
+    
+    def _iter_ndjson(self, text: io.TextIOBase) -> Iterator[Dict]:
+        """Una donación JSON por línea; las líneas vacías se ignoran"""
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = e  # Se reporta como fila inválida en _iter_chunks
+            yield row if isinstance(row, (dict, ValueError)) else ValueError("row is not an object")
+    
+    def _iter_chunks(self, rows: Iterator, batch: DonationBatch, report: ImportReport, raw_file,
+                     started: float) -> Iterator[List[Tuple[str, str, int, int]]]:
+        """Valida, aplica al PlanetSystem y agrupa filas en lotes para la base"""
+        chunk: List[Tuple[str, str, int, int]] = []
+        for raw in rows:
+            report.rows_read += 1
+            try:
+                if isinstance(raw, ValueError):
+                    raise ValueError(f"invalid JSON: {raw}")
+                donor_name, gift_type, value, timestamp = validate_row(raw)
+            except ValueError as e:
+                report.rejected += 1
+                if len(report.errors) < self.max_reported_errors:
+                    report.errors.append((report.rows_read, str(e)))
+                continue
+            
+            planet = batch.add(donor_name, gift_type, value, timestamp)
+            # Mismo nombre que el planeta: las mayúsculas del primer registro mandan
+            chunk.append((planet.donor_name, gift_type, value, to_epoch_us(planet.last_updated)))
+            report.imported += 1
+            
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+                self._report_progress(report, raw_file, started)
+        
+        if chunk:
+            yield chunk
+    
+    def _report_progress(self, report: ImportReport, raw_file, started: float):
+        if self.progress_callback is None:
+            return
+        report.bytes_read = raw_file.tell()
+        report.elapsed_seconds = time.perf_counter() - started
+        self.progress_callback(report)
@@ -0,0 +1,161 @@
+# Donor Index - Índice de prefijos de donadores para autocompletado
+# Arreglo ordenado con bisect y orden de recencia para sugerir nombres al escribir
+
+import bisect
+import heapq
+import itertools
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+def normalize_donor_name(name: str) -> str:
+    """Clave de búsqueda: sin mayúsculas, sin acentos y sin espacios a los lados"""
+    if name.isascii():
+        # Sin caracteres que descomponer: casefold y NFKD no cambian nada más que lower()
+        return name.strip().lower()
+    decomposed = unicodedata.normalize("NFKD", name.strip().casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+class DonorPrefixIndex(Generic[T]):
+    """
+    Sugerencias de donadores por prefijo, de la más reciente a la más antigua
+    
+    - _keys: claves ordenadas por nombre normalizado; un prefijo es un rango
+      contiguo que se localiza con dos bisect
+    - _recent: sello de recencia de cada clave (touch() es O(1))
+    - _buckets: para los prefijos con más de SCAN_LIMIT donadores, sus
+      claves en orden de recencia (OrderedDict)
+    
+    Para ordenar los resultados hay dos caminos según el tamaño del rango:
+    - rango chico (prefijo largo): se toman los `limit` más recientes del
+      rango con heapq, O(rango) con rango <= SCAN_LIMIT
+    - rango grande (prefijo de una o dos letras): el bucket del prefijo ya
+      está en orden de recencia y todas sus claves coinciden, así que se
+      toman las `limit` últimas, O(limit). El bucket se arma la primera vez
+      que se pide el prefijo (un sort del rango) y después touch() lo
+      mantiene con un move_to_end por cada prefijo con bucket de la clave
+    
+    Cada clave es el nombre normalizado, un separador y el nombre en
+    minúsculas: "José" y "Jose" son planetas distintos, pero ambos
+    aparecen al escribir "jose".
+    
+    Así ninguna consulta recorre donadores que no coinciden con el prefijo.
+    Agregar un donador nuevo es un insort (O(n) de memmove, microsegundos a
+    50k donadores).
+    
+    Futuras mejoras:
+    - Tolerancia a errores de tipeo (distancia de edición)
+    """
+    
+    # Rangos más grandes que esto se resuelven con un bucket de recencia del prefijo
+    SCAN_LIMIT = 512
+    
+    def __init__(self):
+        self._keys: List[str] = []
+        self._items: Dict[str, T] = {}
+        self._recent: Dict[str, int] = {}
+        self._stamp = 0
+        self._buckets: Dict[str, "OrderedDict[str, None]"] = {}
+        self._bucket_depth = 0
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __contains__(self, name: str) -> bool:
+        return self._key(name) in self._items
+    
+    @staticmethod
+    def _key(name: str) -> str:
+        return normalize_donor_name(name) + "\0" + name.lower()
+    
+    def add(self, name: str, item: T):
+        """Registra un donador (o reemplaza su elemento) y lo marca como reciente"""
+        key = self._key(name)
+        if key not in self._items:
+            bisect.insort(self._keys, key)
+        self._items[key] = item
+        self._touch_key(key)
+    
+    def touch(self, name: str):
+        """Marca un donador como el más reciente"""
+        key = self._key(name)
+        if key in self._items:
+            self._touch_key(key)
+    
+    def _touch_key(self, key: str):
+        self._stamp += 1
+        self._recent[key] = self._stamp
+        if self._buckets:
+            buckets = self._buckets
+            depth = min(self._bucket_depth, len(key))
+            for length in range(1, depth + 1):
+                bucket = buckets.get(key[:length])
+                if bucket is not None:
+                    bucket[key] = None
+                    bucket.move_to_end(key)
+    
+    def get(self, name: str):
+        """Elemento de un donador por nombre (sin distinguir mayúsculas)"""
+        return self._items.get(self._key(name))
+    
+    def count_prefix(self, prefix: str) -> int:
+        """Número de donadores que empiezan con el prefijo"""
+        low, high = self._prefix_range(normalize_donor_name(prefix))
+        return high - low
+    
+    def _prefix_range(self, key: str):
+        keys = self._keys
+        if not key:
+            return 0, len(keys)
+        low = bisect.bisect_left(keys, key)
+        # Primer texto mayor que todo lo que empieza con key
+        upper = key[:-1] + chr(ord(key[-1]) + 1)
+        high = bisect.bisect_left(keys, upper, low)
+        return low, high
+    
+    def suggest(self, prefix: str, limit: int = 5) -> List[T]:
+        """Los `limit` donadores más recientes que empiezan con el prefijo"""
+        key = normalize_donor_name(prefix)
+        if not key or limit <= 0:
+            return []
+        low, high = self._prefix_range(key)
+        if low == high:
+            return []
+        
+        items = self._items
+        if high - low <= self.SCAN_LIMIT:
+            keys = heapq.nlargest(limit, self._keys[low:high], key=self._recent.__getitem__)
+        else:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._build_bucket(key, low, high)
+            keys = list(itertools.islice(reversed(bucket), limit))
+        return [items[candidate] for candidate in keys]
+    
+    def _build_bucket(self, key: str, low: int, high: int) -> "OrderedDict[str, None]":
+        """Claves del rango en orden de recencia; touch() lo mantiene desde ahora"""
+        bucket = OrderedDict.fromkeys(sorted(self._keys[low:high], key=self._recent.__getitem__))
+        self._buckets[key] = bucket
+        self._bucket_depth = max(self._bucket_depth, len(key))
+        return bucket
+    
+    def load(self, entries: Iterable[Tuple[str, T]]):
+        """Reemplaza el índice por (nombre, elemento) del menos al más reciente (un solo sort)"""
+        items = {self._key(name): item for name, item in entries}
+        self._keys = sorted(items)
+        self._items = items
+        self._recent = {key: stamp for stamp, key in enumerate(items, 1)}
+        self._stamp = len(items)
+        self._buckets = {}
+        self._bucket_depth = 0
+    
+    def clear(self):
+        """Vacía el índice"""
+        self._keys = []
+        self._items = {}
+        self._recent = {}
+        self._stamp = 0
+        self._buckets = {}
+        self._bucket_depth = 0
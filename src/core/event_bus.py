@@ -0,0 +1,162 @@
+# Event Bus - Notificaciones de cambios entre PlanetSystem y las vistas
+# Observadores síncronos o encolados para invalidar cachés sin hacer polling
+
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+class PlanetEventType(Enum):
+    """
+    Tipos de cambio publicados por el PlanetSystem
+    
+    Futuros eventos:
+    - Cambios de ranking
+    """
+    PLANET_CREATED = "planet_created"          # Nuevo donador
+    VALUE_CHANGED = "value_changed"            # Donación a un planeta existente
+    TYPE_EVOLVED = "type_evolved"              # El planeta cambió de tipo
+    CAROUSEL_REORDERED = "carousel_reordered"  # Cambió el orden de los visibles
+    PLANET_EVICTED = "planet_evicted"          # Un planeta salió del carrusel visible
+    ACHIEVEMENT_UNLOCKED = "achievement_unlocked"  # Un donador (o la sesión) alcanzó un logro
+
+class PlanetEvent:
+    """
+    Un cambio concreto del sistema de planetas
+    
+    old_value/new_value aplican a PLANET_CREATED y VALUE_CHANGED;
+    old_type/new_type a TYPE_EVOLVED. En CAROUSEL_REORDERED planet es el
+    planeta que provocó el cambio (None tras un reset). En
+    ACHIEVEMENT_UNLOCKED achievement es la regla alcanzada y planet el
+    planeta que la desbloqueó (también en las metas de sesión).
+    """
+    
+    __slots__ = ("event_type", "planet", "old_value", "new_value", "old_type", "new_type", "achievement")
+    
+    def __init__(self, event_type: PlanetEventType, planet=None, old_value: int = 0, new_value: int = 0,
+                 old_type=None, new_type=None, achievement=None):
+        self.event_type = event_type
+        self.planet = planet
+        self.old_value = old_value
+        self.new_value = new_value
+        self.old_type = old_type
+        self.new_type = new_type
+        self.achievement = achievement
+    
+    def __repr__(self) -> str:
+        donor = self.planet.donor_name if self.planet is not None else None
+        return f"PlanetEvent({self.event_type.value}, donor={donor!r})"
+
+Handler = Callable[[PlanetEvent], None]
+
+class Subscription:
+    """Identificador de una suscripción (para cancelarla)"""
+    
+    __slots__ = ("handler", "event_types", "mode")
+    
+    def __init__(self, handler: Handler, event_types: Optional[Tuple[PlanetEventType, ...]], mode: str):
+        self.handler = handler
+        self.event_types = event_types
+        self.mode = mode
+
+class EventBus:
+    """
+    Bus de observadores ligero, de un solo hilo (el de render)
+    
+    Modos de entrega:
+    - SYNC: el handler se ejecuta dentro de publish(); para invalidar
+      cachés baratos (marcar algo como sucio)
+    - QUEUED: el evento se encola y se entrega en dispatch_queued(), una
+      vez por frame; para trabajo más pesado (sonidos, persistencia)
+    
+    publish() sin suscriptores para ese tipo no hace nada, y los
+    publicadores pueden consultar has_subscribers() antes de construir
+    el evento para no asignar memoria en el camino caliente.
+    
+    Futuras mejoras:
+    - Prioridades entre handlers
+    """
+    
+    SYNC = "sync"
+    QUEUED = "queued"
+    
+    def __init__(self, max_queue: int = 10000):
+        self.max_queue = max_queue
+        self._subscriptions: List[Subscription] = []
+        self._sync_handlers: Dict[PlanetEventType, List[Handler]] = {}
+        self._queued_handlers: Dict[PlanetEventType, List[Handler]] = {}
+        self._queue: deque = deque()
+        self.published_count = 0
+        self.dropped_count = 0
+    
+    def subscribe(self, handler: Handler, event_types: Optional[List[PlanetEventType]] = None,
+                  mode: str = SYNC) -> Subscription:
+        """
+        Registra un handler para ciertos tipos de evento (None = todos)
+        
+        Retorna la suscripción para poder cancelarla con unsubscribe().
+        """
+        if mode not in (self.SYNC, self.QUEUED):
+            raise ValueError(f"unknown delivery mode: {mode}")
+        subscription = Subscription(handler, tuple(event_types) if event_types else None, mode)
+        self._subscriptions.append(subscription)
+        self._rebuild_index()
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Cancela una suscripción"""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Precalcula los handlers por tipo para que publish() sea un lookup"""
+        self._sync_handlers = {event_type: [] for event_type in PlanetEventType}
+        self._queued_handlers = {event_type: [] for event_type in PlanetEventType}
+        for subscription in self._subscriptions:
+            index = self._sync_handlers if subscription.mode == self.SYNC else self._queued_handlers
+            for event_type in subscription.event_types or PlanetEventType:
+                index[event_type].append(subscription.handler)
+        # Tipos sin handlers se eliminan: has_subscribers() es un `in`
+        self._sync_handlers = {key: value for key, value in self._sync_handlers.items() if value}
+        self._queued_handlers = {key: value for key, value in self._queued_handlers.items() if value}
+    
+    def has_subscribers(self, event_type: PlanetEventType) -> bool:
+        """Indica si alguien escucha este tipo de evento"""
+        return event_type in self._sync_handlers or event_type in self._queued_handlers
+    
+    def publish(self, event: PlanetEvent):
+        """Entrega el evento a los handlers síncronos y lo encola para los demás"""
+        self.published_count += 1
+        
+        handlers = self._sync_handlers.get(event.event_type)
+        if handlers:
+            for handler in handlers:
+                self._deliver(handler, event)
+        
+        if event.event_type in self._queued_handlers:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped_count += 1
+            self._queue.append(event)
+    
+    def dispatch_queued(self, max_events: Optional[int] = None) -> int:
+        """Entrega eventos encolados (llamar una vez por frame); retorna cuántos"""
+        delivered = 0
+        queue = self._queue
+        while queue and (max_events is None or delivered < max_events):
+            event = queue.popleft()
+            for handler in self._queued_handlers.get(event.event_type, ()):
+                self._deliver(handler, event)
+            delivered += 1
+        return delivered
+    
+    def pending_count(self) -> int:
+        """Eventos encolados pendientes de entrega"""
+        return len(self._queue)
+    
+    def _deliver(self, handler: Handler, event: PlanetEvent):
+        """Un handler que falla no debe romper el frame ni a los demás"""
+        try:
+            handler(event)
+        except Exception as e:
+            print(f"Error in event handler for {event.event_type.value}: {e}")
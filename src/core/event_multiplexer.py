@@ -0,0 +1,229 @@
+# Event Multiplexer - Combina donaciones de varias plataformas en un solo flujo
+# Aplica límite de tasa por fuente y reparto justo ponderado (Deficit Round Robin)
+
+import time
+from typing import Dict, List, Optional
+from ..sources.base_source import DonationSource
+from ..sources.donation_event import DonationEvent
+
+class TokenBucket:
+    """
+    Limitador de tasa por cubeta de tokens
+    
+    Una tasa <= 0 significa sin límite.
+    """
+    
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None):
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+    
+    def consume(self, now: float) -> bool:
+        """Intenta consumir un token; retorna False si la fuente debe esperar"""
+        if self.rate <= 0:
+            return True
+        
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+        
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class SourceStats:
+    """Contadores de rendimiento y retraso de una fuente"""
+    
+    __slots__ = ("delivered", "throttled", "lag_total", "lag_max", "last_lag",
+                 "throughput", "window_start", "window_count")
+    
+    def __init__(self):
+        self.delivered = 0
+        self.throttled = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+        self.throughput = 0.0
+        self.window_start = time.monotonic()
+        self.window_count = 0
+    
+    def record_delivery(self, lag: float, now: float):
+        """Registra un evento entregado y su retraso en cola (segundos)"""
+        self.delivered += 1
+        self.lag_total += lag
+        self.last_lag = lag
+        if lag > self.lag_max:
+            self.lag_max = lag
+        
+        self.window_count += 1
+        self._roll_window(now)
+    
+    def _roll_window(self, now: float):
+        """Recalcula el throughput cada segundo"""
+        elapsed = now - self.window_start
+        if elapsed >= 1.0:
+            self.throughput = self.window_count / elapsed
+            self.window_start = now
+            self.window_count = 0
+
+class _SourceEntry:
+    """Fuente registrada con su peso, limitador y estadísticas"""
+    
+    __slots__ = ("source", "weight", "bucket", "deficit", "stats")
+    
+    def __init__(self, source: DonationSource, weight: int, bucket: TokenBucket):
+        self.source = source
+        self.weight = weight
+        self.bucket = bucket
+        self.deficit = 0.0
+        self.stats = SourceStats()
+
+class EventMultiplexer:
+    """
+    Multiplexor de eventos de donación de varias plataformas
+    
+    Cada fuente tiene su propia cola; el multiplexor las recorre con
+    Deficit Round Robin: en cada turno una fuente puede entregar hasta
+    `weight` eventos, siempre que su cubeta de tokens lo permita. Así una
+    inundación en una plataforma queda limitada a su cuota y no retrasa
+    a las demás ni consume todo el presupuesto del frame.
+    
+    Futuras mejoras:
+    - Prioridad por valor (regalos grandes primero)
+    - Deduplicación entre fuentes
+    - Pesos dinámicos según la audiencia de cada plataforma
+    """
+    
+    def __init__(self):
+        self.entries: List[_SourceEntry] = []
+        self._rr_index = 0
+    
+    def register_source(self, source: DonationSource, weight: int = 1,
+                        rate_per_second: float = 0, burst: Optional[float] = None):
+        """
+        Registra una fuente en el multiplexor
+        
+        weight: eventos por turno de round robin (entero >= 1)
+        rate_per_second: límite de tasa de la fuente (0 = sin límite)
+        burst: capacidad de la cubeta (ráfaga máxima permitida)
+        """
+        bucket = TokenBucket(rate_per_second, burst)
+        entry = _SourceEntry(source, max(1, int(weight)), bucket)
+        if not self.entries:
+            entry.deficit = entry.weight
+        self.entries.append(entry)
+    
+    def unregister_source(self, name: str):
+        """Elimina una fuente por nombre"""
+        self.entries = [entry for entry in self.entries if entry.source.name != name]
+        self._rr_index = 0
+    
+    def get_source(self, name: str) -> Optional[DonationSource]:
+        """Busca una fuente registrada por nombre"""
+        for entry in self.entries:
+            if entry.source.name == name:
+                return entry.source
+        return None
+    
+    def start_all(self):
+        """Inicia los hilos de todas las fuentes"""
+        for entry in self.entries:
+            entry.source.start()
+    
+    def stop_all(self):
+        """Detiene los hilos de todas las fuentes"""
+        for entry in self.entries:
+            entry.source.stop()
+    
+    def next_event(self, now: Optional[float] = None) -> Optional[DonationEvent]:
+        """
+        Retorna el siguiente evento según el reparto justo, o None
+        
+        El estado del round robin se conserva entre llamadas, así el
+        llamador puede cortar en cualquier momento (presupuesto del frame)
+        sin romper la equidad.
+        """
+        if not self.entries:
+            return None
+        if now is None:
+            now = time.monotonic()
+        
+        # Cada fuente se visita como mucho dos veces por llamada
+        for _ in range(len(self.entries) * 2):
+            entry = self.entries[self._rr_index % len(self.entries)]
+            
+            if entry.source.pending_count() > 0:
+                if entry.deficit >= 1.0:
+                    if entry.bucket.consume(now):
+                        event = entry.source.pop_event()
+                        if event is not None:
+                            entry.deficit -= 1.0
+                            entry.stats.record_delivery(now - event.received_at, now)
+                            return event
+                    else:
+                        # Limitada: no acumula cuota mientras espera tokens
+                        entry.stats.throttled += 1
+                        entry.deficit = 0.0
+            else:
+                entry.deficit = 0.0
+            
+            # Pasar a la siguiente fuente y darle su cuota del turno
+            self._rr_index = (self._rr_index + 1) % len(self.entries)
+            next_entry = self.entries[self._rr_index]
+            next_entry.deficit += next_entry.weight
+        
+        return None
+    
+    def poll(self, max_events: int) -> List[DonationEvent]:
+        """Retorna hasta max_events eventos respetando el reparto justo"""
+        events = []
+        now = time.monotonic()
+        for _ in range(max_events):
+            event = self.next_event(now)
+            if event is None:
+                break
+            events.append(event)
+        return events
+    
+    def pending_count(self) -> int:
+        """Total de eventos esperando en todas las fuentes"""
+        return sum(entry.source.pending_count() for entry in self.entries)
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Retorna contadores por fuente
+        
+        Incluye recibidos, entregados, descartados, rechazados, veces
+        limitada, pendientes, throughput (eventos/s) y retraso en cola (ms)
+        """
+        now = time.monotonic()
+        stats = {}
+        for entry in self.entries:
+            source = entry.source
+            source_stats = entry.stats
+            
+            # Sin entregas recientes el throughput cae a cero
+            elapsed = now - source_stats.window_start
+            throughput = source_stats.throughput
+            if elapsed >= 2.0:
+                throughput = source_stats.window_count / elapsed
+            
+            delivered = source_stats.delivered
+            stats[source.name] = {
+                "platform": source.platform,
+                "weight": entry.weight,
+                "received": source.received_count,
+                "delivered": delivered,
+                "dropped": source.dropped_count,
+                "rejected": source.rejected_count,
+                "throttled": source_stats.throttled,
+                "pending": source.pending_count(),
+                "throughput_per_second": round(throughput, 2),
+                "avg_lag_ms": round(source_stats.lag_total / delivered * 1000, 2) if delivered else 0.0,
+                "max_lag_ms": round(source_stats.lag_max * 1000, 2),
+                "last_lag_ms": round(source_stats.last_lag * 1000, 2)
+            }
+        return stats
@@ -0,0 +1,203 @@
+# Leaderboard - Ranking incremental de donadores por valor total
+# Skip list indexada: actualización y rank en O(log n), top-K sin ordenar
+
+import random
+from typing import Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class _Node:
+    """Nodo de la skip list; spans[i] = posiciones que salta forward[i]"""
+    
+    __slots__ = ("sort_key", "key", "item", "forward", "spans")
+    
+    def __init__(self, sort_key: Optional[Tuple[int, int]], key: Optional[Hashable], item, level: int):
+        self.sort_key = sort_key
+        self.key = key
+        self.item = item
+        self.forward: List[Optional['_Node']] = [None] * level
+        self.spans: List[int] = [0] * level
+
+class Leaderboard(Generic[T]):
+    """
+    Ranking de elementos ordenado por valor descendente
+    
+    Skip list indexada (cada enlace guarda cuántas posiciones salta):
+    - update(): O(log n) esperado (quitar y reinsertar el nodo)
+    - rank(): O(log n) esperado, sumando los saltos del camino
+    - top(k): recorre el nivel 0 desde la cabeza, O(k) sin importar n
+    
+    Los empates se rompen por orden de llegada: a igual valor, quien
+    alcanzó ese valor primero queda arriba.
+    
+    Futuras mejoras:
+    - Rankings por ventana de tiempo (última hora, último stream)
+    """
+    
+    MAX_LEVEL = 32
+    PROBABILITY = 0.25
+    
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, None, None, self.MAX_LEVEL)
+        self._level = 1
+        self._nodes: Dict[Hashable, _Node] = {}
+        self._sequence = 0
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._nodes
+    
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.PROBABILITY:
+            level += 1
+        return level
+    
+    def update(self, key: Hashable, item: T, value: int):
+        """Inserta o actualiza el valor de un elemento"""
+        node = self._nodes.get(key)
+        if node is not None:
+            if node.sort_key[0] == -value:
+                node.item = item
+                return
+            self._unlink(node)
+        self._sequence += 1
+        self._insert(key, item, (-value, self._sequence))
+    
+    def remove(self, key: Hashable):
+        """Quita un elemento del ranking (si existe)"""
+        node = self._nodes.get(key)
+        if node is not None:
+            self._unlink(node)
+    
+    def _insert(self, key: Hashable, item: T, sort_key: Tuple[int, int]):
+        update = [self._head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = rank[i + 1] if i + 1 < self._level else 0
+            while node.forward[i] is not None and node.forward[i].sort_key < sort_key:
+                rank[i] += node.spans[i]
+                node = node.forward[i]
+            update[i] = node
+        
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.spans[i] = len(self._nodes)
+            self._level = level
+        
+        new_node = _Node(sort_key, key, item, level)
+        for i in range(level):
+            previous = update[i]
+            new_node.forward[i] = previous.forward[i]
+            previous.forward[i] = new_node
+            new_node.spans[i] = previous.spans[i] - (rank[0] - rank[i])
+            previous.spans[i] = rank[0] - rank[i] + 1
+        # Los niveles superiores al del nodo ahora saltan una posición más
+        for i in range(level, self._level):
+            update[i].spans[i] += 1
+        self._nodes[key] = new_node
+    
+    def _unlink(self, target: _Node):
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].sort_key < target.sort_key:
+                node = node.forward[i]
+            update[i] = node
+        
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].spans[i] += target.spans[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].spans[i] -= 1
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._head.spans[self._level - 1] = 0
+            self._level -= 1
+        del self._nodes[target.key]
+    
+    def rank(self, key: Hashable) -> Optional[int]:
+        """Posición (1 = primero) de un elemento, o None si no está"""
+        target = self._nodes.get(key)
+        if target is None:
+            return None
+        position = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].sort_key <= target.sort_key:
+                position += node.spans[i]
+                node = node.forward[i]
+            if node is target:
+                return position
+        return position
+    
+    def value(self, key: Hashable) -> Optional[int]:
+        """Valor registrado de un elemento"""
+        node = self._nodes.get(key)
+        return -node.sort_key[0] if node is not None else None
+    
+    def top(self, count: int) -> List[T]:
+        """Los `count` primeros del ranking, del mayor al menor"""
+        result = []
+        node = self._head.forward[0]
+        while node is not None and len(result) < count:
+            result.append(node.item)
+            node = node.forward[0]
+        return result
+    
+    def at_rank(self, position: int) -> Optional[T]:
+        """Elemento en una posición (1 = primero), O(log n)"""
+        if position < 1 or position > len(self._nodes):
+            return None
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.spans[i] <= position:
+                traversed += node.spans[i]
+                node = node.forward[i]
+            if traversed == position:
+                return node.item
+        return None
+    
+    def load(self, entries: Iterable[Tuple[Hashable, T, int]]):
+        """
+        Reemplaza el ranking por entradas (clave, elemento, valor) ya ordenadas
+        
+        Las entradas vienen del primero al último (como top()); los empates
+        quedan en ese orden. Se enlaza cada nivel de una pasada, O(n) en vez
+        de n inserciones (restaurar un snapshot).
+        """
+        self.clear()
+        last = [self._head] * self.MAX_LEVEL
+        last_position = [0] * self.MAX_LEVEL
+        position = 0
+        for key, item, value in entries:
+            position += 1
+            level = self._random_level()
+            node = _Node((-value, position), key, item, level)
+            for i in range(level):
+                last[i].forward[i] = node
+                last[i].spans[i] = position - last_position[i]
+                last[i] = node
+                last_position[i] = position
+            if level > self._level:
+                self._level = level
+            self._nodes[key] = node
+        # El último enlace de cada nivel salta hasta el final
+        for i in range(self._level):
+            last[i].spans[i] = position - last_position[i]
+        self._sequence = position
+    
+    def clear(self):
+        """Vacía el ranking"""
+        self._head = _Node(None, None, None, self.MAX_LEVEL)
+        self._level = 1
+        self._nodes = {}
+        self._sequence = 0
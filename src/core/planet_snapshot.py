@@ -0,0 +1,354 @@
+# Planet Snapshot - Snapshots binarios compactos del PlanetSystem
+# Arreglos empaquetados con struct/array, escritura atómica en segundo plano y restauración sin releer donaciones
+
+import array
+import contextlib
+import datetime
+import gc
+import itertools
+import math
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from operator import attrgetter, itemgetter
+from typing import List, Optional, Tuple
+from ..database.schema import to_epoch_us
+from ..models.planet import Planet, PlanetType
+from .planet_system import PlanetSystem
+from .event_bus import PlanetEventType
+
+MAGIC = b"PSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snap"
+
+# magic, versión, largo del id de sesión
+_HEADER = struct.Struct("<4sBH")
+# última donación, journal_seq, creado (µs), total, coins y donaciones del motor de logros,
+# logros desbloqueados, planetas, con progreso de logros (0/1)
+_FIELDS = struct.Struct("<qqqqqqqIB")
+
+_PLANET_TYPES = list(PlanetType)
+_TYPE_INDEX = {planet_type: index for index, planet_type in enumerate(_PLANET_TYPES)}
+_LITTLE_ENDIAN = sys.byteorder == "little"
+_PLANET_FIELDS = attrgetter("donor_name", "total_value", "planet_type", "created_at", "last_updated",
+                            "position_x", "position_y")
+
+def _epoch_us(moment: datetime.datetime) -> int:
+    """Como to_epoch_us, con el redondeo del float (exacto a µs hasta el año 2200) en vez de replace()"""
+    return round(moment.timestamp() * 1_000_000)
+
+@contextlib.contextmanager
+def _gc_paused():
+    """
+    Sin recolección cíclica mientras se crean cientos de miles de objetos
+    
+    Cada pasada recorre todo el heap (todos los planetas y sus fechas) y
+    ninguno de los objetos nuevos forma ciclos.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _pack(values: array.array) -> bytes:
+    """Bytes del arreglo en little-endian (el formato del archivo)"""
+    if not _LITTLE_ENDIAN:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+class PlanetSnapshot:
+    """
+    Estado del PlanetSystem en un instante, para restaurarlo sin releer la sesión
+    
+    Guarda por planeta (en orden de creación) nombre, total, tipo, horas
+    de creación y actualización y posición; el orden de recencia del
+    carrusel y del ranking como índices de planeta; los totales de la
+    sesión y el progreso del motor de logros. Las marcas last_donation_id
+    (donations.id) y journal_seq dicen qué donaciones ya incluye: al
+    restaurar solo se aplican las posteriores.
+    
+    capture() copia los valores en el hilo principal (referencias y
+    números, sin codificar ni buscar índices); to_bytes() traduce los
+    órdenes a índices y arma el archivo: un arreglo por columna con
+    array/struct, en little-endian, y un CRC32 final.
+    """
+    
+    def __init__(self, session_id: str, last_donation_id: int = 0, journal_seq: int = 0):
+        self.session_id = session_id
+        self.last_donation_id = last_donation_id
+        self.journal_seq = journal_seq
+        self.created_us = to_epoch_us(datetime.datetime.now())
+        self.total_value = 0
+        self.session_total = 0
+        self.session_donations = 0
+        self.unlocked_count = 0
+        # (nombre, total, tipo, creado, actualizado, x, y) por planeta
+        self.planets: List[Tuple] = []
+        # Índices de planeta: del menos al más reciente y del primero al último del ranking
+        self.recency: List[int] = []
+        self.ranking: List[int] = []
+        # (donaciones, racha, mejor racha, última donación) por planeta; vacío si el motor no tiene reglas
+        self.progress: List[Tuple[int, int, int, Optional[float]]] = []
+        # De capture(): planetas, órdenes y progreso por planeta, a traducir en _resolve()
+        self._captured: Optional[Tuple[List[Planet], List[Planet], List[Planet], List[Tuple]]] = None
+    
+    @property
+    def planet_count(self) -> int:
+        return len(self.planets)
+    
+    @classmethod
+    def capture(cls, planet_system: PlanetSystem, session_id: str, last_donation_id: int = 0,
+                journal_seq: int = 0) -> "PlanetSnapshot":
+        """Copia el estado actual (hilo principal, entre frames)"""
+        snapshot = cls(session_id, last_donation_id, journal_seq)
+        planets = planet_system.planets
+        with _gc_paused():
+            # map() con attrgetter/itemgetter: el trabajo por planeta queda en C
+            snapshot.planets = list(map(_PLANET_FIELDS, planets))
+            recency = list(map(itemgetter(1), planet_system.carousel.iter_recency()))
+            ranking = planet_system.leaderboard.top(len(planets))
+            by_donor = planet_system._planets_by_donor
+            progress = [(by_donor[key], tuple(state))
+                        for key, *state in planet_system.achievements.iter_donor_progress() if key in by_donor]
+        snapshot._captured = (list(planets), recency, ranking, progress)
+        snapshot.total_value = planet_system.get_total_session_value()
+        achievements = planet_system.achievements
+        snapshot.session_total, snapshot.session_donations = achievements.get_session_progress()
+        snapshot.unlocked_count = achievements.unlocked_count
+        return snapshot
+    
+    def _resolve(self):
+        """Traduce los planetas capturados a índices (hilo de escritura)"""
+        if self._captured is None:
+            return
+        planets, recency, ranking, progress = self._captured
+        index = dict(zip(map(id, planets), range(len(planets))))
+        position_of = index.__getitem__
+        self.recency = list(map(position_of, map(id, recency)))
+        self.ranking = list(map(position_of, map(id, ranking)))
+        self.progress = []
+        if progress:
+            self.progress = [(0, 0, 0, None)] * len(planets)
+            for planet, state in progress:
+                self.progress[index[id(planet)]] = state
+        self._captured = None
+    
+    def to_bytes(self) -> bytes:
+        """Archivo completo: encabezado, columnas y CRC32"""
+        self._resolve()
+        name = self.session_id.encode("utf-8")
+        names = [planet[0].encode("utf-8") for planet in self.planets]
+        parts = [
+            _HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(name)), name,
+            _FIELDS.pack(self.last_donation_id, self.journal_seq, self.created_us, self.total_value,
+                         self.session_total, self.session_donations, self.unlocked_count,
+                         len(self.planets), 1 if self.progress else 0),
+            _pack(array.array("H", [len(encoded) for encoded in names])), b"".join(names),
+            _pack(array.array("q", [planet[1] for planet in self.planets])),
+            _pack(array.array("B", [_TYPE_INDEX[planet[2]] for planet in self.planets])),
+            _pack(array.array("q", [_epoch_us(planet[3]) for planet in self.planets])),
+            _pack(array.array("q", [_epoch_us(planet[4]) for planet in self.planets])),
+            _pack(array.array("i", [planet[5] for planet in self.planets])),
+            _pack(array.array("i", [planet[6] for planet in self.planets])),
+            _pack(array.array("i", self.recency)),
+            _pack(array.array("i", self.ranking))
+        ]
+        if self.progress:
+            parts.append(_pack(array.array("I", [state[0] for state in self.progress])))
+            parts.append(_pack(array.array("I", [state[1] for state in self.progress])))
+            parts.append(_pack(array.array("I", [state[2] for state in self.progress])))
+            parts.append(_pack(array.array("d", [math.nan if state[3] is None else state[3]
+                                                 for state in self.progress])))
+        body = b"".join(parts)
+        return body + struct.pack("<I", zlib.crc32(body))
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PlanetSnapshot":
+        """Lee un archivo de snapshot; ValueError si está truncado o corrupto"""
+        if len(data) < _HEADER.size + _FIELDS.size + 4:
+            raise ValueError("snapshot is truncated")
+        body, (crc,) = data[:-4], struct.unpack("<I", data[-4:])
+        if zlib.crc32(body) != crc:
+            raise ValueError("snapshot checksum mismatch")
+        magic, version, name_length = _HEADER.unpack_from(body)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("not a planet snapshot or unsupported version")
+        offset = _HEADER.size
+        snapshot = cls(body[offset:offset + name_length].decode("utf-8"))
+        offset += name_length
+        (snapshot.last_donation_id, snapshot.journal_seq, snapshot.created_us, snapshot.total_value,
+         snapshot.session_total, snapshot.session_donations, snapshot.unlocked_count,
+         count, has_progress) = _FIELDS.unpack_from(body, offset)
+        offset += _FIELDS.size
+        
+        def column(typecode: str) -> array.array:
+            nonlocal offset
+            values = array.array(typecode)
+            size = values.itemsize * count
+            values.frombytes(body[offset:offset + size])
+            if not _LITTLE_ENDIAN:
+                values.byteswap()
+            offset += size
+            return values
+        
+        bounds = list(itertools.accumulate(column("H"), initial=offset))
+        with _gc_paused():
+            names = [body[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+            offset = bounds[-1]
+            totals, types, created, updated = column("q"), column("B"), column("q"), column("q")
+            position_x, position_y = column("i"), column("i")
+            snapshot.recency = column("i").tolist()
+            snapshot.ranking = column("i").tolist()
+            snapshot.planets = list(zip(names, totals, map(_PLANET_TYPES.__getitem__, types),
+                                        created, updated, position_x, position_y))
+        if has_progress:
+            donations, streaks, best_streaks, last_at = column("I"), column("I"), column("I"), column("d")
+            snapshot.progress = [(state[0], state[1], state[2], None if math.isnan(state[3]) else state[3])
+                                 for state in zip(donations, streaks, best_streaks, last_at)]
+        if offset != len(body):
+            raise ValueError("snapshot has unexpected trailing data")
+        return snapshot
+    
+    def write(self, path: str) -> int:
+        """Escribe el archivo de forma atómica (.tmp, fsync y rename); retorna los bytes"""
+        data = self.to_bytes()
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as output:
+            output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(temporary, path)
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+        return len(data)
+    
+    @classmethod
+    def read(cls, path: str) -> "PlanetSnapshot":
+        with open(path, "rb") as source:
+            return cls.from_bytes(source.read())
+    
+    def restore(self, planet_system: PlanetSystem):
+        """
+        Reemplaza el estado de un PlanetSystem vacío por el del snapshot
+        
+        Ranking, carrusel e índice de autocompletado se cargan de una
+        pasada (sin una inserción por planeta); las tendencias no se
+        guardan (son de los últimos minutos).
+        """
+        with _gc_paused():
+            self._restore(planet_system)
+        planet_system._emit(PlanetEventType.CAROUSEL_REORDERED, None)
+    
+    def _restore(self, planet_system: PlanetSystem):
+        fromtimestamp = datetime.datetime.fromtimestamp
+        restore_planet = Planet.restore
+        planets: List[Planet] = [
+            restore_planet(donor_name, total_value, planet_type, fromtimestamp(created_us / 1_000_000),
+                           fromtimestamp(updated_us / 1_000_000), position_x, position_y)
+            for donor_name, total_value, planet_type, created_us, updated_us, position_x, position_y in self.planets]
+        # Claves en minúsculas (las de PlanetSystem) una sola vez, compartidas por todas las estructuras
+        keys = [planet[0].lower() for planet in self.planets]
+        
+        planet_system.planets = planets
+        planet_system._planets_by_donor = dict(zip(keys, planets))
+        planet_system._total_value = self.total_value
+        planet_system.carousel.load((keys[position], planets[position]) for position in self.recency)
+        planet_system.donor_index.load((planets[position].donor_name, planets[position]) for position in self.recency)
+        planet_system.leaderboard.load((keys[position], planets[position], planets[position].total_value)
+                                       for position in self.ranking)
+        planet_system.achievements.load_progress(
+            self.session_total, self.session_donations, self.unlocked_count,
+            ((key, *state) for key, state in zip(keys, self.progress)))
+
+def snapshot_path(directory: str, session_id: str) -> str:
+    """Archivo del último snapshot de una sesión"""
+    return os.path.join(directory, f"{session_id}{SNAPSHOT_SUFFIX}")
+
+class SnapshotScheduler:
+    """
+    Snapshots periódicos del PlanetSystem sin frenar el loop
+    
+    update() se llama cada frame; cuando vence interval_seconds y hubo
+    donaciones nuevas, copia el estado (capture, en el hilo principal) y
+    lo codifica y escribe en un hilo aparte, reemplazando de forma
+    atómica el snapshot anterior de la sesión. Con el snapshot, recuperar
+    una sesión cortada solo aplica las donaciones posteriores.
+    """
+    
+    def __init__(self, planet_system: PlanetSystem, session_manager, directory: str,
+                 interval_seconds: float = 300):
+        self.planet_system = planet_system
+        self.session_manager = session_manager
+        self.directory = directory
+        self.interval_seconds = interval_seconds
+        self.snapshots_written = 0
+        self.last_bytes = 0
+        self.last_capture_ms = 0.0
+        self.last_write_ms = 0.0
+        self.error: Optional[str] = None
+        self._next_at = time.monotonic() + interval_seconds
+        self._last_mark: Optional[Tuple[str, int]] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def update(self):
+        """Dispara un snapshot si venció el intervalo (llamar cada frame)"""
+        now = time.monotonic()
+        if now < self._next_at or self.running:
+            return
+        self._next_at = now + self.interval_seconds
+        self.snapshot_now()
+    
+    def snapshot_now(self) -> bool:
+        """Captura y empieza a escribir un snapshot; False si no hay nada nuevo o ya hay uno en curso"""
+        session_manager = self.session_manager
+        db_manager = session_manager.db_manager
+        mark = (session_manager.session_id, db_manager.last_donation_id)
+        if self.running or mark == self._last_mark or not self.planet_system.planets:
+            return False
+        started = time.perf_counter()
+        snapshot = PlanetSnapshot.capture(self.planet_system, session_manager.session_id,
+                                          db_manager.last_donation_id, db_manager.get_journal_seq())
+        self.last_capture_ms = (time.perf_counter() - started) * 1000.0
+        self._last_mark = mark
+        self._thread = threading.Thread(target=self._write, args=(snapshot, session_manager.journal),
+                                        name="planet-snapshot", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _write(self, snapshot: PlanetSnapshot, journal):
+        started = time.perf_counter()
+        try:
+            # El snapshot no puede adelantarse al journal: si una donación que
+            # incluye se perdiera en un corte, no habría cómo descontarla
+            if journal is not None and not journal.sync(timeout=5.0):
+                raise OSError("donation journal is not on disk")
+            os.makedirs(self.directory, exist_ok=True)
+            self.last_bytes = snapshot.write(snapshot_path(self.directory, snapshot.session_id))
+            self.snapshots_written += 1
+            self.error = None
+        except OSError as e:
+            print(f"Error writing planet snapshot: {e}")
+            self.error = str(e)
+            self._last_mark = None
+        self.last_write_ms = (time.perf_counter() - started) * 1000.0
+    
+    def stop(self):
+        """Espera a que termine el snapshot en curso"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
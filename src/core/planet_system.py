@@ -1,9 +1,17 @@
 # Planet System Core - Lógica principal del sistema de planetas
 # Gestiona la creación, actualización y visualización de planetas
 
-from typing import List, Dict, Optional
+import datetime
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from ..models.planet import Planet
 from ..models.donation import Donation
+from .achievements import AchievementEngine
+from .donor_index import DonorPrefixIndex
+from .event_bus import EventBus, PlanetEvent, PlanetEventType
+from .leaderboard import Leaderboard
+from .recency_carousel import RecencyCarousel
+from .trend_metrics import TrendAggregator
 
 class PlanetSystem:
     """
@@ -17,49 +25,145 @@ class PlanetSystem:
     - Efectos de partículas y atmósferas
     """
     
-    def __init__(self):
+    def __init__(self, event_bus: Optional[EventBus] = None, max_visible_planets: int = 4,
+                 trends: Optional[TrendAggregator] = None, achievements: Optional[AchievementEngine] = None):
         self.planets: List[Planet] = []
-        self.visible_planets: List[Planet] = []
-        self.max_visible_planets: int = 4
+        
+        # Índice por donador (sin distinguir mayúsculas) y total acumulado:
+        # buscar un planeta y consultar el total no recorren la lista
+        self._planets_by_donor: Dict[str, Planet] = {}
+        self._total_value = 0
+        
+        # Autocompletado de nombres en el panel de control
+        self.donor_index: DonorPrefixIndex[Planet] = DonorPrefixIndex()
+        
+        # Orden de recencia con ventana visible acotada
+        self.carousel: RecencyCarousel[Planet] = RecencyCarousel(max_visible_planets)
+        
+        # Ranking por valor total (modo competencia), mantenido por donación
+        self.leaderboard: Leaderboard[Planet] = Leaderboard()
+        
+        # Momentum reciente (coins/min, donadores en racha) para el HUD
+        self.trends = trends if trends is not None else TrendAggregator()
+        
+        # Logros e hitos (sin reglas no evalúa nada)
+        self.achievements = achievements if achievements is not None else AchievementEngine()
+        
+        # Notificaciones de cambios para vistas, sonidos y persistencia
+        self.event_bus = event_bus if event_bus is not None else EventBus()
     
-    def add_donation(self, donor_name: str, gift_type: str, value: int) -> Planet:
+    def add_donation(self, donor_name: str, gift_type: str, value: int,
+                     timestamp: Optional[datetime.datetime] = None) -> Planet:
         """
         Procesa una nueva donación y actualiza o crea planeta
         
+        timestamp: hora original de la donación (replay/importación);
+        por defecto la hora actual
+        
         Futuras mejoras:
         - Efectos de sonido personalizados por tipo de regalo
         - Animaciones de transformación cuando cambia tipo de planeta
-        - Sistema de logros por donaciones múltiples
         """
         # Buscar planeta existente del donador
         existing_planet = self.find_planet_by_donor(donor_name)
         
+        donation = Donation(donor_name, gift_type, value)
+        if timestamp is not None:
+            donation.timestamp = timestamp
+        # Nombre del planeta existente: el mismo donador con otras mayúsculas suma junto
+        self.trends.record(existing_planet.donor_name if existing_planet else donor_name, donation.value)
+        
         if existing_planet:
             # Actualizar planeta existente
-            donation = Donation(donor_name, gift_type, value)
+            old_value = existing_planet.total_value
+            old_type = existing_planet.planet_type
             existing_planet.add_donation(donation)
+            self._total_value += existing_planet.total_value - old_value
+            self.leaderboard.update(donor_name.lower(), existing_planet, existing_planet.total_value)
+            self.donor_index.touch(existing_planet.donor_name)
+            self._emit(PlanetEventType.VALUE_CHANGED, existing_planet, old_value=old_value,
+                       new_value=existing_planet.total_value)
+            if existing_planet.planet_type != old_type:
+                self._emit(PlanetEventType.TYPE_EVOLVED, existing_planet,
+                           old_type=old_type, new_type=existing_planet.planet_type)
             # Mover a posición más reciente
             self._move_to_recent_position(existing_planet)
+            self._check_achievements(existing_planet, old_value, donation)
             return existing_planet
         else:
             # Crear nuevo planeta
             new_planet = Planet(donor_name)
-            donation = Donation(donor_name, gift_type, value)
+            new_planet.created_at = donation.timestamp
             new_planet.add_donation(donation)
             self.planets.append(new_planet)
+            self._planets_by_donor[donor_name.lower()] = new_planet
+            self._total_value += new_planet.total_value
+            self.leaderboard.update(donor_name.lower(), new_planet, new_planet.total_value)
+            self.donor_index.add(donor_name, new_planet)
+            self._emit(PlanetEventType.PLANET_CREATED, new_planet, new_value=new_planet.total_value)
             self._add_to_visible_carousel(new_planet)
+            self._check_achievements(new_planet, 0, donation)
             return new_planet
     
+    def _check_achievements(self, planet: Planet, old_value: int, donation: Donation):
+        """Evalúa los logros de la donación y publica los desbloqueados"""
+        unlocked = self.achievements.on_donation(planet.donor_name.lower(), old_value, planet.total_value,
+                                                 donation.timestamp.timestamp())
+        for rule in unlocked:
+            self._emit(PlanetEventType.ACHIEVEMENT_UNLOCKED, planet, achievement=rule)
+    
+    def begin_batch(self, keep_history: bool = False) -> 'DonationBatch':
+        """Inicia la aplicación de muchas donaciones (importación masiva)"""
+        return DonationBatch(self, keep_history)
+    
+    def _emit(self, event_type: PlanetEventType, planet: Optional[Planet], **fields):
+        """Publica un evento solo si alguien lo escucha (sin asignaciones si no)"""
+        if self.event_bus.has_subscribers(event_type):
+            self.event_bus.publish(PlanetEvent(event_type, planet, **fields))
+    
     def find_planet_by_donor(self, donor_name: str) -> Optional[Planet]:
         """Busca un planeta por nombre del donador"""
-        for planet in self.planets:
-            if planet.donor_name.lower() == donor_name.lower():
-                return planet
-        return None
+        return self._planets_by_donor.get(donor_name.lower())
+    
+    @property
+    def max_visible_planets(self) -> int:
+        """Tamaño de la ventana visible del carrusel"""
+        return self.carousel.max_visible
+    
+    @max_visible_planets.setter
+    def max_visible_planets(self, value: int):
+        for planet in self.carousel.resize(value):
+            self._emit(PlanetEventType.PLANET_EVICTED, planet)
+        self._emit(PlanetEventType.CAROUSEL_REORDERED, None)
+    
+    @property
+    def visible_planets(self) -> List[Planet]:
+        """Planetas visibles, del más antiguo al más reciente"""
+        return self.carousel.visible()
     
     def get_visible_planets(self) -> List[Planet]:
         """Retorna los planetas actualmente visibles en el carrusel"""
-        return self.visible_planets.copy()
+        return self.carousel.visible()
+    
+    def get_next_planets(self, count: int) -> List[Planet]:
+        """
+        Los siguientes `count` planetas en recencia fuera del carrusel
+        
+        Útil para vistas tipo muro o para precargar el que entrará.
+        """
+        return self.carousel.next_after_visible(count)
+    
+    def suggest_donors(self, prefix: str, limit: int = 5) -> List[Planet]:
+        """Planetas cuyo donador empieza con el prefijo, del más reciente al más antiguo"""
+        return self.donor_index.suggest(prefix, limit)
+    
+    def get_top_planets(self, count: int) -> List[Planet]:
+        """Los `count` planetas con mayor valor total, del mayor al menor"""
+        return self.leaderboard.top(count)
+    
+    def get_donor_rank(self, donor_name: str) -> Optional[int]:
+        """Posición del donador en el ranking (1 = primero), o None"""
+        return self.leaderboard.rank(donor_name.lower())
     
     def _move_to_recent_position(self, planet: Planet):
         """
@@ -70,13 +174,10 @@ class PlanetSystem:
         - Efectos de zoom cuando se actualiza
         - Brillo temporal para destacar actualización
         """
-        if planet in self.visible_planets:
-            self.visible_planets.remove(planet)
-        self.visible_planets.append(planet)
-        
-        # Mantener límite de planetas visibles
-        if len(self.visible_planets) > self.max_visible_planets:
-            self.visible_planets.pop(0)
+        key = planet.donor_name.lower()
+        if self.carousel.is_most_recent(key):
+            return  # Ya es el más reciente: el orden no cambia
+        self._touch_carousel(key, planet)
     
     def _add_to_visible_carousel(self, planet: Planet):
         """
@@ -87,11 +188,29 @@ class PlanetSystem:
         - Efecto de aparición gradual
         - Sonido de "nuevo planeta creado"
         """
-        self.visible_planets.append(planet)
-        
-        # Mantener límite de planetas visibles
-        if len(self.visible_planets) > self.max_visible_planets:
-            self.visible_planets.pop(0)
+        self._touch_carousel(planet.donor_name.lower(), planet)
+    
+    def _touch_carousel(self, key: str, planet: Planet):
+        """Lleva el planeta al final del carrusel y notifica expulsión y reorden"""
+        evicted = self.carousel.touch(key, planet)
+        if evicted is not None:
+            self._emit(PlanetEventType.PLANET_EVICTED, evicted)
+        self._emit(PlanetEventType.CAROUSEL_REORDERED, planet)
+    
+    def reset(self):
+        """Elimina todos los planetas (replay al retroceder)"""
+        evicted = self.carousel.visible()
+        self.planets = []
+        self._planets_by_donor = {}
+        self._total_value = 0
+        self.carousel.clear()
+        self.leaderboard.clear()
+        self.donor_index.clear()
+        self.trends.reset()
+        self.achievements.reset()
+        for planet in evicted:
+            self._emit(PlanetEventType.PLANET_EVICTED, planet)
+        self._emit(PlanetEventType.CAROUSEL_REORDERED, None)
     
     def get_total_session_value(self) -> int:
         """
@@ -102,4 +221,117 @@ class PlanetSystem:
         - Donador más generoso
         - Tipo de regalo más popular
         """
-        return sum(planet.total_value for planet in self.planets)
+        return self._total_value
+    
+    def get_state_summary(self) -> Dict:
+        """
+        Retorna un resumen serializable del estado actual
+        
+        Usado por la API local para consultas de estado.
+        """
+        visible = []
+        for planet in self.carousel.iter_visible():
+            info = planet.get_display_info()
+            del info["position"]
+            visible.append(info)
+        
+        return {
+            "total_planets": len(self.planets),
+            "total_value": self.get_total_session_value(),
+            "visible_planets": visible
+        }
+
+class DonationBatch:
+    """
+    Aplica muchas donaciones al PlanetSystem difiriendo el trabajo por donador
+    
+    add() actualiza el planeta y el total (lo barato, por fila) y anota al
+    donador en orden de recencia. finish() hace una sola vez por donador
+    tocado lo que en add_donation ocurre por donación: ranking, índice de
+    autocompletado, carrusel y eventos (creado / cambio de valor / cambio
+    de tipo, expulsiones y un único reordenamiento). Un millón de filas de
+    diez mil donadores cuesta así diez mil actualizaciones del ranking.
+    
+    Las donaciones importadas no cuentan para las tendencias (no son
+    recientes) y los logros se actualizan sin publicar desbloqueos, para
+    no inundar el overlay; unlocked cuenta cuántos hubo.
+    """
+    
+    def __init__(self, planet_system: PlanetSystem, keep_history: bool = False):
+        self.planet_system = planet_system
+        self.keep_history = keep_history
+        self.donations = 0
+        self.created = 0
+        self.unlocked = 0
+        self.finished = False
+        # donador -> (planeta, valor al inicio del lote, tipo al inicio o None si es nuevo)
+        self._touched: "OrderedDict[str, Tuple[Planet, int, Optional[object]]]" = OrderedDict()
+    
+    def add(self, donor_name: str, gift_type: str, value: Optional[int],
+            timestamp: Optional[datetime.datetime] = None) -> Planet:
+        """Aplica una donación; retorna el planeta del donador"""
+        system = self.planet_system
+        key = donor_name.lower()
+        planet = system._planets_by_donor.get(key)
+        
+        donation = Donation(donor_name, gift_type, value)
+        if timestamp is not None:
+            donation.timestamp = timestamp
+        
+        touched = self._touched
+        if planet is None:
+            planet = Planet(donor_name)
+            planet.created_at = donation.timestamp
+            system.planets.append(planet)
+            system._planets_by_donor[key] = planet
+            touched[key] = (planet, 0, None)
+            self.created += 1
+        elif key not in touched:
+            touched[key] = (planet, planet.total_value, planet.planet_type)
+        else:
+            touched.move_to_end(key)
+        
+        old_value = planet.total_value
+        planet.add_donation(donation, self.keep_history)
+        system._total_value += planet.total_value - old_value
+        self.unlocked += len(system.achievements.on_donation(key, old_value, planet.total_value,
+                                                             donation.timestamp.timestamp()))
+        self.donations += 1
+        return planet
+    
+    def touched_planets(self) -> List[Planet]:
+        """Planetas modificados en el lote, del menos al más reciente"""
+        return [entry[0] for entry in self._touched.values()]
+    
+    def finish(self) -> List[Planet]:
+        """Actualiza índices y carrusel y publica los eventos; retorna los planetas tocados"""
+        if self.finished:
+            return self.touched_planets()
+        self.finished = True
+        system = self.planet_system
+        carousel = system.carousel
+        evicted: Dict[str, Planet] = {}
+        
+        for key, (planet, old_value, old_type) in self._touched.items():
+            system.leaderboard.update(key, planet, planet.total_value)
+            if old_type is None:
+                system.donor_index.add(planet.donor_name, planet)
+                system._emit(PlanetEventType.PLANET_CREATED, planet, new_value=planet.total_value)
+            else:
+                system.donor_index.touch(planet.donor_name)
+                system._emit(PlanetEventType.VALUE_CHANGED, planet, old_value=old_value,
+                             new_value=planet.total_value)
+                if planet.planet_type != old_type:
+                    system._emit(PlanetEventType.TYPE_EVOLVED, planet, old_type=old_type,
+                                 new_type=planet.planet_type)
+            dropped = carousel.touch(key, planet)
+            if dropped is not None:
+                evicted[dropped.donor_name.lower()] = dropped
+        
+        # Solo los que terminaron fuera de la ventana (pudieron volver a entrar)
+        for key, planet in evicted.items():
+            if not carousel.is_visible(key):
+                system._emit(PlanetEventType.PLANET_EVICTED, planet)
+        if self._touched:
+            system._emit(PlanetEventType.CAROUSEL_REORDERED, None)
+        return self.touched_planets()
@@ -0,0 +1,128 @@
+# Recency Carousel - Estructura LRU para el carrusel de planetas visibles
+# Mover al frente, ventana visible acotada y cola de espera en O(1)
+
+import itertools
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class RecencyCarousel(Generic[T]):
+    """
+    Orden de recencia de los donadores con una ventana visible acotada
+    
+    Dos OrderedDict (listas doblemente enlazadas con índice hash):
+    - visible: hasta max_visible elementos, del más antiguo al más reciente
+    - backlog: los que salieron de la ventana, el último en salir al final
+    
+    touch() (donación nueva o repetida) es O(1): mueve el elemento al
+    final de la ventana y, si se excede el límite, desplaza el más antiguo
+    al backlog y lo retorna para notificar la expulsión.
+    
+    Futuras mejoras:
+    - Fijar planetas (no expulsables) durante eventos especiales
+    """
+    
+    def __init__(self, max_visible: int = 4):
+        if max_visible < 1:
+            raise ValueError("max_visible must be at least 1")
+        self.max_visible = max_visible
+        self._visible: "OrderedDict[Hashable, T]" = OrderedDict()
+        self._backlog: "OrderedDict[Hashable, T]" = OrderedDict()
+    
+    def touch(self, key: Hashable, item: T) -> Optional[T]:
+        """
+        Marca un elemento como el más reciente
+        
+        Retorna el elemento expulsado de la ventana visible, o None.
+        """
+        visible = self._visible
+        if key in visible:
+            visible.move_to_end(key)
+            return None
+        
+        self._backlog.pop(key, None)
+        visible[key] = item
+        if len(visible) > self.max_visible:
+            evicted_key, evicted = visible.popitem(last=False)
+            self._backlog[evicted_key] = evicted
+            return evicted
+        return None
+    
+    def is_most_recent(self, key: Hashable) -> bool:
+        """Indica si el elemento ya es el más reciente (touch no cambiaría el orden)"""
+        if not self._visible:
+            return False
+        return next(reversed(self._visible)) == key
+    
+    def is_visible(self, key: Hashable) -> bool:
+        """Indica si el elemento está en la ventana visible"""
+        return key in self._visible
+    
+    def visible(self) -> List[T]:
+        """Elementos visibles, del más antiguo al más reciente"""
+        return list(self._visible.values())
+    
+    def iter_visible(self) -> Iterator[T]:
+        """Itera la ventana visible sin copiarla"""
+        return iter(self._visible.values())
+    
+    def next_after_visible(self, count: int) -> List[T]:
+        """
+        Los `count` siguientes en recencia fuera de la ventana visible
+        
+        El primero es el último en salir; O(count).
+        """
+        result = []
+        for item in reversed(self._backlog.values()):
+            if len(result) >= count:
+                break
+            result.append(item)
+        return result
+    
+    def resize(self, max_visible: int) -> List[T]:
+        """Cambia el tamaño de la ventana; retorna los elementos expulsados"""
+        if max_visible < 1:
+            raise ValueError("max_visible must be at least 1")
+        self.max_visible = max_visible
+        evicted = []
+        while len(self._visible) > max_visible:
+            key, item = self._visible.popitem(last=False)
+            self._backlog[key] = item
+            evicted.append(item)
+        # Al crecer, los más recientes del backlog vuelven a la ventana
+        restored = []
+        while len(self._visible) + len(restored) < max_visible and self._backlog:
+            restored.append(self._backlog.popitem(last=True))
+        if restored:
+            merged = OrderedDict(reversed(restored))
+            merged.update(self._visible)
+            self._visible = merged
+        return evicted
+    
+    def load(self, entries: Iterable[Tuple[Hashable, T]]):
+        """
+        Reemplaza el contenido por (clave, elemento) del menos al más reciente
+        
+        Los últimos max_visible quedan en la ventana y el resto en el
+        backlog, como si se hubiera llamado touch() en ese orden.
+        """
+        entries = list(entries)
+        split = max(0, len(entries) - self.max_visible)
+        self._backlog = OrderedDict(entries[:split])
+        self._visible = OrderedDict(entries[split:])
+    
+    def iter_recency(self) -> Iterator[Tuple[Hashable, T]]:
+        """(clave, elemento) del menos al más reciente: backlog y después la ventana"""
+        return itertools.chain(self._backlog.items(), self._visible.items())
+    
+    def clear(self):
+        """Vacía la estructura"""
+        self._visible.clear()
+        self._backlog.clear()
+    
+    def visible_count(self) -> int:
+        return len(self._visible)
+    
+    def __len__(self) -> int:
+        return len(self._visible) + len(self._backlog)
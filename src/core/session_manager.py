@@ -1,57 +1,215 @@
 # Session Manager - Gestiona las sesiones de streaming
 # Controla la creación, actualización y persistencia de sesiones
 
+import os
 import sqlite3
+import struct
 import datetime
-from typing import Optional
+import time
+from typing import List, Optional
 from ..database.database_manager import DatabaseManager
+from ..database.donation_journal import DonationJournal, JournalRecord, list_segments, segment_start
+from ..database.schema import from_epoch_us, to_epoch_us
+from ..models.donation import Donation
+from .planet_snapshot import PlanetSnapshot, snapshot_path
 
 class SessionManager:
     """
     Gestiona las sesiones de streaming y coordina la base de datos
     
     Futuras implementaciones:
-    - Guardar estadísticas de sesión
     - Exportar resumen de donaciones
-    - Historial de sesiones anteriores
     - Integración con APIs de TikTok para métricas
     """
     
-    def __init__(self):
+    def __init__(self, db_path: str = "sessions.db", journal_dir: Optional[str] = None,
+                 journal_commit_ms: float = 20, journal_segment_bytes: int = 16 * 1024 * 1024):
+        """
+        journal_dir: directorio del DonationJournal (None lo desactiva). Con
+        journal la base confirma sin fsync (synchronous=NORMAL): la
+        durabilidad de cada donación la da el journal. Si al iniciar quedan
+        segmentos, la sesión anterior no se cerró bien: se retoma esa
+        sesión y recover() reaplica lo que le falte a la base.
+        """
         self.session_id: Optional[str] = None
         self.session_start_time: Optional[datetime.datetime] = None
-        self.db_manager = DatabaseManager()
-        self.create_new_session()
+        self.db_manager = DatabaseManager(db_path)
+        self.journal_dir = journal_dir
+        self.journal: Optional[DonationJournal] = None
+        self.journal_commit_ms = journal_commit_ms
+        self.journal_segment_bytes = journal_segment_bytes
+        self.recovered_donations = 0
+        # Segmentos de la sesión cortada y sus registros que faltan en la base, pendientes de recover()
+        self._recovery_segments: List[str] = []
+        self._recovery_tail: List[JournalRecord] = []
+        
+        crashed_session = DonationJournal.pending_session(journal_dir) if journal_dir else None
+        if journal_dir:
+            self.db_manager.synchronous = "NORMAL"
+        if crashed_session:
+            self._resume_session(crashed_session)
+        else:
+            self.create_new_session()
     
     def create_new_session(self) -> str:
         """
         Crea una nueva sesión de streaming
         """
+        self._remove_snapshot(self.session_id)
         self.session_id = f"session_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.session_start_time = datetime.datetime.now()
         
         # Inicializar base de datos para la sesión
         self.db_manager.initialize_session_database(self.session_id)
         
+        if self.journal_dir:
+            if self.journal:
+                self.journal.switch_session(self.session_id)
+            else:
+                self._open_journal(1)
+        
         return self.session_id
     
+    def _resume_session(self, session_id: str):
+        """Retoma una sesión que no se cerró bien (sus segmentos quedan para recover())"""
+        self.session_id = session_id
+        self.db_manager.initialize_session_database(session_id)
+        first, _, _ = self.db_manager.get_session_time_range(session_id)
+        self.session_start_time = first or datetime.datetime.now()
+        
+        # Los segmentos nuevos siguen la numeración: ni el journal ni la base retroceden
+        last_seq = self.db_manager.get_journal_seq()
+        self._recovery_tail = list(DonationJournal.iter_records(self.journal_dir, session_id, last_seq))
+        if self._recovery_tail:
+            last_seq = self._recovery_tail[-1][0]
+        # Un segmento viejo sin registros puede llamarse igual que el primero nuevo: ese se reutiliza
+        self._recovery_segments = [path for path in list_segments(self.journal_dir)
+                                   if segment_start(path) <= last_seq]
+        self._open_journal(last_seq + 1)
+        print(f"Session {session_id} was not closed cleanly; recovering it from the donation journal")
+    
+    def _open_journal(self, next_seq: int):
+        db_path = self.db_manager.db_path
+        self.journal = DonationJournal(
+            self.journal_dir, self.session_id, next_seq, self.journal_commit_ms, self.journal_segment_bytes,
+            lambda session_id: DatabaseManager.durable_journal_seq(db_path, session_id))
+    
+    def journal_donation(self, donation: Donation) -> Optional[int]:
+        """Agrega la donación al journal antes de guardarla en la base; retorna su seq"""
+        if self.journal is None:
+            return None
+        try:
+            return self.journal.append(donation.donor_name, donation.gift_type, donation.value,
+                                       to_epoch_us(donation.timestamp))
+        except struct.error as e:
+            # Valor fuera de rango: la donación sigue sin journal, como en save_donation
+            print(f"Error journaling donation: {e}")
+            return None
+    
+    def recover(self, planet_system) -> int:
+        """
+        Reconstruye la sesión retomada en el PlanetSystem y completa la base
+        
+        Si hay un PlanetSnapshot de la sesión se carga y solo se aplican las
+        donaciones guardadas después de su marca; si no, todas las de la
+        sesión (con un DonationBatch). Las del journal posteriores a
+        sessions.journal_seq (la cola que la base no llegó a confirmar) se
+        insertan en una sola transacción y se aplican a los planetas si el
+        snapshot no las incluía. Después se borran los segmentos viejos.
+        Retorna la cantidad de donaciones tomadas del journal.
+        """
+        if not self._recovery_segments:
+            return 0
+        started = time.perf_counter()
+        db_manager = self.db_manager
+        snapshot = self._load_snapshot()
+        if snapshot is not None:
+            snapshot.restore(planet_system)
+            donations = db_manager.iter_donations_since(self.session_id, snapshot.last_donation_id)
+            applied_seq = snapshot.journal_seq
+        else:
+            donations = db_manager.iter_session_donations(self.session_id)
+            applied_seq = 0
+        batch = planet_system.begin_batch(keep_history=False)
+        restored = 0
+        for donation in donations:
+            batch.add(donation.donor_name, donation.gift_type, donation.value, donation.timestamp)
+            restored += 1
+        
+        tail = []
+        last_seq = 0
+        for seq, donor_name, gift_type, value, timestamp_us in self._recovery_tail:
+            if seq > applied_seq:
+                planet = batch.add(donor_name, gift_type, value, from_epoch_us(timestamp_us))
+            else:
+                # Ya en el snapshot, pero la base la perdió: solo se inserta
+                planet = planet_system.find_planet_by_donor(donor_name)
+            tail.append((planet.donor_name if planet else donor_name, gift_type, value, timestamp_us))
+            last_seq = seq
+        try:
+            # Los planetas se guardan aunque no haya cola: un corte entre el
+            # commit del planeta y el de su donación los deja desparejos
+            inserted = db_manager.bulk_import_donations([tail], planets=batch.finish, journal_seq=last_seq or None)
+        finally:
+            batch.finish()
+        
+        # El journal viejo se borra recién con la cola en disco en la base
+        durable = DatabaseManager.durable_journal_seq(db_manager.db_path, self.session_id)
+        if inserted >= 0 and durable >= db_manager.get_journal_seq():
+            DonationJournal.remove_segments(self.journal_dir, self._recovery_segments)
+            self._recovery_segments = []
+            self._recovery_tail = []
+            self.recovered_donations = len(tail)
+        source = f"snapshot of {snapshot.planet_count} planets + " if snapshot else ""
+        print(f"Recovered session {self.session_id}: {source}{restored} saved donations and {len(tail)} "
+              f"from the journal in {time.perf_counter() - started:.2f}s")
+        return len(tail)
+    
+    def _load_snapshot(self) -> Optional[PlanetSnapshot]:
+        """Último snapshot de la sesión actual, o None si no hay o no sirve"""
+        path = snapshot_path(self.journal_dir, self.session_id)
+        try:
+            snapshot = PlanetSnapshot.read(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring planet snapshot {path}: {e}")
+            return None
+        return snapshot if snapshot.session_id == self.session_id else None
+    
+    def _remove_snapshot(self, session_id: Optional[str]):
+        """Borra el snapshot de una sesión que terminó bien (ya no hace falta recuperarla)"""
+        if not self.journal_dir or not session_id:
+            return
+        try:
+            os.remove(snapshot_path(self.journal_dir, session_id))
+        except FileNotFoundError:
+            pass
+    
     def get_session_stats(self) -> dict:
         """
         Obtiene estadísticas de la sesión actual
         
+        Los totales salen de la fila de la sesión (sin recorrer donaciones).
+        
         Futuras métricas:
-        - Total de donadores únicos
-        - Valor total de donaciones
         - Planeta más grande
         - Tiempo de sesión activo
         """
+        totals = self.db_manager.get_session_totals()
         return {
             "session_id": self.session_id,
             "start_time": self.session_start_time,
             "total_planets": self.db_manager.get_planet_count(),
-            "total_donations": self.db_manager.get_total_donation_value()
+            "total_donations": totals["total_value"],
+            "donation_count": totals["total_donations"],
+            "unique_donors": totals["unique_donors"]
         }
     
+    def get_session_history(self, limit: int = 50) -> list:
+        """Sesiones anteriores con sus totales, de la más reciente a la más vieja"""
+        return self.db_manager.get_session_history(limit)
+    
     def close_session(self):
         """
         Cierra la sesión actual y libera recursos
@@ -64,5 +222,11 @@ class SessionManager:
         if self.db_manager:
             self.db_manager.close()
         
+        # Cierre limpio: la base ya tiene todo y el journal se borra
+        if self.journal:
+            self.journal.close(remove=True)
+            self.journal = None
+        self._remove_snapshot(self.session_id)
+        
         self.session_id = None
         self.session_start_time = None
@@ -0,0 +1,205 @@
+# Session Replay - Reproducción determinista de sesiones guardadas
+# Reinyecta las donaciones de una sesión en orden cronológico a velocidad variable
+
+import datetime
+import os
+import sqlite3
+import time
+from typing import Callable, Iterator, Optional
+from ..database.database_manager import DatabaseManager
+from ..models.donation import Donation
+
+class SessionReplay:
+    """
+    Motor de reproducción de una sesión almacenada en la base de datos
+    
+    Las donaciones se leen en streaming (por bloques) y se entregan al
+    `sink` en orden de timestamp. El reloj de la reproducción es virtual:
+    avanza con el delta_time de cada frame multiplicado por `speed`, así
+    el resultado es idéntico a cualquier velocidad.
+    
+    Modos:
+    - speed = 1.0   tiempo real
+    - speed = N     N veces más rápido
+    - speed = None  lo más rápido posible (limitado por max_events)
+    
+    Futuras mejoras:
+    - Marcadores de incidentes para saltar directamente
+    - Reproducción en bucle para demos
+    """
+    
+    REALTIME = 1.0
+    AS_FAST_AS_POSSIBLE = None
+    
+    def __init__(self, db_manager: DatabaseManager, session_id: str,
+                 sink: Callable[[Donation], None], speed: Optional[float] = 1.0,
+                 reset_callback: Optional[Callable[[], None]] = None, chunk_size: int = 1000):
+        self.db_manager = db_manager
+        self.session_id = session_id
+        self.sink = sink
+        self.speed = speed
+        self.reset_callback = reset_callback
+        self.chunk_size = chunk_size
+        
+        first, last, count = db_manager.get_session_time_range(session_id)
+        self.start_time: Optional[datetime.datetime] = first
+        self.end_time: Optional[datetime.datetime] = last
+        self.total_donations = count
+        
+        # Estado de reproducción
+        self.paused = False
+        self.virtual_seconds = 0.0
+        self.applied_count = 0
+        self._iterator: Optional[Iterator[Donation]] = None
+        self._next_donation: Optional[Donation] = None
+        self._open_stream()
+    
+    @classmethod
+    def from_db_path(cls, db_path: str, session_id: str, sink: Callable[[Donation], None],
+                     **kwargs) -> 'SessionReplay':
+        """Crea una reproducción con su propia conexión de lectura"""
+        return cls(cls.open_database(db_path, session_id), session_id, sink, **kwargs)
+    
+    @staticmethod
+    def open_database(db_path: str, session_id: str) -> DatabaseManager:
+        """
+        Abre la base de una sesión guardada sin registrar sesiones nuevas
+        
+        ValueError si la base no existe o no tiene esa sesión (un id mal
+        escrito no debe reproducir nada en silencio).
+        """
+        if not os.path.exists(db_path):
+            raise ValueError(f"database not found: {db_path}")
+        DatabaseManager.upgrade_schema(db_path)
+        db_manager = DatabaseManager(db_path)
+        db_manager.connection = sqlite3.connect(db_path)
+        db_manager.connection.row_factory = sqlite3.Row
+        if not db_manager.has_session(session_id):
+            db_manager.close()
+            raise ValueError(f"unknown session: {session_id}")
+        return db_manager
+    
+    def _open_stream(self):
+        """Abre el cursor de lectura desde el inicio de la sesión"""
+        self._iterator = self.db_manager.iter_session_donations(self.session_id, chunk_size=self.chunk_size)
+        self._next_donation = next(self._iterator, None)
+    
+    @property
+    def duration_seconds(self) -> float:
+        """Duración de la sesión original en segundos"""
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return (self.end_time - self.start_time).total_seconds()
+    
+    def is_finished(self) -> bool:
+        """Verifica si ya se entregaron todas las donaciones"""
+        return self._next_donation is None
+    
+    def pause(self):
+        """Pausa la reproducción"""
+        self.paused = True
+    
+    def resume(self):
+        """Reanuda la reproducción"""
+        self.paused = False
+    
+    def toggle_pause(self):
+        """Alterna pausa/reproducción"""
+        self.paused = not self.paused
+    
+    def set_speed(self, speed: Optional[float]):
+        """Cambia la velocidad (None = lo más rápido posible)"""
+        self.speed = speed
+    
+    def update(self, delta_time: float, max_events: int = 1000) -> int:
+        """
+        Avanza la reproducción según el tiempo del frame (ms)
+        
+        Retorna el número de donaciones entregadas en este frame. Si el
+        presupuesto max_events se agota, las donaciones ya vencidas se
+        entregan en los frames siguientes sin alterar su orden.
+        """
+        if self.paused or self.is_finished():
+            return 0
+        
+        if self.speed is None:
+            applied = self._apply_until(None, max_events)
+            if self._next_donation is not None:
+                self.virtual_seconds = self._offset_of(self._next_donation)
+            return applied
+        
+        self.virtual_seconds += (delta_time / 1000.0) * self.speed
+        return self._apply_until(self.virtual_seconds, max_events)
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> float:
+        """
+        Reproduce la sesión completa sin interfaz (benchmarks, incidentes)
+        
+        Respeta la velocidad configurada durmiendo entre donaciones; con
+        speed=None no duerme. Retorna el tiempo real empleado.
+        """
+        started = time.perf_counter()
+        last = started
+        while not self.is_finished():
+            if self.speed is not None:
+                wait = (self._offset_of(self._next_donation) - self.virtual_seconds) / self.speed
+                if wait > 0:
+                    time.sleep(min(wait, 0.05))
+            now = time.perf_counter()
+            self.update((now - last) * 1000.0, max_events=self.chunk_size)
+            last = now
+            if progress_callback:
+                progress_callback(self.applied_count, self.total_donations)
+        return time.perf_counter() - started
+    
+    def seek(self, offset_seconds: float):
+        """
+        Salta a una posición de la sesión (segundos desde el inicio)
+        
+        Hacia adelante se aplican de golpe las donaciones intermedias; hacia
+        atrás se reinicia el estado con reset_callback y se reaplica desde
+        el principio, ya que el estado de los planetas es acumulativo.
+        """
+        offset_seconds = max(0.0, min(offset_seconds, self.duration_seconds))
+        
+        if offset_seconds < self.virtual_seconds:
+            if self.reset_callback is None:
+                raise ValueError("seeking backwards requires a reset_callback")
+            self.reset_callback()
+            self.applied_count = 0
+            self._open_stream()
+        
+        self._apply_until(offset_seconds, None)
+        self.virtual_seconds = offset_seconds
+    
+    def _offset_of(self, donation: Donation) -> float:
+        """Segundos desde el inicio de la sesión hasta una donación"""
+        return (donation.timestamp - self.start_time).total_seconds()
+    
+    def _apply_until(self, offset_seconds: Optional[float], max_events: Optional[int]) -> int:
+        """Entrega donaciones hasta el offset indicado o hasta agotar max_events"""
+        applied = 0
+        while self._next_donation is not None:
+            if max_events is not None and applied >= max_events:
+                break
+            if offset_seconds is not None and self._offset_of(self._next_donation) > offset_seconds:
+                break
+            self.sink(self._next_donation)
+            applied += 1
+            self._next_donation = next(self._iterator, None)
+        
+        self.applied_count += applied
+        return applied
+    
+    def get_progress(self) -> dict:
+        """Retorna el progreso de la reproducción"""
+        return {
+            "session_id": self.session_id,
+            "applied": self.applied_count,
+            "total": self.total_donations,
+            "position_seconds": round(self.virtual_seconds, 2),
+            "duration_seconds": round(self.duration_seconds, 2),
+            "speed": self.speed,
+            "paused": self.paused,
+            "finished": self.is_finished()
+        }
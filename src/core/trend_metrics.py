@@ -0,0 +1,193 @@
+# Trend Metrics - Métricas de "momentum" en ventanas deslizantes
+# Buckets de tiempo en un buffer circular: coins/min, donaciones/min y donadores en racha
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+class _Bucket:
+    """Donaciones agregadas de un intervalo de bucket_seconds"""
+    
+    __slots__ = ("index", "coins", "count", "donors")
+    
+    def __init__(self):
+        self.index = -1
+        self.coins = 0
+        self.count = 0
+        self.donors: Dict[str, int] = {}
+    
+    def reset(self, index: int):
+        self.index = index
+        self.coins = 0
+        self.count = 0
+        self.donors = {}
+
+class _Window:
+    """Totales acumulados de una ventana (se restan los buckets que salen)"""
+    
+    __slots__ = ("seconds", "span", "start", "coins", "count", "donors")
+    
+    def __init__(self, seconds: int, span: int):
+        self.seconds = seconds
+        self.span = span        # Buckets que cubre la ventana
+        self.start = 0          # Índice del bucket más antiguo incluido
+        self.coins = 0
+        self.count = 0
+        self.donors: Dict[str, int] = {}
+    
+    def clear(self, start: int):
+        self.start = start
+        self.coins = 0
+        self.count = 0
+        self.donors = {}
+
+class TrendAggregator:
+    """
+    Métricas de las donaciones recientes en varias ventanas de tiempo
+    
+    El tiempo se divide en buckets de bucket_seconds guardados en un
+    buffer circular que cubre la ventana más larga. Cada ventana mantiene
+    sus totales (coins, donaciones y coins por donador) sumando al
+    registrar y restando los buckets que van saliendo, así que:
+    - record(): O(1) amortizado
+    - coins()/donations_per_minute(): O(1) tras expirar buckets
+    - hot_donors(): O(donadores activos en la ventana)
+    
+    El reloj es time.monotonic por defecto: las métricas describen lo que
+    está pasando en pantalla, no la hora original de la donación.
+    
+    Futuras mejoras:
+    - Gráfica de la última hora para el overlay
+    """
+    
+    def __init__(self, bucket_seconds: float = 1.0, windows: Sequence[int] = (60, 300),
+                 clock: Callable[[], float] = time.monotonic):
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._windows: Dict[int, _Window] = {
+            seconds: _Window(seconds, max(1, int(round(seconds / bucket_seconds))))
+            for seconds in sorted(set(windows))
+        }
+        if not self._windows:
+            raise ValueError("at least one window is required")
+        self._ring_size = max(window.span for window in self._windows.values())
+        self._ring = [_Bucket() for _ in range(self._ring_size)]
+        self._current = self._bucket_index(clock())
+        self._ring[self._current % self._ring_size].reset(self._current)
+        for window in self._windows.values():
+            window.start = self._current - window.span + 1
+    
+    @property
+    def windows(self) -> List[int]:
+        """Tamaños de ventana disponibles (segundos)"""
+        return list(self._windows)
+    
+    def _bucket_index(self, at: float) -> int:
+        return int(at // self.bucket_seconds)
+    
+    def record(self, donor_name: str, value: int, at: Optional[float] = None):
+        """Registra una donación (at en la escala del reloj; por defecto ahora)"""
+        index = self._bucket_index(self.clock() if at is None else at)
+        if index > self._current:
+            self._advance(index)
+        elif index <= self._current - self._ring_size:
+            return  # Más antigua que la ventana más larga
+        
+        bucket = self._ring[index % self._ring_size]
+        if bucket.index != index:
+            bucket.reset(index)
+        bucket.coins += value
+        bucket.count += 1
+        bucket.donors[donor_name] = bucket.donors.get(donor_name, 0) + value
+        
+        for window in self._windows.values():
+            if index >= window.start:
+                window.coins += value
+                window.count += 1
+                window.donors[donor_name] = window.donors.get(donor_name, 0) + value
+    
+    def _advance(self, index: int):
+        """Mueve el bucket actual hasta index, expirando lo que sale de cada ventana"""
+        for window in self._windows.values():
+            new_start = index - window.span + 1
+            if new_start - window.start >= window.span:
+                window.clear(new_start)  # Todo lo que tenía quedó fuera
+                continue
+            while window.start < new_start:
+                self._expire(window, self._ring[window.start % self._ring_size], window.start)
+                window.start += 1
+        
+        # Reciclar los buckets que pasan a representar intervalos nuevos
+        first = max(self._current + 1, index - self._ring_size + 1)
+        for new_index in range(first, index + 1):
+            self._ring[new_index % self._ring_size].reset(new_index)
+        self._current = index
+    
+    @staticmethod
+    def _expire(window: _Window, bucket: _Bucket, index: int):
+        if bucket.index != index or bucket.count == 0:
+            return
+        window.coins -= bucket.coins
+        window.count -= bucket.count
+        donors = window.donors
+        for donor, coins in bucket.donors.items():
+            # Una donación de 0 coins deja al donador en 0: otro bucket suyo
+            # puede haberlo quitado ya
+            remaining = donors.get(donor, 0) - coins
+            if remaining:
+                donors[donor] = remaining
+            else:
+                donors.pop(donor, None)
+    
+    def _window(self, seconds: int) -> _Window:
+        window = self._windows.get(seconds)
+        if window is None:
+            raise KeyError(f"unknown trend window: {seconds}s")
+        index = self._bucket_index(self.clock())
+        if index > self._current:
+            self._advance(index)
+        return window
+    
+    def coins(self, seconds: int) -> int:
+        """Coins recibidos en la ventana"""
+        return self._window(seconds).coins
+    
+    def donations(self, seconds: int) -> int:
+        """Número de donaciones en la ventana"""
+        return self._window(seconds).count
+    
+    def donations_per_minute(self, seconds: int) -> float:
+        """Donaciones por minuto promediadas sobre la ventana"""
+        return self._window(seconds).count * 60.0 / seconds
+    
+    def coins_per_minute(self, seconds: int) -> float:
+        """Coins por minuto promediados sobre la ventana"""
+        return self._window(seconds).coins * 60.0 / seconds
+    
+    def hot_donors(self, seconds: int, count: int = 3) -> List[Tuple[str, int]]:
+        """Los `count` donadores con más coins en la ventana: [(nombre, coins)]"""
+        donors = self._window(seconds).donors
+        return heapq.nlargest(count, donors.items(), key=lambda item: item[1])
+    
+    def get_summary(self, top_donors: int = 3) -> Dict[str, Dict]:
+        """Métricas de todas las ventanas (para el HUD o la API local)"""
+        return {
+            f"{seconds}s": {
+                "coins": self.coins(seconds),
+                "donations": self.donations(seconds),
+                "donations_per_minute": round(self.donations_per_minute(seconds), 2),
+                "hot_donors": self.hot_donors(seconds, top_donors)
+            }
+            for seconds in self._windows
+        }
+    
+    def reset(self):
+        """Descarta todas las métricas (replay al retroceder)"""
+        self._current = self._bucket_index(self.clock())
+        for bucket in self._ring:
+            bucket.reset(-1)
+        self._ring[self._current % self._ring_size].reset(self._current)
+        for window in self._windows.values():
+            window.clear(self._current - window.span + 1)
@@ -0,0 +1,224 @@
+# Backup Scheduler - Backups en caliente de la base de sesiones
+# API de backup de SQLite por pasos en un hilo aparte, con rotación y verificación
+
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class BackupReport:
+    """Resultado de un backup y su efecto en el loop principal"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.started_at = datetime.datetime.now()
+        self.duration_seconds = 0.0
+        self.pages = 0
+        self.steps = 0
+        self.bytes_written = 0
+        self.integrity = ""
+        self.error: Optional[str] = None
+        # Intervalos entre frames (ms) mientras corría el backup y antes de empezar
+        self.frame_intervals_ms: List[float] = []
+        self.baseline_p95_ms = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.integrity == "ok"
+    
+    @property
+    def frame_p95_ms(self) -> float:
+        return _percentile(self.frame_intervals_ms, 0.95)
+    
+    @property
+    def frame_max_ms(self) -> float:
+        return max(self.frame_intervals_ms, default=0.0)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "path": self.path,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "pages": self.pages,
+            "steps": self.steps,
+            "bytes_written": self.bytes_written,
+            "integrity": self.integrity,
+            "error": self.error,
+            "frames": len(self.frame_intervals_ms),
+            "frame_p95_ms": round(self.frame_p95_ms, 2),
+            "frame_max_ms": round(self.frame_max_ms, 2),
+            "baseline_p95_ms": round(self.baseline_p95_ms, 2)
+        }
+
+class BackupScheduler:
+    """
+    Backups periódicos de la base de sesiones sin detener el live
+    
+    Cada backup corre en un hilo aparte con su propia conexión y usa
+    sqlite3.Connection.backup en pasos de pages_per_step páginas,
+    durmiendo step_sleep_ms entre pasos:
+    - la base está en modo WAL y el hilo mantiene una transacción de
+      lectura abierta, así el backup copia una foto consistente y el
+      escritor de la sesión sigue confirmando donaciones mientras tanto
+      (sin esa transacción cada escritura reiniciaría el backup)
+    - SQLite libera el GIL durante cada paso, así el hilo de render solo
+      compite por CPU, no espera al backup
+    
+    El backup se escribe como .tmp, se verifica con PRAGMA integrity_check
+    y recién entonces se renombra; se conservan los max_files más nuevos.
+    
+    update() se llama cada frame: dispara el backup cuando vence el
+    intervalo y mide los intervalos entre frames mientras corre, que se
+    comparan en el reporte con el p95 de los frames previos.
+    """
+    
+    def __init__(self, db_path: str, backup_dir: str = "backups", interval_minutes: float = 30,
+                 max_files: int = 10, pages_per_step: int = 64, step_sleep_ms: float = 10):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.interval_seconds = interval_minutes * 60.0
+        self.max_files = max_files
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep_ms / 1000.0
+        
+        self.last_report: Optional[BackupReport] = None
+        self._current: Optional[BackupReport] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._next_backup = time.monotonic() + self.interval_seconds
+        self._last_frame: Optional[float] = None
+        self._baseline: Deque[float] = deque(maxlen=300)
+    
+    @property
+    def running(self) -> bool:
+        """Indica si hay un backup en curso"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def update(self):
+        """Mide el frame y dispara o cierra backups (llamar cada frame)"""
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            interval_ms = (now - self._last_frame) * 1000.0
+            if self._current is not None:
+                self._current.frame_intervals_ms.append(interval_ms)
+            else:
+                self._baseline.append(interval_ms)
+        self._last_frame = now
+        
+        if self._thread is not None and not self._thread.is_alive():
+            self._finish()
+        if self._thread is None and time.monotonic() >= self._next_backup:
+            self.start_backup()
+    
+    def start_backup(self) -> bool:
+        """Inicia un backup ahora (False si ya hay uno en curso)"""
+        if self._thread is not None:
+            return False
+        self._next_backup = time.monotonic() + self.interval_seconds
+        stem = os.path.splitext(os.path.basename(self.db_path))[0]
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        report = BackupReport(os.path.join(self.backup_dir, f"{stem}_{stamp}.db"))
+        report.baseline_p95_ms = _percentile(list(self._baseline), 0.95)
+        self._current = report
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(report,), name="db-backup", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _finish(self):
+        report = self._current
+        self._thread = None
+        self._current = None
+        self.last_report = report
+        if self._stop_event.is_set():
+            return  # Cancelado al salir
+        if report.ok:
+            print(f"Backup written to {report.path} in {report.duration_seconds:.1f}s "
+                  f"(frame p95 {report.frame_p95_ms:.1f} ms, before {report.baseline_p95_ms:.1f} ms)")
+        else:
+            print(f"Error creating backup {report.path}: {report.error or report.integrity}")
+    
+    def _run(self, report: BackupReport):
+        """Hilo del backup: copia por pasos, verifica, renombra y rota"""
+        started = time.perf_counter()
+        temp_path = report.path + ".tmp"
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self._copy(report, temp_path)
+            report.integrity = self._check_integrity(temp_path)
+            if report.integrity == "ok":
+                self._fsync(temp_path)
+                os.replace(temp_path, report.path)
+                report.bytes_written = os.path.getsize(report.path)
+                self._rotate()
+        except (sqlite3.Error, OSError) as e:
+            report.error = str(e)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            report.duration_seconds = time.perf_counter() - started
+    
+    def _copy(self, report: BackupReport, temp_path: str):
+        source = sqlite3.connect(self.db_path, isolation_level=None)
+        target = sqlite3.connect(temp_path)
+        # Sin fsync por paso: un solo fsync al final (_fsync), así el commit
+        # del backup no compite con los del escritor de la sesión
+        target.execute("PRAGMA synchronous=OFF")
+        try:
+            # Foto consistente de la base durante todos los pasos
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            
+            def progress(status, remaining, total):
+                report.steps += 1
+                report.pages = total
+                if self._stop_event.is_set():
+                    raise sqlite3.OperationalError("backup cancelled")
+                if remaining:
+                    time.sleep(self.step_sleep)
+            
+            source.backup(target, pages=self.pages_per_step, progress=progress)
+            # El backup es un archivo suelto: sin -wal ni -shm al abrirlo
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+            source.close()
+    
+    @staticmethod
+    def _fsync(path: str):
+        with open(path, "rb") as backup_file:
+            os.fsync(backup_file.fileno())
+    
+    @staticmethod
+    def _check_integrity(path: str) -> str:
+        connection = sqlite3.connect(path)
+        try:
+            rows = connection.execute("PRAGMA integrity_check").fetchall()
+            return "; ".join(row[0] for row in rows)
+        finally:
+            connection.close()
+    
+    def _rotate(self):
+        """Borra los backups más viejos de esta base por encima de max_files"""
+        stem = os.path.splitext(os.path.basename(self.db_path))[0] + "_"
+        backups = sorted(name for name in os.listdir(self.backup_dir)
+                         if name.startswith(stem) and name.endswith(".db"))
+        for name in backups[:max(0, len(backups) - self.max_files)]:
+            os.remove(os.path.join(self.backup_dir, name))
+    
+    def stop(self, timeout: float = 5.0):
+        """Cancela el backup en curso (al salir) y espera al hilo"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._finish()
@@ -4,26 +4,48 @@
 import sqlite3
 import json
 import datetime
-from typing import List, Dict, Optional
-from ..models.planet import Planet
+import time
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from ..models.planet import Planet, PlanetType
 from ..models.donation import Donation
+from .schema import MINUTE_US, SCHEMA_VERSION, SchemaMigration, create_schema, from_epoch_us, get_version, to_epoch_us
 
 class DatabaseManager:
     """
     Gestiona la base de datos SQLite para persistencia de sesiones
     
-    Futuras mejoras:
-    - Backup automático de sesiones
-    - Migración de esquemas de base de datos
-    - Exportación a formatos externos (CSV, JSON)
-    - Índices para búsquedas rápidas en sesiones grandes
-    - Compresión de datos para sesiones muy largas
+    Donadores, sesiones y tipos de regalo se guardan una vez en su tabla
+    y las donaciones los referencian por id (ver schema.py); los ids ya
+    usados quedan en cache para no consultarlos en cada donación. La API
+    sigue recibiendo y retornando nombres y datetimes.
+    
+    Los totales de cada sesión (tabla sessions) y sus acumulados por
+    minuto (session_minutes) se actualizan en la misma transacción que
+    inserta las donaciones, así el historial y los gráficos no recorren
+    donations y siguen valiendo si las donaciones viejas se compactan.
+    
+    Las donaciones de sesiones viejas se pueden compactar a resúmenes por
+    donador y archivos comprimidos (ver SessionCompactor).
     """
     
     def __init__(self, db_path: str = "sessions.db"):
         self.db_path = db_path
         self.connection: Optional[sqlite3.Connection] = None
         self.current_session_id: Optional[str] = None
+        self._session_key: Optional[int] = None
+        self._donor_ids: Dict[str, int] = {}
+        self._gift_ids: Dict[str, int] = {}
+        self._session_ids: Dict[str, int] = {}
+        # Ids a nombre para armar donaciones sin JOIN en las lecturas masivas
+        self._donor_names: Dict[int, str] = {}
+        self._gift_names: Dict[int, str] = {}
+        # time.monotonic() de la última donación guardada (SessionCompactor espera a que pase un rato)
+        self.last_write_time = 0.0
+        # PRAGMA synchronous de la conexión: NORMAL (sin fsync por commit)
+        # cuando un DonationJournal ya hace durable cada donación
+        self.synchronous = "FULL"
+        # Id de la última donación confirmada (marca de un PlanetSnapshot)
+        self.last_donation_id = 0
     
     def initialize_session_database(self, session_id: str):
         """
@@ -32,60 +54,171 @@ class DatabaseManager:
         Futuras tablas:
         - session_settings (configuración por sesión)
         - planet_interactions (historial de cambios)
-        - performance_metrics (estadísticas de rendimiento)
         """
         self.current_session_id = session_id
+        if self.connection:
+            self.connection.close()
         self.connection = sqlite3.connect(self.db_path)
         self.connection.row_factory = sqlite3.Row
+        # Antes de WAL y de crear tablas: una base nueva queda con auto_vacuum
+        # incremental (SessionCompactor devuelve espacio por pasos); en una
+        # existente no cambia nada hasta el próximo VACUUM
+        self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # WAL: las lecturas de otras conexiones (backups, exportación) no
+        # bloquean al escritor de la sesión ni este a ellas
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={self.synchronous}")
         
-        # Crear tablas si no existen
+        # Crear tablas si no existen (o migrar una base con el esquema viejo)
         self._create_tables()
+        
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO sessions (name, start_time) VALUES (?, ?)",
+                                    (session_id, to_epoch_us(datetime.datetime.now())))
+            self._session_key = self._session_row_id(session_id)
+        self.last_donation_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM donations").fetchone()[0]
     
     def _create_tables(self):
         """Crea las tablas necesarias en la base de datos"""
-        cursor = self.connection.cursor()
-        
-        # Tabla de planetas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS planets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                donor_name TEXT NOT NULL,
-                total_value INTEGER NOT NULL,
-                planet_type TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                last_updated TEXT NOT NULL,
-                position_x INTEGER DEFAULT 0,
-                position_y INTEGER DEFAULT 0,
-                UNIQUE(session_id, donor_name)
-            )
-        """)
+        version = get_version(self.connection)
+        if version == 1:
+            print(f"Migrating {self.db_path} to schema v{SCHEMA_VERSION}...")
+            migration = SchemaMigration(self.connection)
+            migration.run()
+            print(f"Migrated {migration.rows_migrated} rows in {migration.elapsed_seconds:.1f}s")
+        create_schema(self.connection)
+    
+    @classmethod
+    def upgrade_schema(cls, db_path: str):
+        """Migra una base existente al esquema actual sin abrir una sesión"""
+        manager = cls(db_path)
+        manager.connection = sqlite3.connect(db_path)
+        try:
+            manager._create_tables()
+        finally:
+            manager.close()
+    
+    def _lookup_id(self, table: str, cache: Dict[str, int], name: str) -> int:
+        """Id de un nombre en donors/gift_types/sessions, insertándolo si falta"""
+        row_id = cache.get(name)
+        if row_id is None:
+            cursor = self.connection.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            if cursor.rowcount == 1:
+                row_id = cursor.lastrowid
+            else:
+                row_id = self.connection.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+            cache[name] = row_id
+        return row_id
+    
+    def _donor_id(self, name: str) -> int:
+        return self._lookup_id("donors", self._donor_ids, name)
+    
+    def _gift_id(self, name: str) -> int:
+        return self._lookup_id("gift_types", self._gift_ids, name)
+    
+    def has_session(self, session_id: str) -> bool:
+        """Verifica si la sesión existe en la base (sin crearla)"""
+        return self._session_row_id(session_id, create=False) is not None
+    
+    def _session_row_id(self, session_id: str, create: bool = True) -> Optional[int]:
+        if not create and session_id not in self._session_ids:
+            row = self.connection.execute("SELECT id FROM sessions WHERE name = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            self._session_ids[session_id] = row[0]
+        return self._lookup_id("sessions", self._session_ids, session_id)
+    
+    def _cache_names(self, table: str, names: Dict[int, str], ids: Iterable[int]):
+        """Trae de donors/gift_types los nombres de ids que todavía no están en cache"""
+        missing = [row_id for row_id in set(ids) if row_id not in names]
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for row_id, name in self.connection.execute(
+                    f"SELECT id, name FROM {table} WHERE id IN ({placeholders})", batch):
+                names[row_id] = name
+    
+    def _forget_ids(self):
+        """Descarta los ids en cache (una transacción revertida pudo haberlos creado)"""
+        self._donor_ids.clear()
+        self._gift_ids.clear()
+        self._session_ids.clear()
+        self._donor_names.clear()
+        self._gift_names.clear()
+    
+    SAVE_PLANET_SQL = """
+        INSERT INTO planets
+        (session_id, donor_id, total_value, planet_type, created_us, updated_us, position_x, position_y)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (session_id, donor_id) DO UPDATE SET
+            total_value = excluded.total_value, planet_type = excluded.planet_type,
+            updated_us = excluded.updated_us, position_x = excluded.position_x, position_y = excluded.position_y
+    """
+    
+    SAVE_DONATION_SQL = """
+        INSERT INTO donations
+        (session_id, donor_id, gift_id, value, timestamp_us)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    
+    SAVE_MINUTE_SQL = """
+        INSERT INTO session_minutes (session_id, minute, donations, total_value)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (session_id, minute) DO UPDATE SET
+            donations = donations + excluded.donations, total_value = total_value + excluded.total_value
+    """
+    
+    def _update_aggregates(self, cursor: sqlite3.Cursor, rows: List[Tuple], journal_seq: Optional[int] = None):
+        """
+        Suma donaciones recién insertadas a session_minutes y a los totales de sessions
         
-        # Tabla de donaciones
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS donations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                donor_name TEXT NOT NULL,
-                gift_type TEXT NOT NULL,
-                value INTEGER NOT NULL,
-                timestamp TEXT NOT NULL
-            )
-        """)
+        rows: filas de SAVE_DONATION_SQL, todas de la sesión actual. Se
+        llama dentro de la transacción que las inserta; journal_seq es el
+        último registro del journal que incluyen.
+        """
+        minutes: Dict[int, List[int]] = {}
+        donors = set()
+        for _, donor_id, _, value, timestamp_us in rows:
+            bucket = minutes.get(timestamp_us // MINUTE_US)
+            if bucket is None:
+                minutes[timestamp_us // MINUTE_US] = [1, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+            donors.add(donor_id)
         
-        # Tabla de sesiones (futura)
+        session_key = self._session_key
+        cursor.executemany(self.SAVE_MINUTE_SQL, [(session_key, minute, count, value)
+                                                  for minute, (count, value) in minutes.items()])
+        # rowcount de INSERT OR IGNORE: solo los donadores nuevos en la sesión
+        cursor.executemany("INSERT OR IGNORE INTO session_donors (session_id, donor_id) VALUES (?, ?)",
+                           [(session_key, donor_id) for donor_id in donors])
+        new_donors = max(cursor.rowcount, 0)
+        first = min(row[4] for row in rows)
+        last = max(row[4] for row in rows)
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                session_id TEXT PRIMARY KEY,
-                start_time TEXT NOT NULL,
-                end_time TEXT,
-                total_donations INTEGER DEFAULT 0,
-                total_value INTEGER DEFAULT 0,
-                unique_donors INTEGER DEFAULT 0
-            )
-        """)
-        
-        self.connection.commit()
+            UPDATE sessions SET
+                total_donations = total_donations + ?, total_value = total_value + ?,
+                unique_donors = unique_donors + ?,
+                start_time = MIN(COALESCE(start_time, ?), ?),
+                end_time = MAX(COALESCE(end_time, ?), ?),
+                journal_seq = MAX(journal_seq, ?)
+            WHERE id = ?
+        """, (len(rows), sum(row[3] for row in rows), new_donors, first, first, last, last,
+              journal_seq or 0, session_key))
+    
+    def _planet_row(self, planet: Planet) -> Tuple:
+        """Fila de la tabla planets para un planeta de la sesión actual"""
+        return (
+            self._session_key,
+            self._donor_id(planet.donor_name),
+            planet.total_value,
+            planet.planet_type.value,
+            to_epoch_us(planet.created_at),
+            to_epoch_us(planet.last_updated),
+            planet.position_x,
+            planet.position_y
+        )
     
     def save_planet(self, planet: Planet) -> bool:
         """
@@ -98,31 +231,24 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO planets 
-                (session_id, donor_name, total_value, planet_type, created_at, last_updated, position_x, position_y)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                self.current_session_id,
-                planet.donor_name,
-                planet.total_value,
-                planet.planet_type.value,
-                planet.created_at.isoformat(),
-                planet.last_updated.isoformat(),
-                planet.position_x,
-                planet.position_y
-            ))
+            cursor.execute(self.SAVE_PLANET_SQL, self._planet_row(planet))
             
             self.connection.commit()
             return True
-        except sqlite3.Error as e:
+        except (sqlite3.Error, OverflowError) as e:
+            # OverflowError: un valor que no entra en INTEGER de 64 bits
             print(f"Error saving planet: {e}")
+            self.connection.rollback()
+            self._forget_ids()
             return False
     
-    def save_donation(self, donation: Donation) -> bool:
+    def save_donation(self, donation: Donation, journal_seq: Optional[int] = None) -> bool:
         """
         Guarda una donación en la base de datos
         
+        journal_seq: número del registro de la donación en el
+        DonationJournal; queda en sessions como punto de recuperación.
+        
         Futuras validaciones:
         - Prevenir donaciones duplicadas
         - Validar rangos de valores
@@ -130,55 +256,132 @@ class DatabaseManager:
         try:
             cursor = self.connection.cursor()
             
-            cursor.execute("""
-                INSERT INTO donations 
-                (session_id, donor_name, gift_type, value, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                self.current_session_id,
-                donation.donor_name,
-                donation.gift_type,
+            row = (
+                self._session_key,
+                self._donor_id(donation.donor_name),
+                self._gift_id(donation.gift_type),
                 donation.value,
-                donation.timestamp.isoformat()
-            ))
+                to_epoch_us(donation.timestamp)
+            )
+            cursor.execute(self.SAVE_DONATION_SQL, row)
+            donation_id = cursor.lastrowid
+            self._update_aggregates(cursor, [row], journal_seq)
             
             self.connection.commit()
+            self.last_write_time = time.monotonic()
+            self.last_donation_id = donation_id
             return True
-        except sqlite3.Error as e:
+        except (sqlite3.Error, OverflowError) as e:
             print(f"Error saving donation: {e}")
+            self.connection.rollback()
+            self._forget_ids()
+            return False
+    
+    def bulk_import_donations(self, chunks: Iterable[List[Tuple[str, str, int, int]]],
+                              planets: Optional[Callable[[], Iterable[Planet]]] = None,
+                              journal_seq: Optional[int] = None) -> int:
+        """
+        Inserta donaciones por lotes en una sola transacción
+        
+        chunks: lotes de filas (donor_name, gift_type, value, timestamp en
+        microsegundos desde epoch); se consumen de a uno con executemany,
+        así el llamador puede leerlos de un archivo sin tenerlos todos en
+        memoria.
+        planets: se llama después del último lote y sus planetas se guardan
+        en la misma transacción.
+        journal_seq: último registro del DonationJournal incluido (recuperación).
+        
+        Si algo falla no queda nada a medias (rollback). Retorna las
+        donaciones insertadas, o -1 si hubo error.
+        """
+        session_key = self._session_key
+        donor_id = self._donor_id
+        gift_id = self._gift_id
+        inserted = 0
+        try:
+            with self.connection:
+                cursor = self.connection.cursor()
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    rows = [(session_key, donor_id(donor), gift_id(gift), value, timestamp)
+                            for donor, gift, value, timestamp in chunk]
+                    cursor.executemany(self.SAVE_DONATION_SQL, rows)
+                    self._update_aggregates(cursor, rows, journal_seq)
+                    inserted += len(rows)
+                if planets is not None:
+                    cursor.executemany(self.SAVE_PLANET_SQL, [self._planet_row(planet) for planet in planets()])
+                last_donation_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM donations").fetchone()[0]
+            self.last_write_time = time.monotonic()
+            self.last_donation_id = last_donation_id
+            return inserted
+        except sqlite3.Error as e:
+            print(f"Error importing donations: {e}")
+            self._forget_ids()
+            return -1
+    
+    def save_performance_metrics(self, record: Dict) -> bool:
+        """
+        Guarda un registro exportado por el FrameProfiler
+        
+        Se inserta una fila por etapa con sus percentiles de la ventana.
+        """
+        try:
+            recorded_us = to_epoch_us(datetime.datetime.fromisoformat(record["recorded_at"]))
+            rows = [
+                (self._session_key, recorded_us, stage, record["frames"],
+                 stats["p50"], stats["p95"], stats["p99"], stats["max"])
+                for stage, stats in record["stages"].items()
+            ]
+            self.connection.executemany("""
+                INSERT INTO performance_metrics
+                (session_id, recorded_us, stage, frames, p50_ms, p95_ms, p99_ms, max_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.connection.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving performance metrics: {e}")
             return False
     
     def load_session_planets(self) -> List[Planet]:
         """
         Carga todos los planetas de la sesión actual
         
-        Futuras optimizaciones:
-        - Carga paginada para sesiones grandes
-        - Cache en memoria para acceso rápido
+        El historial de todos los planetas se arma con una sola lectura de
+        las donaciones de la sesión en orden cronológico (una donación va
+        al planeta de su donador sin distinguir mayúsculas, como en
+        PlanetSystem).
         """
         try:
             cursor = self.connection.cursor()
             
             cursor.execute("""
-                SELECT * FROM planets 
-                WHERE session_id = ? 
-                ORDER BY last_updated DESC
-            """, (self.current_session_id,))
+                SELECT donors.name, planets.total_value, planets.planet_type, planets.created_us,
+                       planets.updated_us, planets.position_x, planets.position_y
+                FROM planets JOIN donors ON donors.id = planets.donor_id
+                WHERE planets.session_id = ?
+                ORDER BY planets.updated_us DESC
+            """, (self._session_key,))
             
             planets = []
+            by_donor: Dict[str, Planet] = {}
             for row in cursor.fetchall():
-                planet = Planet(row['donor_name'])
-                planet.total_value = row['total_value']
-                planet.planet_type = Planet.PlanetType(row['planet_type'])
-                planet.created_at = datetime.datetime.fromisoformat(row['created_at'])
-                planet.last_updated = datetime.datetime.fromisoformat(row['last_updated'])
-                planet.position_x = row['position_x']
-                planet.position_y = row['position_y']
-                
-                # Cargar historial de donaciones
-                planet.donations_history = self.load_planet_donations(planet.donor_name)
-                
+                planet = Planet(row[0])
+                planet.total_value = row[1]
+                planet.planet_type = PlanetType(row[2])
+                planet.created_at = from_epoch_us(row[3])
+                planet.last_updated = from_epoch_us(row[4])
+                planet.position_x = row[5]
+                planet.position_y = row[6]
                 planets.append(planet)
+                by_donor[planet.donor_name.lower()] = planet
+            
+            # Cargar historial de donaciones
+            for donation in self.iter_session_donations(self.current_session_id, chunk_size=5000):
+                planet = by_donor.get(donation.donor_name.lower())
+                if planet is not None:
+                    planet.donations_history.append(donation)
             
             return planets
         except sqlite3.Error as e:
@@ -191,15 +394,18 @@ class DatabaseManager:
             cursor = self.connection.cursor()
             
             cursor.execute("""
-                SELECT * FROM donations 
-                WHERE session_id = ? AND donor_name = ?
-                ORDER BY timestamp ASC
-            """, (self.current_session_id, donor_name))
+                SELECT donors.name, gift_types.name, donations.value, donations.timestamp_us
+                FROM donations
+                JOIN donors ON donors.id = donations.donor_id
+                JOIN gift_types ON gift_types.id = donations.gift_id
+                WHERE donations.session_id = ? AND donors.name = ?
+                ORDER BY donations.timestamp_us ASC
+            """, (self._session_key, donor_name))
             
             donations = []
             for row in cursor.fetchall():
-                donation = Donation(row['donor_name'], row['gift_type'], row['value'])
-                donation.timestamp = datetime.datetime.fromisoformat(row['timestamp'])
+                donation = Donation(row[0], row[1], row[2])
+                donation.timestamp = from_epoch_us(row[3])
                 donations.append(donation)
             
             return donations
@@ -207,24 +413,225 @@ class DatabaseManager:
             print(f"Error loading donations: {e}")
             return []
     
+    def iter_session_donations(self, session_id: str, start_time: Optional[datetime.datetime] = None,
+                               chunk_size: int = 1000) -> Iterator[Donation]:
+        """
+        Itera las donaciones de una sesión en orden cronológico
+        
+        Lee por páginas (keyset sobre timestamp_us, id) para no cargar
+        sesiones enormes en memoria y sin dejar una lectura abierta entre
+        páginas, así no bloquea al escritor de la sesión en vivo.
+        start_time permite empezar a mitad de sesión.
+        """
+        session_key = self._session_row_id(session_id, create=False)
+        if session_key is None:
+            return
+        last_key = (to_epoch_us(start_time) if start_time else -1, -1)
+        
+        donor_names = self._donor_names
+        gift_names = self._gift_names
+        fromtimestamp = datetime.datetime.fromtimestamp  # from_epoch_us sin la llamada extra
+        
+        while True:
+            cursor = self.connection.cursor()
+            cursor.row_factory = None  # Tuplas simples: más rápidas que sqlite3.Row
+            cursor.execute("""
+                SELECT id, donor_id, gift_id, value, timestamp_us FROM donations
+                WHERE session_id = ? AND (timestamp_us, id) > (?, ?)
+                ORDER BY timestamp_us ASC, id ASC
+                LIMIT ?
+            """, (session_key, last_key[0], last_key[1], chunk_size))
+            rows = cursor.fetchall()
+            cursor.close()
+            self._cache_names("donors", donor_names, [row[1] for row in rows])
+            self._cache_names("gift_types", gift_names, [row[2] for row in rows])
+            
+            for row in rows:
+                donation = Donation(donor_names[row[1]], gift_names[row[2]], row[3])
+                donation.timestamp = fromtimestamp(row[4] / 1_000_000)
+                donation.session_id = session_id
+                yield donation
+            
+            if len(rows) < chunk_size:
+                break
+            last_key = (rows[-1][4], rows[-1][0])
+    
+    def iter_donations_since(self, session_id: str, after_id: int, chunk_size: int = 1000) -> Iterator[Donation]:
+        """
+        Donaciones de una sesión con id mayor que after_id, en orden de inserción
+        
+        La cola posterior a un PlanetSnapshot: recorre solo el rango de ids
+        nuevos, no la sesión entera.
+        """
+        session_key = self._session_row_id(session_id, create=False)
+        if session_key is None:
+            return
+        donor_names = self._donor_names
+        gift_names = self._gift_names
+        fromtimestamp = datetime.datetime.fromtimestamp
+        
+        while True:
+            cursor = self.connection.cursor()
+            cursor.row_factory = None
+            # +session_id: SQLite no usa el índice por sesión y recorre el rango de la clave primaria
+            cursor.execute("""
+                SELECT id, donor_id, gift_id, value, timestamp_us FROM donations
+                WHERE id > ? AND +session_id = ?
+                ORDER BY id LIMIT ?
+            """, (after_id, session_key, chunk_size))
+            rows = cursor.fetchall()
+            cursor.close()
+            self._cache_names("donors", donor_names, [row[1] for row in rows])
+            self._cache_names("gift_types", gift_names, [row[2] for row in rows])
+            
+            for row in rows:
+                donation = Donation(donor_names[row[1]], gift_names[row[2]], row[3])
+                donation.timestamp = fromtimestamp(row[4] / 1_000_000)
+                donation.session_id = session_id
+                yield donation
+            
+            if len(rows) < chunk_size:
+                break
+            after_id = rows[-1][0]
+    
+    def get_session_time_range(self, session_id: str) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime], int]:
+        """Retorna (primera donación, última donación, cantidad) de una sesión"""
+        try:
+            session_key = self._session_row_id(session_id, create=False)
+            if session_key is None:
+                return None, None, 0
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT MIN(timestamp_us), MAX(timestamp_us), COUNT(*) FROM donations
+                WHERE session_id = ?
+            """, (session_key,))
+            first, last, count = cursor.fetchone()
+            if not count:
+                return None, None, 0
+            return from_epoch_us(first), from_epoch_us(last), count
+        except sqlite3.Error as e:
+            print(f"Error reading session range: {e}")
+            return None, None, 0
+    
+    def get_session_ids(self) -> List[str]:
+        """Retorna los ids de sesiones con donaciones registradas"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT name FROM sessions WHERE total_donations > 0 ORDER BY name
+            """)
+            return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error:
+            return []
+    
     def get_planet_count(self) -> int:
         """Retorna el número total de planetas en la sesión"""
         try:
             cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM planets WHERE session_id = ?", (self.current_session_id,))
+            cursor.execute("SELECT COUNT(*) FROM planets WHERE session_id = ?", (self._session_key,))
             return cursor.fetchone()[0]
         except sqlite3.Error:
             return 0
     
     def get_total_donation_value(self) -> int:
         """Retorna el valor total de todas las donaciones en la sesión"""
+        return self.get_session_totals()["total_value"]
+    
+    def get_journal_seq(self) -> int:
+        """Último registro del DonationJournal confirmado en la sesión actual"""
+        row = self.connection.execute("SELECT journal_seq FROM sessions WHERE id = ?", (self._session_key,)).fetchone()
+        return row[0] if row else 0
+    
+    @staticmethod
+    def durable_journal_seq(db_path: str, session_id: str) -> int:
+        """
+        Último registro del journal que ya está en disco en la base (-1 si no se sabe)
+        
+        Con synchronous=NORMAL un commit queda en el WAL sin fsync; recién
+        un checkpoint completo lo asegura en el archivo. Se lee el número y
+        después se hace el checkpoint con una conexión propia (se puede
+        llamar desde otro hilo): si el checkpoint copió todo el WAL, ese
+        número es durable.
+        """
+        connection = sqlite3.connect(db_path, timeout=1.0)
+        try:
+            row = connection.execute("SELECT journal_seq FROM sessions WHERE name = ?", (session_id,)).fetchone()
+            busy, log_frames, checkpointed = connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            if row is None or busy or log_frames != checkpointed:
+                return -1
+            return row[0]
+        except sqlite3.Error:
+            return -1
+        finally:
+            connection.close()
+    
+    def get_session_totals(self) -> Dict:
+        """Totales de la sesión actual (donaciones, valor y donadores únicos) desde sessions"""
+        totals = {"total_donations": 0, "total_value": 0, "unique_donors": 0}
         try:
             cursor = self.connection.cursor()
-            cursor.execute("SELECT SUM(value) FROM donations WHERE session_id = ?", (self.current_session_id,))
-            result = cursor.fetchone()[0]
-            return result if result else 0
+            cursor.execute("SELECT total_donations, total_value, unique_donors FROM sessions WHERE id = ?",
+                           (self._session_key,))
+            row = cursor.fetchone()
+            if row is not None:
+                totals.update(zip(totals, row))
         except sqlite3.Error:
-            return 0
+            pass
+        return totals
+    
+    def get_session_history(self, limit: int = 50) -> List[Dict]:
+        """
+        Sesiones más recientes con sus totales, de la más nueva a la más vieja
+        
+        Se leen de la tabla sessions (una fila por sesión), sin recorrer
+        donaciones.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT name, start_time, end_time, total_donations, total_value, unique_donors
+                FROM sessions ORDER BY start_time DESC LIMIT ?
+            """, (limit,))
+            return [{
+                "session_id": row[0],
+                "start_time": from_epoch_us(row[1]) if row[1] is not None else None,
+                "end_time": from_epoch_us(row[2]) if row[2] is not None else None,
+                "total_donations": row[3],
+                "total_value": row[4],
+                "unique_donors": row[5]
+            } for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error reading session history: {e}")
+            return []
+    
+    def get_session_rollup(self, session_id: str, start_time: Optional[datetime.datetime] = None,
+                           end_time: Optional[datetime.datetime] = None,
+                           bucket_minutes: int = 1) -> List[Tuple[datetime.datetime, int, int]]:
+        """
+        Donaciones y valor por intervalo de una sesión, para gráficos
+        
+        Retorna (inicio del intervalo, donaciones, valor) de los intervalos
+        de bucket_minutes con actividad entre start_time y end_time, desde
+        session_minutes (a lo sumo una fila por minuto de sesión).
+        """
+        try:
+            session_key = self._session_row_id(session_id, create=False)
+            if session_key is None:
+                return []
+            first = to_epoch_us(start_time) // MINUTE_US if start_time else -1
+            last = to_epoch_us(end_time) // MINUTE_US if end_time else 2 ** 62
+            bucket_minutes = max(1, int(bucket_minutes))
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT minute - minute % ? AS bucket, SUM(donations), SUM(total_value)
+                FROM session_minutes
+                WHERE session_id = ? AND minute BETWEEN ? AND ?
+                GROUP BY bucket ORDER BY bucket
+            """, (bucket_minutes, session_key, first, last))
+            return [(from_epoch_us(row[0] * MINUTE_US), row[1], row[2]) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error reading session rollup: {e}")
+            return []
     
     def close(self):
         """
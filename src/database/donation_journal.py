@@ -0,0 +1,329 @@
+# Donation Journal - Registro append-only de las donaciones recibidas
+# Segmentos binarios con registros de largo prefijado y CRC, fsync agrupado en un hilo aparte
+
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"PJNL"
+JOURNAL_VERSION = 1
+SEGMENT_SUFFIX = ".jnl"
+
+# Encabezado de segmento: magic, versión, largo del id de sesión (y el id en UTF-8)
+_SEGMENT_HEADER = struct.Struct("<4sBH")
+# Encabezado de registro: largo del cuerpo y CRC32 del cuerpo
+_RECORD_HEADER = struct.Struct("<II")
+# Cuerpo: seq, timestamp_us, valor, largo del donador y del regalo (y ambos en UTF-8)
+_RECORD_BODY = struct.Struct("<QqqHH")
+
+# (seq, donor_name, gift_type, value, timestamp_us)
+JournalRecord = Tuple[int, str, str, int, int]
+
+def encode_record(seq: int, donor_name: str, gift_type: str, value: int, timestamp_us: int) -> bytes:
+    """Un registro listo para escribir: encabezado con largo y CRC, y el cuerpo"""
+    donor = donor_name.encode("utf-8")
+    gift = gift_type.encode("utf-8")
+    body = _RECORD_BODY.pack(seq, timestamp_us, value, len(donor), len(gift)) + donor + gift
+    return _RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+
+def _parse_header(data: bytes) -> Tuple[Optional[str], int]:
+    """(id de sesión, posición del primer registro); (None, 0) si el encabezado no es válido"""
+    if len(data) < _SEGMENT_HEADER.size:
+        return None, 0
+    magic, version, name_length = _SEGMENT_HEADER.unpack_from(data)
+    offset = _SEGMENT_HEADER.size + name_length
+    if magic != MAGIC or version != JOURNAL_VERSION or offset > len(data):
+        return None, 0
+    return data[_SEGMENT_HEADER.size:offset].decode("utf-8"), offset
+
+def read_segment_session(path: str) -> Optional[str]:
+    """Sesión de un segmento leyendo solo su encabezado"""
+    with open(path, "rb") as segment:
+        return _parse_header(segment.read(_SEGMENT_HEADER.size + 0xFFFF))[0]
+
+def read_segment(path: str, after_seq: int = 0) -> Tuple[Optional[str], List[JournalRecord], bool]:
+    """
+    Lee un segmento completo: (id de sesión, registros, terminó limpio)
+    
+    La lectura se detiene en el primer registro incompleto o con CRC
+    inválido (la cola de una escritura cortada); lo anterior es válido.
+    Los registros con seq <= after_seq se verifican pero no se decodifican.
+    Un encabezado ilegible retorna (None, [], False).
+    """
+    with open(path, "rb") as segment:
+        data = segment.read()
+    session_id, offset = _parse_header(data)
+    if session_id is None:
+        return None, [], False
+    
+    records: List[JournalRecord] = []
+    view = memoryview(data)
+    header_size = _RECORD_HEADER.size
+    end = len(data)
+    while offset + header_size <= end:
+        length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + header_size
+        if length < _RECORD_BODY.size or start + length > end or zlib.crc32(view[start:start + length]) != crc:
+            return session_id, records, False
+        seq, timestamp_us, value, donor_length, gift_length = _RECORD_BODY.unpack_from(data, start)
+        position = start + _RECORD_BODY.size
+        if position + donor_length + gift_length != start + length:
+            return session_id, records, False
+        offset = start + length
+        if seq <= after_seq:
+            continue
+        donor_name = data[position:position + donor_length].decode("utf-8")
+        gift_type = data[position + donor_length:start + length].decode("utf-8")
+        records.append((seq, donor_name, gift_type, value, timestamp_us))
+    return session_id, records, offset == end
+
+def list_segments(directory: str) -> List[str]:
+    """Segmentos del directorio en orden (el nombre es el primer seq, con ceros a la izquierda)"""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.endswith(SEGMENT_SUFFIX)]
+
+def segment_start(path: str) -> int:
+    """Primer seq de un segmento según su nombre"""
+    return int(os.path.basename(path)[:-len(SEGMENT_SUFFIX)])
+
+def _fsync_directory(directory: str):
+    """Hace durable la creación o el borrado de un archivo (no disponible en Windows)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+class DonationJournal:
+    """
+    Journal append-only de las donaciones de la sesión en vivo
+    
+    append() solo codifica el registro y lo agrega a un buffer en memoria
+    (unos microsegundos en el hilo principal). Un hilo de fondo escribe el
+    buffer y hace fsync cada commit_interval_ms: todas las donaciones de
+    ese intervalo quedan durables con un solo fsync (group commit). Un
+    corte pierde a lo sumo ese intervalo.
+    
+    Los registros van en segmentos <directorio>/<primer seq>.jnl; al pasar
+    segment_bytes se abre uno nuevo. Cada registro lleva un número (seq)
+    creciente que la base guarda en sessions.journal_seq al confirmar la
+    donación: un segmento cerrado se borra cuando durable_seq(sesión) (la
+    base ya en disco) cubre su último registro. close(remove=True) borra todo
+    tras un cierre limpio; si al iniciar quedan segmentos, la sesión no se
+    cerró bien y los registros posteriores a journal_seq se reaplican.
+    """
+    
+    def __init__(self, directory: str, session_id: str, next_seq: int = 1, commit_interval_ms: float = 20,
+                 segment_bytes: int = 16 * 1024 * 1024, durable_seq: Optional[Callable[[str], int]] = None):
+        self.directory = directory
+        self.session_id = session_id
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.segment_bytes = segment_bytes
+        self.durable_seq = durable_seq
+        
+        self.records_written = 0
+        self.commits = 0
+        self.error: Optional[OSError] = None
+        self._next_seq = next_seq
+        self._synced_seq = next_seq - 1
+        self._pending: List[bytes] = []
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._closing = False
+        self._switch_pending = False
+        
+        os.makedirs(directory, exist_ok=True)
+        # Segmentos cerrados (ruta, sesión, último seq) que esperan a la base; solo el hilo de escritura los toca
+        self._closed_segments: List[Tuple[str, str, int]] = []
+        self._next_release = 0.0
+        self._segment = None
+        self._segment_path = ""
+        self._segment_session = session_id
+        self._segment_size = 0
+        self._open_segment(next_seq)
+        self._thread = threading.Thread(target=self._run, name="donation-journal", daemon=True)
+        self._thread.start()
+    
+    @property
+    def last_seq(self) -> int:
+        """Número del último registro agregado"""
+        return self._next_seq - 1
+    
+    @property
+    def synced_seq(self) -> int:
+        """Número del último registro ya en disco"""
+        return self._synced_seq
+    
+    def append(self, donor_name: str, gift_type: str, value: int, timestamp_us: int) -> int:
+        """
+        Agrega una donación al buffer y retorna su seq (se escribe en el próximo commit)
+        
+        struct.error si value o timestamp_us no entran en 64 bits; el seq no se consume.
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._pending.append(encode_record(seq, donor_name, gift_type, value, timestamp_us))
+            self._next_seq = seq + 1
+        return seq
+    
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todo lo agregado esté en disco (False si vence timeout o hubo error)"""
+        with self._lock:
+            target = self._next_seq - 1
+            self._wake.set()
+            self._synced.wait_for(lambda: self._synced_seq >= target or self.error is not None
+                                  or not self._thread.is_alive(), timeout)
+            return self._synced_seq >= target
+    
+    def switch_session(self, session_id: str):
+        """Los registros siguientes son de otra sesión: van a un segmento nuevo"""
+        self.sync()
+        with self._lock:
+            self.session_id = session_id
+            self._switch_pending = True
+        self._wake.set()
+    
+    def close(self, remove: bool = False):
+        """
+        Escribe lo pendiente y detiene el hilo
+        
+        remove: borra los segmentos cuya base ya está en disco (todos tras
+        un cierre limpio de la sesión).
+        """
+        with self._lock:
+            self._closing = True
+        self._wake.set()
+        self._thread.join()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+            self._closed_segments.append((self._segment_path, self._segment_session, self._synced_seq))
+        if remove:
+            self._release_segments()
+    
+    @staticmethod
+    def pending_session(directory: str) -> Optional[str]:
+        """Sesión con segmentos sin borrar (no se cerró bien), o None"""
+        for path in reversed(list_segments(directory)):
+            session_id = read_segment_session(path)
+            if session_id:
+                return session_id
+        return None
+    
+    @staticmethod
+    def iter_records(directory: str, session_id: str, after_seq: int = 0) -> Iterator[JournalRecord]:
+        """Registros de la sesión con seq mayor que after_seq, en orden"""
+        segments = list_segments(directory)
+        for index, path in enumerate(segments):
+            # El segmento siguiente empieza después de after_seq: este no tiene nada nuevo
+            if index + 1 < len(segments) and segment_start(segments[index + 1]) <= after_seq + 1:
+                continue
+            if read_segment_session(path) != session_id:
+                continue
+            _, records, clean = read_segment(path, after_seq)
+            if not clean:
+                print(f"Journal segment {path} ends in a torn or corrupt record; replaying up to it")
+            yield from records
+    
+    @staticmethod
+    def remove_segments(directory: str, paths: Optional[List[str]] = None):
+        """Borra segmentos ya aplicados (todos los del directorio si paths es None)"""
+        for path in list_segments(directory) if paths is None else paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if os.path.isdir(directory):
+            _fsync_directory(directory)
+    
+    def _open_segment(self, first_seq: int):
+        self._segment_session = self.session_id
+        name = self.session_id.encode("utf-8")
+        self._segment_path = os.path.join(self.directory, f"{first_seq:016d}{SEGMENT_SUFFIX}")
+        self._segment = open(self._segment_path, "ab")
+        if self._segment.tell() == 0:
+            self._segment.write(_SEGMENT_HEADER.pack(MAGIC, JOURNAL_VERSION, len(name)) + name)
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            _fsync_directory(self.directory)
+        self._segment_size = self._segment.tell()
+    
+    def _run(self):
+        """Hilo de escritura: un write y un fsync por intervalo con todo lo acumulado"""
+        while True:
+            self._wake.wait(self.commit_interval)
+            self._wake.clear()
+            with self._lock:
+                pending = self._pending
+                self._pending = []
+                last_seq = self._next_seq - 1
+                closing = self._closing
+                switch = self._switch_pending
+                self._switch_pending = False
+            if switch and self.error is None:
+                try:
+                    self._rotate()
+                except OSError as e:
+                    print(f"Error writing donation journal: {e}")
+                    self.error = e
+            if pending and self.error is None:
+                try:
+                    self._commit(pending, last_seq)
+                except OSError as e:
+                    print(f"Error writing donation journal: {e}")
+                    self.error = e
+            with self._lock:
+                self._synced.notify_all()
+            if closing:
+                return
+    
+    def _commit(self, pending: List[bytes], last_seq: int):
+        data = b"".join(pending)
+        self._segment.write(data)
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        self._segment_size += len(data)
+        with self._lock:
+            self._synced_seq = last_seq
+        self.records_written += len(pending)
+        self.commits += 1
+        
+        if self._segment_size >= self.segment_bytes:
+            self._rotate()
+        # Consultar la base cuesta un checkpoint: a lo sumo una vez por segundo
+        if self._closed_segments and time.monotonic() >= self._next_release:
+            self._next_release = time.monotonic() + 1.0
+            self._release_segments()
+    
+    def _rotate(self):
+        """Cierra el segmento actual y abre uno que empieza en el próximo registro"""
+        self._segment.close()
+        if self._synced_seq + 1 == segment_start(self._segment_path):
+            # Sin registros: el nuevo se llamaría igual
+            os.remove(self._segment_path)
+        else:
+            self._closed_segments.append((self._segment_path, self._segment_session, self._synced_seq))
+        self._open_segment(self._synced_seq + 1)
+        self._next_release = 0.0
+    
+    def _release_segments(self):
+        """Borra los segmentos cerrados que la base ya tiene en disco"""
+        durable: Dict[str, int] = {}
+        released = []
+        for segment in self._closed_segments:
+            path, session_id, last_seq = segment
+            if session_id not in durable:
+                durable[session_id] = self.durable_seq(session_id) if self.durable_seq else -1
+            if last_seq <= durable[session_id]:
+                released.append(segment)
+        if released:
+            self._closed_segments = [segment for segment in self._closed_segments if segment not in released]
+            self.remove_segments(self.directory, [segment[0] for segment in released])
@@ -0,0 +1,149 @@
+# Query Service - Consultas de lectura en segundo plano
+# Detalles de planetas desde una conexión WAL de solo lectura en un hilo aparte, con cache por donador
+
+import datetime
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from ..models.donation import Donation
+
+class PlanetDetails:
+    """Detalles de un planeta de la sesión leídos de la base"""
+    
+    def __init__(self, donor_name: str, session_id: str):
+        self.donor_name = donor_name
+        self.session_id = session_id
+        self.total_value = 0
+        self.rank = 0
+        self.total_planets = 0
+        self.first_seen: Optional[datetime.datetime] = None
+        self.last_seen: Optional[datetime.datetime] = None
+        # Donaciones en orden cronológico y cantidad por tipo de regalo
+        self.history: List[Donation] = []
+        self.gift_counts: Dict[str, int] = {}
+    
+    @property
+    def donation_count(self) -> int:
+        return len(self.history)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "donor_name": self.donor_name,
+            "session_id": self.session_id,
+            "total_value": self.total_value,
+            "rank": self.rank,
+            "total_planets": self.total_planets,
+            "donations": self.donation_count,
+            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "gift_counts": dict(self.gift_counts)
+        }
+
+class ReadQueryService:
+    """
+    Consultas de lectura que no bloquean el loop de render
+    
+    Las consultas corren en un único hilo de fondo con su propia conexión
+    de solo lectura: con la base en WAL lee la última versión confirmada
+    sin esperar al escritor de la sesión ni frenarlo. Cada consulta
+    retorna un Future que la UI revisa con done() una vez por frame.
+    
+    Los resultados quedan en cache por donador (LRU de max_cached); un
+    clic repetido reutiliza el Future ya resuelto. invalidate() descarta
+    el de un donador cuando recibe una donación; la consulta siguiente
+    tiene que pedirse después de confirmar la donación en la base, o
+    podría leer la versión anterior.
+    """
+    
+    def __init__(self, db_path: str, session_id: str, max_cached: int = 256):
+        self.db_path = db_path
+        self.session_id = session_id
+        self.max_cached = max_cached
+        self.queries_run = 0
+        self.cache_hits = 0
+        self._cache: "OrderedDict[str, Future]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-read")
+        # Solo se usa desde el hilo del executor
+        self._connection: Optional[sqlite3.Connection] = None
+    
+    def set_session(self, session_id: str):
+        """Cambia la sesión consultada y descarta la cache"""
+        self.session_id = session_id
+        self._cache.clear()
+    
+    def planet_details(self, donor_name: str) -> Future:
+        """Future con los PlanetDetails del donador (None si no tiene planeta en la sesión)"""
+        key = donor_name.lower()
+        future = self._cache.get(key)
+        if future is not None and not (future.done() and (future.cancelled() or future.exception())):
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return future
+        future = self._executor.submit(self._load_planet_details, self.session_id, donor_name)
+        self._cache[key] = future
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return future
+    
+    def invalidate(self, donor_name: str):
+        """Descarta el resultado en cache de un donador"""
+        self._cache.pop(donor_name.lower(), None)
+    
+    def close(self):
+        """Cancela lo pendiente, cierra la conexión y espera al hilo"""
+        for future in self._cache.values():
+            future.cancel()
+        self._cache.clear()
+        self._executor.submit(self._close_connection)
+        self._executor.shutdown(wait=True)
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return self._connection
+    
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def _load_planet_details(self, session_id: str, donor_name: str) -> Optional[PlanetDetails]:
+        """Hilo de lectura: planeta, posición en el ranking e historial del donador"""
+        self.queries_run += 1
+        connection = self._connect()
+        row = connection.execute("""
+            SELECT planets.session_id, planets.donor_id, planets.total_value, planets.created_us
+            FROM planets
+            JOIN sessions ON sessions.id = planets.session_id
+            JOIN donors ON donors.id = planets.donor_id
+            WHERE sessions.name = ? AND donors.name = ?
+        """, (session_id, donor_name)).fetchone()
+        if row is None:
+            return None
+        session_key, donor_id, total_value, created_us = row
+        
+        details = PlanetDetails(donor_name, session_id)
+        details.total_value = total_value
+        details.first_seen = datetime.datetime.fromtimestamp(created_us / 1_000_000)
+        details.rank, details.total_planets = connection.execute("""
+            SELECT 1 + SUM(total_value > ?), COUNT(*) FROM planets WHERE session_id = ?
+        """, (total_value, session_key)).fetchone()
+        
+        fromtimestamp = datetime.datetime.fromtimestamp
+        gift_counts = details.gift_counts
+        for gift_type, value, timestamp_us in connection.execute("""
+            SELECT gift_types.name, donations.value, donations.timestamp_us
+            FROM donations JOIN gift_types ON gift_types.id = donations.gift_id
+            WHERE donations.session_id = ? AND donations.donor_id = ?
+            ORDER BY donations.timestamp_us
+        """, (session_key, donor_id)):
+            donation = Donation(donor_name, gift_type, value)
+            donation.timestamp = fromtimestamp(timestamp_us / 1_000_000)
+            donation.session_id = session_id
+            details.history.append(donation)
+            gift_counts[gift_type] = gift_counts.get(gift_type, 0) + 1
+        if details.history:
+            details.first_seen = min(details.first_seen, details.history[0].timestamp)
+            details.last_seen = details.history[-1].timestamp
+        return details
@@ -0,0 +1,320 @@
+# Schema - Esquema versionado de la base de sesiones
+# Tablas normalizadas (donadores, sesiones y regalos por id) y migración desde el esquema de texto
+
+import datetime
+import sqlite3
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# PRAGMA user_version de una base con el esquema actual. Las bases creadas
+# antes del versionado tienen user_version 0 y donaciones con texto (v1);
+# v2 normalizó donadores, sesiones y horas; v3 agregó los acumulados;
+# v4 los resúmenes por donador de las sesiones compactadas; v5 el índice
+# por donador para los detalles de un planeta; v6 sessions.journal_seq.
+SCHEMA_VERSION = 6
+
+# Microsegundos por bucket de session_minutes
+MINUTE_US = 60_000_000
+
+SCHEMA_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        start_time INTEGER,
+        end_time INTEGER,
+        total_donations INTEGER DEFAULT 0,
+        total_value INTEGER DEFAULT 0,
+        unique_donors INTEGER DEFAULT 0,
+        journal_seq INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS donors (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gift_types (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    # Hora en microsegundos desde epoch (timestamp * 1e6, hora local al convertir)
+    """
+    CREATE TABLE IF NOT EXISTS donations (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER NOT NULL,
+        donor_id INTEGER NOT NULL,
+        gift_id INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        timestamp_us INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS planets (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER NOT NULL,
+        donor_id INTEGER NOT NULL,
+        total_value INTEGER NOT NULL,
+        planet_type TEXT NOT NULL,
+        created_us INTEGER NOT NULL,
+        updated_us INTEGER NOT NULL,
+        position_x INTEGER DEFAULT 0,
+        position_y INTEGER DEFAULT 0,
+        UNIQUE(session_id, donor_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS performance_metrics (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER NOT NULL,
+        recorded_us INTEGER NOT NULL,
+        stage TEXT NOT NULL,
+        frames INTEGER NOT NULL,
+        p50_ms REAL NOT NULL,
+        p95_ms REAL NOT NULL,
+        p99_ms REAL NOT NULL,
+        max_ms REAL NOT NULL
+    )
+    """,
+    # Lecturas ordenadas por sesión (replay, exportación, restauración)
+    """
+    CREATE INDEX IF NOT EXISTS idx_donations_session_time
+    ON donations (session_id, timestamp_us)
+    """,
+    # Historial de un donador sin recorrer toda la sesión (detalles del planeta)
+    """
+    CREATE INDEX IF NOT EXISTS idx_donations_session_donor
+    ON donations (session_id, donor_id, timestamp_us)
+    """,
+    # Acumulados por sesión y minuto (los mantiene DatabaseManager al escribir)
+    """
+    CREATE TABLE IF NOT EXISTS session_minutes (
+        session_id INTEGER NOT NULL,
+        minute INTEGER NOT NULL,
+        donations INTEGER NOT NULL,
+        total_value INTEGER NOT NULL,
+        PRIMARY KEY (session_id, minute)
+    ) WITHOUT ROWID
+    """,
+    # Donadores distintos de cada sesión (para sessions.unique_donors)
+    """
+    CREATE TABLE IF NOT EXISTS session_donors (
+        session_id INTEGER NOT NULL,
+        donor_id INTEGER NOT NULL,
+        PRIMARY KEY (session_id, donor_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_sessions_start
+    ON sessions (start_time)
+    """,
+    # Totales por donador de una sesión cuyas donaciones se compactaron
+    """
+    CREATE TABLE IF NOT EXISTS donor_summaries (
+        session_id INTEGER NOT NULL,
+        donor_id INTEGER NOT NULL,
+        donations INTEGER NOT NULL,
+        total_value INTEGER NOT NULL,
+        first_us INTEGER NOT NULL,
+        last_us INTEGER NOT NULL,
+        PRIMARY KEY (session_id, donor_id)
+    ) WITHOUT ROWID
+    """,
+    # Sesiones compactadas (compacted_us es NULL mientras la compactación avanza)
+    """
+    CREATE TABLE IF NOT EXISTS session_archives (
+        session_id INTEGER PRIMARY KEY,
+        archive_path TEXT,
+        rows_archived INTEGER NOT NULL DEFAULT 0,
+        compacted_us INTEGER
+    )
+    """
+)
+
+def to_epoch_us(moment: datetime.datetime) -> int:
+    """Microsegundos desde epoch de una fecha (naive = hora local), sin error de redondeo"""
+    return int(moment.replace(microsecond=0).timestamp()) * 1_000_000 + moment.microsecond
+
+def from_epoch_us(value: int) -> datetime.datetime:
+    """Fecha local (naive) de un valor en microsegundos desde epoch"""
+    # El error del float (< 0.2 µs hasta el año 2200) desaparece al redondear a µs
+    return datetime.datetime.fromtimestamp(value / 1_000_000)
+
+def get_version(connection: sqlite3.Connection) -> int:
+    """Versión del esquema: 0 si la base está vacía, 1 si es el esquema de texto"""
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version:
+        return version
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(donations)")}
+    return 1 if "donor_name" in columns else 0
+
+def create_schema(connection: sqlite3.Connection):
+    """
+    Crea las tablas del esquema actual (si no existen) y marca la versión
+    
+    Una base v2 recibe aquí las tablas de acumulados, calculados una vez
+    desde las donaciones que ya tiene.
+    """
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    with connection:
+        connection.execute("BEGIN")
+        for statement in SCHEMA_TABLES:
+            connection.execute(statement)
+        # Último registro del DonationJournal confirmado en la sesión (v6)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(sessions)")}
+        if "journal_seq" not in columns:
+            connection.execute("ALTER TABLE sessions ADD COLUMN journal_seq INTEGER NOT NULL DEFAULT 0")
+        if version == 2:
+            print("Building session rollups from existing donations...")
+            backfill_aggregates(connection)
+        if version != SCHEMA_VERSION:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+def backfill_aggregates(connection: sqlite3.Connection):
+    """Recalcula session_minutes, session_donors y los totales de sessions desde donations"""
+    connection.execute("DELETE FROM session_minutes")
+    connection.execute("DELETE FROM session_donors")
+    connection.execute(f"""
+        INSERT INTO session_minutes (session_id, minute, donations, total_value)
+        SELECT session_id, timestamp_us / {MINUTE_US}, COUNT(*), SUM(value)
+        FROM donations GROUP BY session_id, timestamp_us / {MINUTE_US}
+    """)
+    connection.execute("""
+        INSERT INTO session_donors (session_id, donor_id)
+        SELECT DISTINCT session_id, donor_id FROM donations
+    """)
+    connection.execute("""
+        UPDATE sessions SET
+            total_donations = (SELECT COALESCE(SUM(donations), 0) FROM session_minutes
+                               WHERE session_minutes.session_id = sessions.id),
+            total_value = (SELECT COALESCE(SUM(total_value), 0) FROM session_minutes
+                           WHERE session_minutes.session_id = sessions.id),
+            unique_donors = (SELECT COUNT(*) FROM session_donors WHERE session_donors.session_id = sessions.id),
+            end_time = (SELECT MAX(timestamp_us) FROM donations WHERE donations.session_id = sessions.id),
+            start_time = COALESCE(start_time, (SELECT MIN(timestamp_us) FROM donations
+                                               WHERE donations.session_id = sessions.id))
+    """)
+
+class SchemaMigration:
+    """
+    Migra en el lugar una base con el esquema de texto (v1) al normalizado
+    
+    v1 repite session_id y donor_name como texto en cada donación y guarda
+    las horas como ISO 8601. v2 guarda donadores, sesiones y tipos de
+    regalo una vez en su tabla y los referencia por id, y las horas como
+    microsegundos desde epoch (enteros de 8 bytes, sin parseo al leer).
+    
+    Cada tabla vieja se lee por páginas (keyset sobre id) y se inserta en
+    su versión nueva con executemany, así la memoria no depende del tamaño
+    de la base (solo los diccionarios de nombres a id). Todo ocurre en una
+    transacción: si algo falla la base queda en v1. Al final VACUUM
+    devuelve al sistema el espacio de las tablas viejas.
+    """
+    
+    LEGACY_TABLES = ("sessions", "donations", "planets", "performance_metrics")
+    
+    def __init__(self, connection: sqlite3.Connection, chunk_size: int = 20000,
+                 progress_callback: Optional[Callable[[str, int], None]] = None):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self._sessions: Dict[str, int] = {}
+        self._donors: Dict[str, int] = {}
+        self._gifts: Dict[str, int] = {}
+        self.rows_migrated = 0
+        self.elapsed_seconds = 0.0
+    
+    def run(self, vacuum: bool = True):
+        """Ejecuta la migración a v2 (no hace nada si la base no es v1)"""
+        if get_version(self.connection) != 1:
+            return
+        started = time.perf_counter()
+        connection = self.connection
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        legacy = [table for table in self.LEGACY_TABLES if table in existing]
+        with connection:
+            # BEGIN explícito: sqlite3 no abre transacción antes de ALTER/CREATE
+            connection.execute("BEGIN")
+            for table in legacy:
+                connection.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+            connection.execute("DROP INDEX IF EXISTS idx_donations_session_time")
+            for statement in SCHEMA_TABLES:
+                connection.execute(statement)
+            
+            if "sessions" in legacy:
+                for name, start_time in connection.execute("SELECT session_id, start_time FROM sessions_v1").fetchall():
+                    self._session_id(name, self._parse_time(start_time))
+            self._copy("donations_v1", "session_id, donor_name, gift_type, value, timestamp",
+                       "INSERT INTO donations (session_id, donor_id, gift_id, value, timestamp_us) VALUES (?, ?, ?, ?, ?)",
+                       lambda row: (self._session_id(row[0]), self._donor_id(row[1]), self._gift_id(row[2]),
+                                    row[3], self._parse_time(row[4])))
+            self._copy("planets_v1",
+                       "session_id, donor_name, total_value, planet_type, created_at, last_updated, position_x, position_y",
+                       """INSERT INTO planets (session_id, donor_id, total_value, planet_type, created_us, updated_us,
+                          position_x, position_y) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                       lambda row: (self._session_id(row[0]), self._donor_id(row[1]), row[2], row[3],
+                                    self._parse_time(row[4]), self._parse_time(row[5]), row[6], row[7]))
+            if "performance_metrics" in legacy:
+                self._copy("performance_metrics_v1",
+                           "session_id, recorded_at, stage, frames, p50_ms, p95_ms, p99_ms, max_ms",
+                           """INSERT INTO performance_metrics (session_id, recorded_us, stage, frames, p50_ms, p95_ms,
+                              p99_ms, max_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                           lambda row: (self._session_id(row[0]), self._parse_time(row[1])) + tuple(row[2:]))
+            
+            for table in legacy:
+                connection.execute(f"DROP TABLE {table}_v1")
+            # create_schema() completa desde aquí (acumulados de la v3)
+            connection.execute("PRAGMA user_version = 2")
+        
+        if vacuum:
+            # El VACUUM también activa el modo incremental en la base migrada
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("VACUUM")
+        self.elapsed_seconds = time.perf_counter() - started
+    
+    def _copy(self, source: str, columns: str, insert_sql: str, convert: Callable[[Tuple], Tuple]):
+        for rows in self._pages(source, columns):
+            self.connection.executemany(insert_sql, [convert(row) for row in rows])
+            self.rows_migrated += len(rows)
+            if self.progress_callback:
+                self.progress_callback(source, self.rows_migrated)
+    
+    def _pages(self, table: str, columns: str) -> Iterator[List[Tuple]]:
+        """Filas de una tabla vieja por páginas de chunk_size (keyset sobre id)"""
+        last_id = -1
+        while True:
+            rows = self.connection.execute(
+                f"SELECT id, {columns} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, self.chunk_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[1:] for row in rows]
+    
+    @staticmethod
+    def _parse_time(text: Optional[str]) -> Optional[int]:
+        return to_epoch_us(datetime.datetime.fromisoformat(text)) if text else None
+    
+    def _session_id(self, name: str, start_time: Optional[int] = None) -> int:
+        session_id = self._sessions.get(name)
+        if session_id is None:
+            cursor = self.connection.execute("INSERT INTO sessions (name, start_time) VALUES (?, ?)", (name, start_time))
+            session_id = self._sessions[name] = cursor.lastrowid
+        return session_id
+    
+    def _donor_id(self, name: str) -> int:
+        donor_id = self._donors.get(name)
+        if donor_id is None:
+            cursor = self.connection.execute("INSERT INTO donors (name) VALUES (?)", (name,))
+            donor_id = self._donors[name] = cursor.lastrowid
+        return donor_id
+    
+    def _gift_id(self, name: str) -> int:
+        gift_id = self._gifts.get(name)
+        if gift_id is None:
+            cursor = self.connection.execute("INSERT INTO gift_types (name) VALUES (?)", (name,))
+            gift_id = self._gifts[name] = cursor.lastrowid
+        return gift_id
@@ -0,0 +1,227 @@
+# Session Compactor - Retención y compactación de sesiones viejas
+# Resume y archiva las donaciones de sesiones pasadas y devuelve el espacio con VACUUM incremental
+
+import datetime
+import gzip
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from .database_manager import DatabaseManager
+from .schema import to_epoch_us
+
+class SessionCompactor:
+    """
+    Compacta las donaciones de sesiones más viejas que retention_days
+    
+    Por cada sesión vieja (nunca la actual) las donaciones se leen en
+    lotes de rows_per_step y, en una transacción por lote:
+    - se suman a donor_summaries (donaciones, valor, primera y última
+      hora por donador)
+    - se borran de donations
+    Los totales de sessions y los acumulados por minuto ya están
+    materializados, así el historial y los gráficos no cambian. Si hay
+    archive_dir, cada lote se agrega antes a
+    <archive_dir>/<sesión>_donations.jsonl.gz (un miembro gzip por lote,
+    con fsync antes de borrar); el archivo se puede volver a cargar con
+    --import-log. Un corte a mitad de sesión retoma donde quedó (a lo sumo
+    el último lote queda repetido en el archivo).
+    
+    Terminadas las sesiones, PRAGMA incremental_vacuum devuelve las páginas
+    libres al sistema de a vacuum_pages_per_step (requiere auto_vacuum
+    INCREMENTAL: las bases nuevas y las migradas ya lo tienen; para las
+    demás run() hace un VACUUM completo fuera del live).
+    
+    update() se llama cada frame y solo trabaja si no se guardó ninguna
+    donación en los últimos idle_seconds, hasta step_budget_ms por frame.
+    Usa la conexión de la sesión, así no compite por el lock de escritura.
+    """
+    
+    SUMMARY_SQL = """
+        INSERT INTO donor_summaries (session_id, donor_id, donations, total_value, first_us, last_us)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (session_id, donor_id) DO UPDATE SET
+            donations = donations + excluded.donations, total_value = total_value + excluded.total_value,
+            first_us = MIN(first_us, excluded.first_us), last_us = MAX(last_us, excluded.last_us)
+    """
+    
+    def __init__(self, db_manager: DatabaseManager, retention_days: float = 90, archive_dir: Optional[str] = "archives",
+                 rows_per_step: int = 250, step_budget_ms: float = 4, idle_seconds: float = 10,
+                 vacuum_pages_per_step: int = 128, check_interval_seconds: float = 60):
+        self.db_manager = db_manager
+        self.retention_days = retention_days
+        self.archive_dir = archive_dir
+        self.rows_per_step = rows_per_step
+        self.step_budget = step_budget_ms / 1000.0
+        self.idle_seconds = idle_seconds
+        self.vacuum_pages_per_step = vacuum_pages_per_step
+        self.check_interval = check_interval_seconds
+        
+        self.sessions_compacted = 0
+        self.rows_compacted = 0
+        self.pages_vacuumed = 0
+        self._job: Optional[Tuple[int, str]] = None
+        self._next_check = 0.0
+        self._vacuum_pending = True
+        self._donor_json: Dict[int, str] = {}
+        self._gift_json: Dict[int, str] = {}
+    
+    @property
+    def busy(self) -> bool:
+        """Indica si hay una sesión a medio compactar o páginas por devolver"""
+        return self._job is not None or self._vacuum_pending
+    
+    def update(self):
+        """Avanza la compactación dentro del presupuesto del frame (llamar cada frame)"""
+        if time.monotonic() - self.db_manager.last_write_time < self.idle_seconds:
+            return
+        deadline = time.perf_counter() + self.step_budget
+        while time.perf_counter() < deadline and self.step():
+            pass
+    
+    def step(self) -> bool:
+        """Un paso acotado: un lote de donaciones o de páginas libres. False si no queda trabajo"""
+        try:
+            if self._job is None:
+                self._job = self._next_session()
+            if self._job is not None:
+                self._compact_step()
+                return True
+            return self._vacuum_step()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error compacting sessions: {e}")
+            self._job = None
+            self._vacuum_pending = False
+            self._next_check = time.monotonic() + self.check_interval
+            return False
+    
+    def run(self) -> "SessionCompactor":
+        """Compacta todas las sesiones vencidas y devuelve el espacio, sin límite de tiempo (fuera del live)"""
+        while True:
+            if self._job is None:
+                self._next_check = 0.0
+                self._job = self._next_session()
+                if self._job is None:
+                    break
+            self._compact_step()
+        connection = self.db_manager.connection
+        if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            freed = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("VACUUM")
+            self.pages_vacuumed += freed
+        else:
+            self._vacuum_pending = True
+            while self._vacuum_step():
+                pass
+        return self
+    
+    def _next_session(self) -> Optional[Tuple[int, str]]:
+        """La sesión vencida más vieja sin compactar (se consulta cada check_interval)"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.check_interval
+        cutoff = to_epoch_us(datetime.datetime.now() - datetime.timedelta(days=self.retention_days))
+        row = self.db_manager.connection.execute("""
+            SELECT sessions.id, sessions.name FROM sessions
+            LEFT JOIN session_archives ON session_archives.session_id = sessions.id
+            WHERE sessions.id != ? AND sessions.total_donations > 0
+              AND COALESCE(sessions.end_time, sessions.start_time) < ?
+              AND session_archives.compacted_us IS NULL
+            ORDER BY sessions.start_time LIMIT 1
+        """, (self.db_manager._session_key or -1, cutoff)).fetchone()
+        return (row[0], row[1]) if row else None
+    
+    def _compact_step(self):
+        session_key, session_name = self._job
+        connection = self.db_manager.connection
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute("""
+            SELECT id, donor_id, gift_id, value, timestamp_us FROM donations
+            WHERE session_id = ? ORDER BY timestamp_us, id LIMIT ?
+        """, (session_key, self.rows_per_step)).fetchall()
+        
+        if not rows:
+            with connection:
+                connection.execute("""
+                    INSERT INTO session_archives (session_id, compacted_us) VALUES (?, ?)
+                    ON CONFLICT (session_id) DO UPDATE SET compacted_us = excluded.compacted_us
+                """, (session_key, to_epoch_us(datetime.datetime.now())))
+            self.sessions_compacted += 1
+            self._job = None
+            self._next_check = 0.0
+            self._vacuum_pending = True
+            return
+        
+        archive_path = self._archive(session_name, rows) if self.archive_dir else None
+        
+        # Filas en orden cronológico: la primera de cada donador es su first_us
+        summaries: Dict[int, List[int]] = {}
+        for _, donor_id, _, value, timestamp_us in rows:
+            summary = summaries.get(donor_id)
+            if summary is None:
+                summaries[donor_id] = [1, value, timestamp_us, timestamp_us]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[3] = timestamp_us
+        
+        with connection:
+            cursor.executemany(self.SUMMARY_SQL, [(session_key, donor_id, *summary)
+                                                  for donor_id, summary in summaries.items()])
+            # Las filas leídas son un prefijo del índice (session_id, timestamp_us):
+            # se borran como rango, sin una búsqueda por id cada una
+            cursor.execute("""
+                DELETE FROM donations WHERE session_id = ? AND (timestamp_us, id) <= (?, ?)
+            """, (session_key, rows[-1][4], rows[-1][0]))
+            cursor.execute("""
+                INSERT INTO session_archives (session_id, archive_path, rows_archived) VALUES (?, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    rows_archived = rows_archived + excluded.rows_archived,
+                    archive_path = COALESCE(excluded.archive_path, archive_path)
+            """, (session_key, archive_path, len(rows)))
+        self.rows_compacted += len(rows)
+    
+    def _archive(self, session_name: str, rows: List[Tuple]) -> str:
+        """Agrega un lote al archivo de la sesión (mismas columnas que la exportación jsonl)"""
+        db_manager = self.db_manager
+        db_manager._cache_names("donors", db_manager._donor_names, [row[1] for row in rows])
+        db_manager._cache_names("gift_types", db_manager._gift_names, [row[2] for row in rows])
+        # Nombres ya codificados como JSON: se repiten en casi todas las filas
+        donor_json = self._donor_json
+        gift_json = self._gift_json
+        for row_id in {row[1] for row in rows}.difference(donor_json):
+            donor_json[row_id] = json.dumps(db_manager._donor_names[row_id], ensure_ascii=False)
+        for row_id in {row[2] for row in rows}.difference(gift_json):
+            gift_json[row_id] = json.dumps(db_manager._gift_names[row_id], ensure_ascii=False)
+        fromtimestamp = datetime.datetime.fromtimestamp
+        lines = "".join(
+            f'{{"donor_name":{donor_json[row[1]]},"gift_type":{gift_json[row[2]]},"value":{row[3]},'
+            f'"timestamp":"{fromtimestamp(row[4] / 1_000_000).isoformat()}"}}\n'
+            for row in rows)
+        
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{session_name}_donations.jsonl.gz")
+        with open(path, "ab") as raw_file:
+            with gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=6) as archive:
+                archive.write(lines.encode("utf-8"))
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        return path
+    
+    def _vacuum_step(self) -> bool:
+        """Devuelve hasta vacuum_pages_per_step páginas libres (False si no queda nada)"""
+        if not self._vacuum_pending:
+            return False
+        connection = self.db_manager.connection
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        if not free_pages or connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            self._vacuum_pending = False
+            return False
+        # executescript corre el PRAGMA hasta el final (con execute solo libera una página)
+        connection.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages_per_step});")
+        self.pages_vacuumed += free_pages - connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return True
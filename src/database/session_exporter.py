@@ -0,0 +1,277 @@
+# Session Exporter - Exportación de sesiones a formatos externos
+# Lectura en streaming desde SQLite hacia CSV, JSONL o columnas .npz
+
+import array
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .schema import SCHEMA_VERSION, from_epoch_us
+
+# Columnas exportadas por tabla y su tipo en el formato columnar:
+# "text" se codifica como diccionario, "int" como int64 y "time" como
+# microsegundos desde epoch (int64)
+EXPORT_COLUMNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "donations": (
+        ("donor_name", "text"),
+        ("gift_type", "text"),
+        ("value", "int"),
+        ("timestamp", "time")
+    ),
+    "planets": (
+        ("donor_name", "text"),
+        ("total_value", "int"),
+        ("planet_type", "text"),
+        ("created_at", "time"),
+        ("last_updated", "time"),
+        ("position_x", "int"),
+        ("position_y", "int")
+    )
+}
+
+# Consulta de cada tabla con los nombres resueltos, en el orden de EXPORT_COLUMNS
+EXPORT_QUERIES = {
+    "donations": """
+        SELECT donors.name, gift_types.name, donations.value, donations.timestamp_us
+        FROM donations
+        JOIN donors ON donors.id = donations.donor_id
+        JOIN gift_types ON gift_types.id = donations.gift_id
+        WHERE donations.session_id = (SELECT id FROM sessions WHERE name = ?)
+        ORDER BY donations.id
+    """,
+    "planets": """
+        SELECT donors.name, planets.total_value, planets.planet_type, planets.created_us,
+               planets.updated_us, planets.position_x, planets.position_y
+        FROM planets JOIN donors ON donors.id = planets.donor_id
+        WHERE planets.session_id = (SELECT id FROM sessions WHERE name = ?)
+        ORDER BY planets.id
+    """
+}
+
+FORMAT_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "npz": ".npz"}
+
+# Tipos de NumPy en el orden de bytes de esta máquina (array.array escribe así)
+_ENDIAN = "<" if sys.byteorder == "little" else ">"
+
+class ExportReport:
+    """Resultado de exportar una tabla de la sesión"""
+    
+    def __init__(self, table: str, path: str, file_format: str):
+        self.table = table
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        self.bytes_written = 0
+        self.elapsed_seconds = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+    
+    def to_dict(self) -> Dict:
+        return {
+            "table": self.table,
+            "path": self.path,
+            "format": self.file_format,
+            "rows": self.rows,
+            "bytes_written": self.bytes_written,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1)
+        }
+
+def _npy_header(descr: str, count: int) -> bytes:
+    """Encabezado .npy versión 1.0 de un arreglo unidimensional"""
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, count)
+    # magic (6) + versión (2) + largo (2) + header + "\n" debe ser múltiplo de 64
+    header += " " * (-(10 + len(header) + 1) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+class SessionExporter:
+    """
+    Exporta los planetas y donaciones de una sesión sin cargarlos en memoria
+    
+    Las filas se leen con fetchmany desde una conexión de solo lectura
+    propia (no interfiere con la conexión de la sesión en vivo) y se
+    escriben por lotes de chunk_size:
+    - csv: encabezado y una fila por registro
+    - jsonl: un objeto JSON por línea
+    - npz: un .npy por columna (se abre con numpy.load). Los textos se
+      guardan como diccionario: <columna>_codes (int32) y
+      <columna>_values; las fechas como microsegundos desde epoch
+    
+    csv y jsonl se comprimen con gzip si el archivo termina en .gz; el
+    .npz usa deflate si compress es True.
+    
+    La memoria no depende del tamaño de la sesión: csv y jsonl solo
+    mantienen un lote, y el npz vuelca cada columna a un archivo temporal
+    mientras lee (solo los diccionarios de texto crecen, con el número de
+    donadores y tipos de regalo distintos).
+    """
+    
+    def __init__(self, db_path: str, session_id: str, chunk_size: int = 5000,
+                 progress_callback: Optional[Callable[[ExportReport], None]] = None):
+        self.db_path = db_path
+        self.session_id = session_id
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+    
+    @staticmethod
+    def detect_format(path: str) -> str:
+        """Formato según la extensión (.csv, .jsonl/.ndjson, .npz; con o sin .gz)"""
+        name = path.lower()
+        if name.endswith(".gz"):
+            name = name[:-3]
+        if name.endswith(".csv"):
+            return "csv"
+        if name.endswith((".jsonl", ".ndjson")):
+            return "jsonl"
+        if name.endswith(".npz"):
+            return "npz"
+        raise ValueError(f"unknown export format: {path}")
+    
+    def iter_chunks(self, table: str, iso_times: bool = False) -> Iterator[List[Tuple]]:
+        """
+        Filas de una tabla de la sesión en lotes de chunk_size, en orden de inserción
+        
+        Las horas vienen en microsegundos desde epoch, o como texto ISO 8601
+        con iso_times.
+        """
+        if table not in EXPORT_COLUMNS:
+            raise ValueError(f"unknown table: {table}")
+        time_columns = [index for index, (_, kind) in enumerate(EXPORT_COLUMNS[table]) if kind == "time"]
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                raise ValueError(f"{self.db_path} uses an older schema; open it once to migrate it")
+            cursor = connection.cursor()
+            cursor.arraysize = self.chunk_size
+            cursor.execute(EXPORT_QUERIES[table], (self.session_id,))
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                if iso_times:
+                    rows = [self._with_iso_times(row, time_columns) for row in rows]
+                yield rows
+        finally:
+            connection.close()
+    
+    @staticmethod
+    def _with_iso_times(row: Tuple, time_columns: List[int]) -> Tuple:
+        row = list(row)
+        for index in time_columns:
+            row[index] = from_epoch_us(row[index]).isoformat()
+        return tuple(row)
+    
+    def export(self, table: str, path: str, file_format: Optional[str] = None,
+               compress: bool = False) -> ExportReport:
+        """Exporta una tabla de la sesión a un archivo y retorna el reporte"""
+        file_format = file_format or self.detect_format(path)
+        if file_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"unsupported format: {file_format}")
+        
+        report = ExportReport(table, path, file_format)
+        started = time.perf_counter()
+        chunks = self._counted(self.iter_chunks(table, iso_times=file_format != "npz"), report, started)
+        
+        if file_format == "npz":
+            self._write_npz(chunks, table, path, compress)
+        else:
+            gzipped = path.lower().endswith(".gz")
+            with (gzip.open(path, "wb", compresslevel=6) if gzipped else open(path, "wb")) as binary:
+                text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+                if file_format == "csv":
+                    self._write_csv(chunks, table, text)
+                else:
+                    self._write_jsonl(chunks, table, text)
+                text.flush()
+                text.detach()
+        
+        report.bytes_written = os.path.getsize(path)
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+    
+    def export_session(self, directory: str, file_format: str = "jsonl", compress: bool = False) -> List[ExportReport]:
+        """Exporta planetas y donaciones a <directorio>/<sesión>_<tabla>.<formato>"""
+        os.makedirs(directory, exist_ok=True)
+        extension = FORMAT_EXTENSIONS[file_format]
+        if compress and file_format != "npz":
+            extension += ".gz"
+        return [
+            self.export(table, os.path.join(directory, f"{self.session_id}_{table}{extension}"),
+                        file_format, compress)
+            for table in EXPORT_COLUMNS
+        ]
+    
+    def _counted(self, chunks: Iterator[List[Tuple]], report: ExportReport, started: float) -> Iterator[List[Tuple]]:
+        for rows in chunks:
+            yield rows
+            report.rows += len(rows)
+            if self.progress_callback:
+                report.elapsed_seconds = time.perf_counter() - started
+                self.progress_callback(report)
+    
+    def _write_csv(self, chunks: Iterator[List[Tuple]], table: str, text: io.TextIOBase):
+        writer = csv.writer(text)
+        writer.writerow([name for name, _ in EXPORT_COLUMNS[table]])
+        for rows in chunks:
+            writer.writerows(rows)
+    
+    def _write_jsonl(self, chunks: Iterator[List[Tuple]], table: str, text: io.TextIOBase):
+        names = [name for name, _ in EXPORT_COLUMNS[table]]
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        for rows in chunks:
+            text.write("".join(dumps(dict(zip(names, row))) + "\n" for row in rows))
+    
+    def _write_npz(self, chunks: Iterator[List[Tuple]], table: str, path: str, compress: bool):
+        """Una columna por archivo temporal mientras se lee; al final se empaquetan en el zip"""
+        columns = EXPORT_COLUMNS[table]
+        spools = [tempfile.TemporaryFile() for _ in columns]
+        dictionaries: Dict[int, Dict[str, int]] = {
+            index: {} for index, (_, kind) in enumerate(columns) if kind == "text"
+        }
+        count = 0
+        try:
+            for rows in chunks:
+                count += len(rows)
+                for index, (_, kind) in enumerate(columns):
+                    values = [row[index] for row in rows]
+                    if kind == "text":
+                        codes = dictionaries[index]
+                        encoded = array.array("i", [codes.setdefault(value, len(codes)) for value in values])
+                    else:
+                        encoded = array.array("q", values)
+                    encoded.tofile(spools[index])
+            
+            method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(path, "w", compression=method) as archive:
+                for index, (name, kind) in enumerate(columns):
+                    spool = spools[index]
+                    spool.seek(0)
+                    member = f"{name}_codes.npy" if kind == "text" else f"{name}.npy"
+                    descr = _ENDIAN + ("i4" if kind == "text" else "i8")
+                    with archive.open(member, "w", force_zip64=True) as output:
+                        output.write(_npy_header(descr, count))
+                        shutil.copyfileobj(spool, output, 1 << 20)
+                    if kind == "text":
+                        archive.writestr(f"{name}_values.npy", self._text_array(dictionaries[index]))
+        finally:
+            for spool in spools:
+                spool.close()
+    
+    @staticmethod
+    def _text_array(codes: Dict[str, int]) -> bytes:
+        """Valores de un diccionario como .npy de texto ('<U', UTF-32 de ancho fijo)"""
+        values = sorted(codes, key=codes.__getitem__)
+        width = max((len(value) for value in values), default=1) or 1
+        body = b"".join(value.encode("utf-32-le").ljust(width * 4, b"\0") for value in values)
+        return _npy_header(f"<U{width}", len(values)) + body
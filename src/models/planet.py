@@ -2,7 +2,8 @@
 # Cada planeta pertenece a un donador y evoluciona según sus donaciones
 
 import datetime
-from typing import List, Dict
+import math
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
 class PlanetType(Enum):
@@ -21,6 +22,30 @@ class PlanetType(Enum):
     STELLAR_SYSTEM = "stellar_system"  # 500-999 coins
     GALAXY = "galaxy"       # 1000+ coins
 
+class PlanetRenderSnapshot:
+    """
+    Vista inmutable de un planeta lista para dibujar
+    
+    Contiene todo lo que el renderer necesita ya calculado: tamaño
+    escalado, colores, textos de las etiquetas y desplazamientos de
+    etiquetas y efectos respecto al centro del planeta. El Planet la
+    regenera solo cuando cambia, así el render no asigna nada del modelo.
+    """
+    
+    __slots__ = ("donor_name", "planet_type", "type_name", "total_value", "size", "color",
+                 "name_label", "value_label", "value_color", "name_offset_y", "value_offset_y",
+                 "glow_layers", "ring_size", "spiral_offsets")
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("PlanetRenderSnapshot is immutable")
+    
+    def __repr__(self) -> str:
+        return f"PlanetRenderSnapshot(donor='{self.donor_name}', type={self.type_name}, value={self.total_value})"
+
 class Planet:
     """
     Representa un planeta individual con sus propiedades y historia
@@ -43,6 +68,32 @@ class Planet:
         1000: PlanetType.GALAXY
     }
     
+    # Umbrales de mayor a menor (ordenados una sola vez, no en cada donación)
+    _THRESHOLDS_DESCENDING = tuple(sorted(TYPE_THRESHOLDS.items(), reverse=True))
+    
+    # Tamaño visual base por tipo de planeta
+    SIZE_BY_TYPE = {
+        PlanetType.MERCURY: 30,
+        PlanetType.EARTH: 50,
+        PlanetType.JUPITER: 80,
+        PlanetType.STAR: 120,
+        PlanetType.STELLAR_SYSTEM: 150,
+        PlanetType.GALAXY: 200
+    }
+    
+    # Color por defecto por tipo de planeta
+    COLOR_BY_TYPE = {
+        PlanetType.MERCURY: (169, 169, 169),  # Gris
+        PlanetType.EARTH: (100, 149, 237),    # Azul
+        PlanetType.JUPITER: (255, 140, 0),    # Naranja
+        PlanetType.STAR: (255, 255, 0),       # Amarillo
+        PlanetType.STELLAR_SYSTEM: (255, 20, 147),  # Rosa
+        PlanetType.GALAXY: (138, 43, 226)     # Violeta
+    }
+    
+    # Escala de render para el layout vertical (más compacto)
+    RENDER_SIZE_SCALE = 0.8
+    
     def __init__(self, donor_name: str):
         self.donor_name = donor_name
         self.total_value = 0
@@ -56,19 +107,42 @@ class Planet:
         self.position_y = 0
         self.size = self._calculate_size()
         self.color = self._get_default_color()
+        self._render_snapshot: Optional[PlanetRenderSnapshot] = None
+    
+    @classmethod
+    def restore(cls, donor_name: str, total_value: int, planet_type: PlanetType, created_at: datetime.datetime,
+                last_updated: datetime.datetime, position_x: int = 0, position_y: int = 0) -> 'Planet':
+        """Planeta con un estado ya calculado (snapshots), sin pasar por __init__ ni recalcular el tipo"""
+        planet = cls.__new__(cls)
+        planet.donor_name = donor_name
+        planet.total_value = total_value
+        planet.planet_type = planet_type
+        planet.created_at = created_at
+        planet.last_updated = last_updated
+        planet.donations_history = []
+        planet.position_x = position_x
+        planet.position_y = position_y
+        planet.size = cls.SIZE_BY_TYPE.get(planet_type, 30)
+        planet.color = cls.COLOR_BY_TYPE.get(planet_type, (169, 169, 169))
+        planet._render_snapshot = None
+        return planet
     
-    def add_donation(self, donation: 'Donation'):
+    def add_donation(self, donation: 'Donation', keep_history: bool = True):
         """
         Añade una nueva donación y actualiza el planeta
         
+        keep_history=False no guarda la donación en donations_history
+        (importaciones masivas: el historial completo queda en la base)
+        
         Futuras mejoras:
         - Efectos especiales al evolucionar de tipo
         - Mensajes personalizados por milestone
-        - Registro de fecha/hora de cada donación
         """
-        self.donations_history.append(donation)
+        if keep_history:
+            self.donations_history.append(donation)
         self.total_value += donation.value
-        self.last_updated = datetime.datetime.now()
+        self.last_updated = donation.timestamp
+        self._render_snapshot = None
         
         # Actualizar tipo de planeta según nuevo valor
         old_type = self.planet_type
@@ -81,9 +155,9 @@ class Planet:
     
     def _determine_planet_type(self) -> PlanetType:
         """Determina el tipo de planeta según el valor total"""
-        for threshold in sorted(self.TYPE_THRESHOLDS.keys(), reverse=True):
+        for threshold, planet_type in self._THRESHOLDS_DESCENDING:
             if self.total_value >= threshold:
-                return self.TYPE_THRESHOLDS[threshold]
+                return planet_type
         return PlanetType.MERCURY
     
     def _calculate_size(self) -> int:
@@ -95,15 +169,7 @@ class Planet:
         - Tamaños máximos para mantener proporción en pantalla
         - Animaciones de crecimiento suaves
         """
-        size_mapping = {
-            PlanetType.MERCURY: 30,
-            PlanetType.EARTH: 50,
-            PlanetType.JUPITER: 80,
-            PlanetType.STAR: 120,
-            PlanetType.STELLAR_SYSTEM: 150,
-            PlanetType.GALAXY: 200
-        }
-        return size_mapping.get(self.planet_type, 30)
+        return self.SIZE_BY_TYPE.get(self.planet_type, 30)
     
     def _get_default_color(self) -> tuple:
         """
@@ -114,15 +180,65 @@ class Planet:
         - Gradientes y texturas
         - Efectos de brillo para tipos especiales
         """
-        color_mapping = {
-            PlanetType.MERCURY: (169, 169, 169),  # Gris
-            PlanetType.EARTH: (100, 149, 237),    # Azul
-            PlanetType.JUPITER: (255, 140, 0),    # Naranja
-            PlanetType.STAR: (255, 255, 0),       # Amarillo
-            PlanetType.STELLAR_SYSTEM: (255, 20, 147),  # Rosa
-            PlanetType.GALAXY: (138, 43, 226)     # Violeta
-        }
-        return color_mapping.get(self.planet_type, (169, 169, 169))
+        return self.COLOR_BY_TYPE.get(self.planet_type, (169, 169, 169))
+    
+    def invalidate_render_snapshot(self):
+        """Descarta la vista de render (tras modificar atributos directamente)"""
+        self._render_snapshot = None
+    
+    def get_render_snapshot(self) -> PlanetRenderSnapshot:
+        """Retorna la vista de render cacheada, regenerándola si el planeta cambió"""
+        snapshot = self._render_snapshot
+        if snapshot is None:
+            snapshot = self._render_snapshot = self._build_render_snapshot()
+        return snapshot
+    
+    def _build_render_snapshot(self) -> PlanetRenderSnapshot:
+        """Precalcula tamaños, colores, textos y geometría de efectos"""
+        size = int(self.size * self.RENDER_SIZE_SCALE)
+        value = self.total_value
+        
+        # Color y formato compacto del valor
+        if value >= 1000:
+            value_color = (255, 215, 0)      # Dorado para valores altos
+            value_label = f"{value/1000:.1f}K"
+        elif value >= 100:
+            value_color = (144, 238, 144)    # Verde claro
+            value_label = f"{value}"
+        else:
+            value_color = (200, 200, 200)    # Gris claro
+            value_label = f"{value}"
+        
+        # Geometría de efectos por tipo
+        glow_layers: Tuple[Tuple[int, Tuple[int, int, int, int]], ...] = ()
+        ring_size: Optional[Tuple[int, int]] = None
+        spiral_offsets: Tuple[Tuple[int, int], ...] = ()
+        if self.planet_type == PlanetType.STAR:
+            glow_layers = tuple((size + i * 10, (*self.color, 50 - i * 15)) for i in range(3))
+        elif self.planet_type == PlanetType.JUPITER:
+            ring_size = (size * 3, size // 4)
+        elif self.planet_type == PlanetType.GALAXY:
+            spiral_offsets = tuple(
+                (int(math.cos(math.radians(angle)) * size * 0.7), int(math.sin(math.radians(angle)) * size * 0.3))
+                for angle in range(0, 360, 30)
+            )
+        
+        return PlanetRenderSnapshot(
+            donor_name=self.donor_name,
+            planet_type=self.planet_type,
+            type_name=self.planet_type.value,
+            total_value=value,
+            size=size,
+            color=self.color,
+            name_label=self.donor_name,
+            value_label=value_label,
+            value_color=value_color,
+            name_offset_y=-size - 25,
+            value_offset_y=size + 15,
+            glow_layers=glow_layers,
+            ring_size=ring_size,
+            spiral_offsets=spiral_offsets
+        )
     
     def get_display_info(self) -> Dict:
         """
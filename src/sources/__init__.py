@@ -0,0 +1 @@
+# Sources package - Fuentes de eventos de donación por plataforma
@@ -0,0 +1,96 @@
+# Base Source - Fuente base de eventos de donación
+# Define la cola por fuente que consume el multiplexor de eventos
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+from .donation_event import DonationEvent
+from .normalizers import normalize_event
+
+class DonationSource:
+    """
+    Fuente de donaciones de una plataforma con su propia cola acotada
+    
+    Cada fuente recibe eventos crudos (desde su hilo de lectura o desde
+    fuera con push_raw), los normaliza y los deja en su cola. El
+    multiplexor es el único consumidor de la cola.
+    
+    Futuras fuentes:
+    - Conector TikTok Live (API no oficial)
+    - YouTube Live Chat (Super Chats)
+    - Twitch EventSub (bits y suscripciones)
+    """
+    
+    def __init__(self, name: str, platform: str, max_queue_size: int = 10000):
+        self.name = name
+        self.platform = platform
+        self.max_queue_size = max_queue_size
+        self.queue = deque(maxlen=max_queue_size)
+        
+        # Contadores de entrada
+        self.received_count = 0
+        self.dropped_count = 0
+        self.rejected_count = 0
+        
+        # Hilo de lectura
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    def start(self):
+        """Inicia el hilo de lectura de la fuente"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"source-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 1.0):
+        """Detiene el hilo de lectura de la fuente"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def is_running(self) -> bool:
+        """Verifica si el hilo de lectura está activo"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        """
+        Loop de lectura de la fuente - implementado por cada plataforma
+        
+        Las fuentes pasivas (alimentadas con push_raw) no necesitan hilo.
+        """
+        pass
+    
+    def push_raw(self, raw: Dict) -> bool:
+        """Normaliza un evento crudo de la plataforma y lo encola"""
+        event = normalize_event(self.platform, raw, self.name)
+        if event is None:
+            self.rejected_count += 1
+            return False
+        return self.push_event(event)
+    
+    def push_event(self, event: DonationEvent) -> bool:
+        """
+        Encola un evento ya normalizado
+        
+        Si la cola está llena se descarta el evento más antiguo de ESTA
+        fuente, así una plataforma saturada no afecta a las demás.
+        """
+        if len(self.queue) >= self.max_queue_size:
+            self.dropped_count += 1
+        self.queue.append(event)
+        self.received_count += 1
+        return True
+    
+    def pop_event(self) -> Optional[DonationEvent]:
+        """Retira el evento más antiguo de la cola"""
+        try:
+            return self.queue.popleft()
+        except IndexError:
+            return None
+    
+    def pending_count(self) -> int:
+        """Retorna el número de eventos esperando en la cola"""
+        return len(self.queue)
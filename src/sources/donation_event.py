@@ -0,0 +1,36 @@
+# Donation Event - Evento de donación normalizado
+# Representa una donación de cualquier plataforma en el modelo regalo/coins
+
+import time
+from typing import Dict
+
+class DonationEvent:
+    """
+    Evento de donación ya normalizado al modelo regalo/coins
+    
+    Futuras adiciones:
+    - Mensaje de chat asociado
+    - Identificador único de la plataforma para deduplicar
+    """
+    
+    __slots__ = ("platform", "source_name", "donor_name", "gift_type", "value", "received_at")
+    
+    def __init__(self, platform: str, source_name: str, donor_name: str, gift_type: str, value: int):
+        self.platform = platform
+        self.source_name = source_name
+        self.donor_name = donor_name
+        self.gift_type = gift_type
+        self.value = value
+        self.received_at = time.monotonic()
+    
+    def to_donation_data(self) -> Dict:
+        """Convierte el evento al formato de donación que usa MainWindow"""
+        return {
+            "donor_name": self.donor_name,
+            "gift_type": self.gift_type,
+            "custom_value": self.value
+        }
+    
+    def __repr__(self) -> str:
+        return (f"DonationEvent(platform='{self.platform}', donor='{self.donor_name}', "
+                f"gift='{self.gift_type}', value={self.value})")
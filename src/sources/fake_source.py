@@ -0,0 +1,74 @@
+# Fake Source - Fuente local de donaciones simuladas
+# Genera eventos crudos con el formato de cada plataforma para pruebas
+
+import random
+from typing import Dict, Optional
+from ..models.donation import Donation
+from .base_source import DonationSource
+
+class FakeDonationSource(DonationSource):
+    """
+    Fuente simulada que produce eventos crudos como los de una plataforma real
+    
+    Permite probar el multiplexor, el límite de tasa y el reparto justo sin
+    conexión a TikTok, YouTube o Twitch. El modo ráfaga simula una
+    "lluvia" de regalos para verificar que una plataforma no acapare el frame.
+    
+    Futuras mejoras:
+    - Reproducir trazas reales grabadas
+    - Distribuciones de valores por plataforma configurables
+    """
+    
+    def __init__(self, name: str, platform: str, rate_per_second: float = 5.0,
+                 donor_pool_size: int = 50, burst_multiplier: float = 1.0,
+                 seed: Optional[int] = None, max_queue_size: int = 10000):
+        super().__init__(name, platform, max_queue_size)
+        self.rate_per_second = rate_per_second
+        self.donor_pool_size = donor_pool_size
+        self.burst_multiplier = burst_multiplier
+        self.random = random.Random(seed)
+        self._gift_names = list(Donation.GIFT_VALUES.keys())
+    
+    def generate_raw(self) -> Dict:
+        """Genera un evento crudo con el formato de la plataforma"""
+        donor = f"{self.platform}_fan_{self.random.randrange(self.donor_pool_size)}"
+        
+        if self.platform == "tiktok":
+            # Regalos baratos mucho más frecuentes que los caros
+            gift_index = min(int(self.random.expovariate(0.6)), len(self._gift_names) - 1)
+            return {
+                "user": donor,
+                "gift_name": self._gift_names[gift_index],
+                "repeat_count": self.random.choice((1, 1, 1, 5, 10))
+            }
+        elif self.platform == "youtube":
+            return {
+                "author": donor,
+                "amount_micros": self.random.choice((1, 2, 5, 10, 20, 50)) * 1_000_000
+            }
+        elif self.platform == "twitch":
+            return {
+                "user_name": donor,
+                "bits": self.random.choice((1, 10, 100, 500, 1000))
+            }
+        return {
+            "donor_name": donor,
+            "gift_type": "custom",
+            "value": self.random.randint(1, 100)
+        }
+    
+    def _run(self):
+        """Produce eventos con intervalos exponenciales según la tasa configurada"""
+        while not self._stop_event.is_set():
+            rate = self.rate_per_second * self.burst_multiplier
+            if rate <= 0:
+                self._stop_event.wait(0.1)
+                continue
+            
+            self.push_raw(self.generate_raw())
+            self._stop_event.wait(self.random.expovariate(rate))
+    
+    def emit_burst(self, count: int):
+        """Encola de inmediato una ráfaga de eventos (simula inundación)"""
+        for _ in range(count):
+            self.push_raw(self.generate_raw())
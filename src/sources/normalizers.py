@@ -0,0 +1,125 @@
+# Normalizers - Conversión de eventos de cada plataforma al modelo de coins
+# Traduce regalos TikTok, Super Chats de YouTube y bits de Twitch a donaciones
+
+import math
+from typing import Callable, Dict, Optional
+from ..models.donation import Donation
+from ..utils.config import config_manager
+from .donation_event import DonationEvent
+
+# Límite de longitud de nombre, igual que el campo del panel de control
+MAX_DONOR_NAME_LENGTH = 30
+
+# Coins de una sola donación; por encima se considera un dato corrupto
+# (el journal y la base guardan enteros de 64 bits)
+MAX_DONATION_VALUE = 10_000_000
+
+def _clean_donor_name(name) -> str:
+    """Limpia y recorta el nombre del donador"""
+    if name is None:
+        raise ValueError("missing donor name")
+    name = str(name).strip()
+    if not name:
+        raise ValueError("empty donor name")
+    return name[:MAX_DONOR_NAME_LENGTH]
+
+def _finite(number) -> float:
+    """Número de entrada como float, rechazando NaN e infinito"""
+    number = float(number)
+    if not math.isfinite(number):
+        raise ValueError("value must be finite")
+    return number
+
+def _checked_value(value: int) -> int:
+    """Valida que el valor en coins esté entre 1 y MAX_DONATION_VALUE"""
+    if value < 1 or value > MAX_DONATION_VALUE:
+        raise ValueError(f"value out of range: {value}")
+    return value
+
+def normalize_tiktok_gift(raw: Dict, source_name: str) -> DonationEvent:
+    """
+    Normaliza un regalo de TikTok Live
+    
+    Formato esperado: {"user": str, "gift_name": str, "repeat_count": int,
+    "diamond_count": int opcional (coins por unidad)}
+    """
+    donor_name = _clean_donor_name(raw.get("user", raw.get("donor_name")))
+    gift_type = str(raw.get("gift_name", "rose")).strip().lower().replace(" ", "_")
+    repeat_count = max(1, int(_finite(raw.get("repeat_count", 1))))
+    
+    unit_value = raw.get("diamond_count")
+    if unit_value is None:
+        unit_value = Donation.GIFT_VALUES.get(gift_type, 1)
+    
+    value = int(_finite(unit_value)) * repeat_count
+    return DonationEvent("tiktok", source_name, donor_name, gift_type, _checked_value(max(1, value)))
+
+def normalize_youtube_superchat(raw: Dict, source_name: str) -> DonationEvent:
+    """
+    Normaliza un Super Chat de YouTube
+    
+    Formato esperado: {"author": str, "amount": float} o {"amount_micros": int}
+    Futuro: conversión por moneda en lugar de asumir USD
+    """
+    donor_name = _clean_donor_name(raw.get("author", raw.get("donor_name")))
+    if "amount_micros" in raw:
+        amount = int(raw["amount_micros"]) / 1_000_000
+    else:
+        amount = _finite(raw["amount"])
+    
+    coins_per_usd = config_manager.get("sources.youtube_coins_per_usd", 75)
+    value = max(1, round(amount * coins_per_usd))
+    return DonationEvent("youtube", source_name, donor_name, "super_chat", _checked_value(value))
+
+def normalize_twitch_bits(raw: Dict, source_name: str) -> DonationEvent:
+    """
+    Normaliza un evento de bits de Twitch
+    
+    Formato esperado: {"user_name": str, "bits": int}
+    """
+    donor_name = _clean_donor_name(raw.get("user_name", raw.get("donor_name")))
+    bits = int(raw["bits"])
+    if bits <= 0:
+        raise ValueError("bits must be positive")
+    
+    coins_per_bit = config_manager.get("sources.twitch_coins_per_bit", 0.75)
+    value = max(1, round(bits * coins_per_bit))
+    return DonationEvent("twitch", source_name, donor_name, "bits", _checked_value(value))
+
+def normalize_generic(raw: Dict, source_name: str) -> DonationEvent:
+    """
+    Normaliza una donación ya expresada en el modelo interno
+    
+    Formato esperado: {"donor_name": str, "gift_type": str, "value": int opcional}
+    """
+    donor_name = _clean_donor_name(raw.get("donor_name"))
+    gift_type = str(raw.get("gift_type", "custom")).strip().lower() or "custom"
+    
+    value = raw.get("value", raw.get("custom_value"))
+    if value is None:
+        value = Donation.GIFT_VALUES.get(gift_type, 1)
+    if isinstance(value, float):
+        value = _finite(value)
+    return DonationEvent("generic", source_name, donor_name, gift_type, _checked_value(int(value)))
+
+# Normalizador por plataforma
+PLATFORM_NORMALIZERS: Dict[str, Callable[[Dict, str], DonationEvent]] = {
+    "tiktok": normalize_tiktok_gift,
+    "youtube": normalize_youtube_superchat,
+    "twitch": normalize_twitch_bits,
+    "generic": normalize_generic
+}
+
+def normalize_event(platform: str, raw: Dict, source_name: str) -> Optional[DonationEvent]:
+    """
+    Normaliza un evento crudo según su plataforma
+    
+    Retorna None si el evento es inválido (se cuenta como rechazado)
+    """
+    normalizer = PLATFORM_NORMALIZERS.get(platform, normalize_generic)
+    try:
+        event = normalizer(raw, source_name)
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+    event.platform = platform
+    return event
@@ -91,6 +91,19 @@ class ControlPanel:
         self.active_field = None
         self.cursor_blink_timer = 0
         
+        # Autocompletado del nombre: se consulta el índice de prefijos del
+        # PlanetSystem solo al cambiar el texto, nunca en cada frame
+        self.max_suggestions = 4
+        self.suggestion_row_height = 14
+        self.suggestions: List = []
+        self.selected_suggestion = 0
+        
+        # Superficie compuesta cacheada: se rehace solo si cambia el estado
+        # visible (texto, foco, parpadeo, hover, sugerencias)
+        self.button_hovered = False
+        self._render_key = None
+        self._build_overlay_tiles()
+        
         # Configurar layout overlay (NO el layout viejo)
         self.setup_overlay_layout()
         
@@ -185,7 +198,17 @@ class ControlPanel:
                 self.input_fields[self.active_field].cursor_visible = not self.input_fields[self.active_field].cursor_visible
     
     def render(self) -> pygame.Surface:
-        """Renderiza controles overlay en zona libre - SIN panel inferior"""
+        """
+        Renderiza controles overlay en zona libre - SIN panel inferior
+        
+        La mayoría de los frames nada cambió y se retorna la superficie
+        del frame anterior sin dibujar.
+        """
+        render_key = self._overlay_render_key()
+        if render_key == self._render_key:
+            return self.surface
+        self._render_key = render_key
+        
         # Limpiar superficie como transparente/invisible
         self.surface.fill((0, 0, 0, 0))  # Completamente transparente
         
@@ -194,6 +217,38 @@ class ControlPanel:
         
         return self.surface
     
+    def _overlay_render_key(self) -> tuple:
+        """Todo lo que afecta al dibujo del overlay, en una tupla comparable"""
+        donor_field = self.input_fields["donor_name"]
+        value_field = self.input_fields["custom_value"]
+        active = self.input_fields[self.active_field] if self.active_field else None
+        suggestions = ()
+        if self.suggestions and self.active_field == "donor_name":
+            suggestions = tuple((planet.donor_name, planet.total_value) for planet in self.suggestions)
+        return (donor_field.value, value_field.value, self.active_field,
+                active.cursor_visible if active is not None else False,
+                self.button_hovered, suggestions, self.selected_suggestion)
+    
+    def _build_overlay_tiles(self):
+        """Prepara fondos y textos fijos del overlay (una sola vez)"""
+        field_rect = self.input_fields["donor_name"].rect
+        self._field_tile = pygame.Surface((field_rect.width, field_rect.height))
+        self._field_tile.set_alpha(180)
+        self._field_tile.fill((40, 40, 60))
+        
+        # Fondo del botón por estado: deshabilitado, habilitado y con hover
+        self._button_tiles = {}
+        for state, color in (("disabled", (60, 60, 80)), ("enabled", (60, 120, 180)), ("hover", (80, 140, 200))):
+            tile = pygame.Surface((self.submit_button_rect.width, self.submit_button_rect.height))
+            tile.set_alpha(200)
+            tile.fill(color)
+            self._button_tiles[state] = tile
+        
+        self._label_surfaces = {label: self.font_small.render(label, True, (180, 180, 180))
+                                for label in ("Nombre:", "Coins:")}
+        button_text = "Crear"  # Texto más corto
+        self._button_text_surface = self.font_small.render(button_text, True, (255, 255, 255))
+    
     def _render_overlay_controls(self):
         """Renderiza controles compactos en zona libre (overlay)"""
         # Campo nombre del donador
@@ -206,21 +261,55 @@ class ControlPanel:
         
         # Botón crear/actualizar
         self._render_overlay_button()
+        
+        # Sugerencias de donadores (encima del campo de coins)
+        if self.suggestions and self.active_field == "donor_name":
+            self._render_suggestions()
+    
+    def _suggestion_rect(self, index: int) -> pygame.Rect:
+        """Rectángulo de una sugerencia, justo debajo del campo de nombre"""
+        field_rect = self.input_fields["donor_name"].rect
+        return pygame.Rect(field_rect.x, field_rect.bottom + index * self.suggestion_row_height,
+                           field_rect.width, self.suggestion_row_height)
+    
+    def _render_suggestions(self):
+        """Renderiza la lista de donadores que coinciden con lo escrito"""
+        for index, planet in enumerate(self.suggestions):
+            rect = self._suggestion_rect(index)
+            selected = index == self.selected_suggestion
+            pygame.draw.rect(self.surface, (60, 100, 140) if selected else (30, 30, 45), rect)
+            label = f"{planet.donor_name} ({planet.total_value})"
+            text_surface = self.font_small.render(label, True, (255, 255, 255))
+            self.surface.blit(text_surface, (rect.x + 3, rect.centery - text_surface.get_height() // 2))
+        pygame.draw.rect(self.surface, (100, 150, 200),
+                         self._suggestion_rect(0).union(self._suggestion_rect(len(self.suggestions) - 1)), 1)
+    
+    def _update_suggestions(self):
+        """Recalcula las sugerencias para el texto actual del nombre"""
+        prefix = self.input_fields["donor_name"].value.strip()
+        self.suggestions = self.planet_system.suggest_donors(prefix, self.max_suggestions) if prefix else []
+        # Si el nombre ya está completo no hay nada que sugerir
+        if len(self.suggestions) == 1 and self.suggestions[0].donor_name == prefix:
+            self.suggestions = []
+        self.selected_suggestion = 0
+    
+    def _accept_suggestion(self, index: int):
+        """Completa el nombre con una sugerencia y pasa al campo de coins"""
+        self.input_fields["donor_name"].value = self.suggestions[index].donor_name
+        self.suggestions = []
+        self._activate_field("custom_value")
     
     def _render_overlay_field(self, field: 'InputField', label: str):
         """Renderiza un campo individual en el overlay - COMPACTO"""
-        # Fondo semi-transparente más pequeño
-        overlay_bg = pygame.Surface((field.rect.width, field.rect.height))
-        overlay_bg.set_alpha(180)
-        overlay_bg.fill((40, 40, 60))
-        self.surface.blit(overlay_bg, field.rect)
+        # Fondo semi-transparente más pequeño (tile prearmado)
+        self.surface.blit(self._field_tile, field.rect)
         
         # Borde más fino
         border_color = (100, 150, 200) if field.is_active else (80, 80, 100)
         pygame.draw.rect(self.surface, border_color, field.rect, 1)
         
         # Label MUY compacto arriba del campo
-        label_surface = self.font_small.render(label, True, (180, 180, 180))
+        label_surface = self._label_surfaces.get(label) or self.font_small.render(label, True, (180, 180, 180))
         label_y = field.rect.y - 14  # Más cerca del campo
         self.surface.blit(label_surface, (field.rect.x, label_y))
         
@@ -240,24 +329,21 @@ class ControlPanel:
     
     def _render_overlay_button(self):
         """Renderiza el botón en el overlay - COMPACTO"""
-        # Verificar si se puede enviar
-        can_submit = self._can_submit_overlay()
-        button_color = (60, 120, 180) if can_submit else (60, 60, 80)
+        # Verificar si se puede enviar (solo al reconstruir el overlay)
+        if not self._can_submit_overlay():
+            state = "disabled"
+        else:
+            state = "hover" if self.button_hovered else "enabled"
         
         # Fondo del botón más transparente
-        overlay_bg = pygame.Surface((self.submit_button_rect.width, self.submit_button_rect.height))
-        overlay_bg.set_alpha(200)
-        overlay_bg.fill(button_color)
-        self.surface.blit(overlay_bg, self.submit_button_rect)
+        self.surface.blit(self._button_tiles[state], self.submit_button_rect)
         
         # Borde más fino
         pygame.draw.rect(self.surface, (150, 150, 150), self.submit_button_rect, 1)
         
         # Texto del botón más pequeño
-        button_text = "Crear"  # Texto más corto
-        text_surface = self.font_small.render(button_text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=self.submit_button_rect.center)
-        self.surface.blit(text_surface, text_rect)
+        text_rect = self._button_text_surface.get_rect(center=self.submit_button_rect.center)
+        self.surface.blit(self._button_text_surface, text_rect)
     
     def _can_submit_overlay(self) -> bool:
         """Verifica si se puede enviar con los campos overlay"""
@@ -434,6 +520,9 @@ class ControlPanel:
             self._handle_keyboard_input_overlay(event)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             self._handle_mouse_click_overlay(event)
+        elif event.type == pygame.MOUSEMOTION:
+            relative_pos = (event.pos[0] - self.overlay_x, event.pos[1] - self.overlay_y)
+            self.button_hovered = self.submit_button_rect.collidepoint(relative_pos)
     
     def _handle_mouse_click_overlay(self, event: pygame.event.Event):
         """Maneja clicks del mouse en controles overlay - COORDENADAS AJUSTADAS"""
@@ -448,6 +537,13 @@ class ControlPanel:
         if (0 <= relative_mouse_x <= self.overlay_width and 
             0 <= relative_mouse_y <= self.overlay_height):
             
+            # Verificar click en sugerencias (se dibujan encima de los campos)
+            if self.active_field == "donor_name":
+                for index in range(len(self.suggestions)):
+                    if self._suggestion_rect(index).collidepoint(relative_pos):
+                        self._accept_suggestion(index)
+                        return
+            
             # Verificar click en campos de entrada
             for field_name, field in self.input_fields.items():
                 if field.rect.collidepoint(relative_pos):
@@ -475,15 +571,24 @@ class ControlPanel:
                 self._submit_donation_overlay()
             return
         elif event.key == pygame.K_TAB:
-            self._cycle_active_field_overlay()
+            if self.suggestions and self.active_field == "donor_name":
+                self._accept_suggestion(self.selected_suggestion)
+            else:
+                self._cycle_active_field_overlay()
             return
         elif event.key == pygame.K_ESCAPE:
             self._deactivate_all_fields()
             return
+        elif event.key in (pygame.K_UP, pygame.K_DOWN) and self.suggestions:
+            step = 1 if event.key == pygame.K_DOWN else -1
+            self.selected_suggestion = (self.selected_suggestion + step) % len(self.suggestions)
+            return
         
         # Manejar entrada según tipo de campo
         if active_field_obj.field_type == "text":
             self._handle_text_input(event, active_field_obj)
+            if active_field_obj.name == "donor_name":
+                self._update_suggestions()
         elif active_field_obj.field_type == "number":
             self._handle_number_input(event, active_field_obj)
     
@@ -517,6 +622,7 @@ class ControlPanel:
         # Limpiar campos después del envío
         self.input_fields["donor_name"].value = ""
         self.input_fields["custom_value"].value = ""
+        self.suggestions = []
         self._deactivate_all_fields()
     
     def _activate_field(self, field_name: str):
@@ -684,9 +790,9 @@ class ControlPanel:
         if not selected_gift:
             selected_gift = self.gift_options[0]  # Default a rosa
         
-        # Usar valor personalizado si se proporcionó
+        # Usar valor personalizado si se proporcionó (0 usa el valor del regalo)
         custom_val = None
-        if custom_value_str and custom_value_str.isdigit():
+        if custom_value_str and custom_value_str.isdigit() and int(custom_value_str) > 0:
             custom_val = int(custom_value_str)
         
         self.pending_donation_data = {
@@ -3,11 +3,29 @@
 
 import pygame
 import sys
+import time
 from typing import Optional
 from ..core.session_manager import SessionManager
+from ..core.planet_snapshot import SnapshotScheduler
 from ..core.planet_system import PlanetSystem
+from ..core.achievements import AchievementEngine
+from ..core.event_bus import EventBus, PlanetEvent, PlanetEventType
+from ..core.event_multiplexer import EventMultiplexer
+from ..core.session_replay import SessionReplay
+from ..core.trend_metrics import TrendAggregator
+from ..database.backup_scheduler import BackupScheduler
+from ..database.query_service import ReadQueryService
+from ..database.session_compactor import SessionCompactor
+from ..models.donation import Donation
+from ..sources.fake_source import FakeDonationSource
+from ..api.ingest_server import IngestApiServer
+from ..api.state_sync import StateSyncServer
+from ..utils.config import config_manager
+from ..utils.frame_profiler import FrameProfiler
+from ..utils.runtime_profiler import RuntimeProfiler
 from .planet_display import PlanetDisplay
 from .control_panel import ControlPanel
+from .performance_hud import PerformanceHud
 
 class MainWindow:
     """
@@ -21,9 +39,23 @@ class MainWindow:
     - Atajos de teclado para funciones rápidas
     """
     
-    def __init__(self, session_manager: SessionManager):
+    def __init__(self, session_manager: SessionManager, replay_session_id: Optional[str] = None,
+                 replay_speed: Optional[float] = 1.0, replay_db_path: Optional[str] = None):
         self.session_manager = session_manager
-        self.planet_system = PlanetSystem()
+        self.event_bus = EventBus()
+        self.trends = TrendAggregator(
+            bucket_seconds=config_manager.get("trends.bucket_seconds", 1),
+            windows=config_manager.get("trends.windows_seconds", [60, 300]))
+        achievements = None
+        if config_manager.get("achievements.enabled", True):
+            achievements = AchievementEngine.from_config(
+                config_manager.get("achievements.rules"),
+                streak_gap_seconds=config_manager.get("achievements.streak_gap_seconds", 30))
+        self.planet_system = PlanetSystem(self.event_bus,
+                                          max_visible_planets=config_manager.get("display.max_visible_planets", 4),
+                                          trends=self.trends, achievements=achievements)
+        # Sesión retomada tras un corte: planetas desde la base y la cola del journal
+        session_manager.recover(self.planet_system)
         
         # Obtener tamaño de pantalla dinámicamente
         pygame.init()
@@ -46,19 +78,132 @@ class MainWindow:
         pygame.display.set_caption("TikTok Planets System - Responsive Layout")
         self.clock = pygame.time.Clock()
         
+        # Consultas de detalles de planetas fuera del hilo de render
+        self.query_service = ReadQueryService(session_manager.db_manager.db_path, session_manager.session_id)
+        
         # Componentes de UI para layout VERTICAL con OVERLAY
         self.planet_display = PlanetDisplay(self.planet_system, 
                                           display_width=self.window_width, 
                                           display_height=self.window_height,  # Pantalla completa
-                                          layout_mode="vertical")
+                                          layout_mode="vertical",
+                                          query_service=self.query_service)
         self.control_panel = ControlPanel(self.planet_system, 
                                         panel_width=self.window_width,  # Pantalla completa para overlay
                                         panel_height=self.window_height)
         
+        # Multiplexor de donaciones de plataformas externas
+        self.event_multiplexer = EventMultiplexer()
+        self.max_events_per_frame = config_manager.get("sources.max_events_per_frame", 50)
+        self.ingest_budget_ms = config_manager.get("sources.ingest_budget_ms", 4)
+        self.api_server: Optional[IngestApiServer] = None
+        self.state_sync_server: Optional[StateSyncServer] = None
+        self._state_dirty = True
+        self._session_info_surface: Optional[pygame.Surface] = None
+        self.event_bus.subscribe(self._on_planet_event)
+        self.event_bus.subscribe(self._on_achievement_unlocked, [PlanetEventType.ACHIEVEMENT_UNLOCKED],
+                                 mode=EventBus.QUEUED)
+        self._setup_event_sources()
+        
+        # Reproducción de una sesión guardada (opcional)
+        self.session_replay: Optional[SessionReplay] = None
+        if replay_session_id:
+            self.session_replay = SessionReplay.from_db_path(
+                replay_db_path or session_manager.db_manager.db_path, replay_session_id,
+                sink=self._process_replayed_donation, speed=replay_speed,
+                reset_callback=self._reset_for_replay)
+        
+        # Instrumentación por etapa del frame (F3 muestra el HUD)
+        self.frame_profiler = FrameProfiler(
+            window_frames=config_manager.get("profiling.window_frames", 600),
+            export_interval=config_manager.get("profiling.export_interval_seconds", 10),
+            export_path=config_manager.get("profiling.export_path"),
+            export_callback=self._save_performance_metrics if config_manager.get("profiling.save_to_database", False) else None)
+        self.frame_profiler.set_enabled(config_manager.get("profiling.enabled", False))
+        self.performance_hud = PerformanceHud(self.frame_profiler, trends=self.trends,
+                                              hot_donors=config_manager.get("trends.hot_donors", 3))
+        
+        # Diagnóstico bajo demanda: F6 cProfile, F7 tracemalloc, F8 frames lentos
+        self.runtime_profiler = RuntimeProfiler(
+            self.frame_profiler,
+            output_dir=config_manager.get("profiling.output_dir", "profiles"),
+            profile_seconds=config_manager.get("profiling.cpu_profile_seconds", 10),
+            slow_frames=config_manager.get("profiling.slow_frames_to_dump", 20))
+        
+        # Backups en caliente de la base de sesiones (hilo aparte, por pasos)
+        self.backup_scheduler: Optional[BackupScheduler] = None
+        if config_manager.get("database.auto_backup", True):
+            self.backup_scheduler = BackupScheduler(
+                session_manager.db_manager.db_path,
+                backup_dir=config_manager.get("database.backup_dir", "backups"),
+                interval_minutes=config_manager.get("database.backup_interval_minutes", 30),
+                max_files=config_manager.get("database.max_backup_files", 10),
+                pages_per_step=config_manager.get("database.backup_pages_per_step", 64),
+                step_sleep_ms=config_manager.get("database.backup_step_sleep_ms", 10))
+        
+        # Compactación de sesiones viejas en los ratos sin donaciones
+        self.session_compactor: Optional[SessionCompactor] = None
+        if config_manager.get("retention.enabled", False):
+            self.session_compactor = SessionCompactor(
+                session_manager.db_manager,
+                retention_days=config_manager.get("retention.keep_days", 90),
+                archive_dir=config_manager.get("retention.archive_dir", "archives"),
+                rows_per_step=config_manager.get("retention.rows_per_step", 250),
+                step_budget_ms=config_manager.get("retention.step_budget_ms", 4),
+                idle_seconds=config_manager.get("retention.idle_seconds", 10),
+                vacuum_pages_per_step=config_manager.get("retention.vacuum_pages_per_step", 128))
+        
+        # Snapshots del PlanetSystem junto al journal: recuperar un corte no relee toda la sesión
+        self.snapshot_scheduler: Optional[SnapshotScheduler] = None
+        snapshot_interval = config_manager.get("journal.snapshot_interval_seconds", 300)
+        if session_manager.journal_dir and snapshot_interval > 0:
+            self.snapshot_scheduler = SnapshotScheduler(self.planet_system, session_manager,
+                                                        session_manager.journal_dir, snapshot_interval)
+        
         # Estado de la aplicación
         self.running = True
         self.last_update_time = 0
     
+    def _setup_event_sources(self):
+        """
+        Registra las fuentes de donaciones configuradas en el multiplexor
+        
+        Futuras fuentes:
+        - Conectores reales de TikTok, YouTube y Twitch
+        """
+        platforms = config_manager.get("sources.platforms", {})
+        
+        if config_manager.get("sources.enable_fake_sources", False):
+            fake_rate = config_manager.get("sources.fake_rate_per_second", 5)
+            for platform, settings in platforms.items():
+                source = FakeDonationSource(f"fake_{platform}", platform, rate_per_second=fake_rate)
+                self.event_multiplexer.register_source(source,
+                                                       weight=settings.get("weight", 1),
+                                                       rate_per_second=settings.get("rate_per_second", 0),
+                                                       burst=settings.get("burst"))
+        
+        # API local para bots, Stream Deck y herramientas de moderación
+        if config_manager.get("api.enabled", False):
+            self.api_server = IngestApiServer(host=config_manager.get("api.host", "127.0.0.1"),
+                                              port=config_manager.get("api.port", 8765),
+                                              max_batch_size=config_manager.get("api.max_batch_size", 1000),
+                                              token=config_manager.get("api.token", ""))
+            if self.api_server.start():
+                self.event_multiplexer.register_source(self.api_server.source,
+                                                       weight=config_manager.get("api.weight", 2),
+                                                       rate_per_second=config_manager.get("api.rate_per_second", 0))
+            else:
+                self.api_server = None
+        
+        # Sincronización de estado para overlays de navegador (OBS)
+        if config_manager.get("state_sync.enabled", False):
+            self.state_sync_server = StateSyncServer(host=config_manager.get("state_sync.host", "127.0.0.1"),
+                                                     port=config_manager.get("state_sync.port", 8766),
+                                                     keyframe_interval=config_manager.get("state_sync.keyframe_interval_seconds", 5.0))
+            if not self.state_sync_server.start():
+                self.state_sync_server = None
+        
+        self.event_multiplexer.start_all()
+    
     def run(self):
         """
         Loop principal de la aplicación
@@ -73,17 +218,55 @@ class MainWindow:
             delta_time = current_time - self.last_update_time
             self.last_update_time = current_time
             
-            # Procesar eventos
-            self._handle_events()
-            
-            # Actualizar componentes
-            self._update(delta_time)
-            
-            # Renderizar
-            self._render()
+            self.step(delta_time)
             
             # Control de FPS
             self.clock.tick(self.fps)
+        
+        self.shutdown()
+    
+    def step(self, delta_time: int):
+        """
+        Ejecuta un frame completo: eventos, actualización y render
+        
+        Separado de run() para poder conducir el loop desde fuera
+        (pruebas de resistencia sin límite de FPS).
+        """
+        self.frame_profiler.begin_frame()
+        
+        # Procesar eventos
+        with self.frame_profiler.stage("events"):
+            self._handle_events()
+        
+        # Actualizar componentes
+        self._update(delta_time)
+        
+        # Renderizar
+        self._render()
+        
+        self.frame_profiler.end_frame()
+        self.runtime_profiler.update()
+        if self.backup_scheduler:
+            self.backup_scheduler.update()
+        # No mientras corre un backup: su lectura retiene el WAL y lo haría crecer
+        if self.session_compactor and not (self.backup_scheduler and self.backup_scheduler.running):
+            self.session_compactor.update()
+        if self.snapshot_scheduler:
+            self.snapshot_scheduler.update()
+    
+    def shutdown(self):
+        """Detiene fuentes externas y servidores al salir"""
+        self.runtime_profiler.close()
+        if self.backup_scheduler:
+            self.backup_scheduler.stop()
+        if self.snapshot_scheduler:
+            self.snapshot_scheduler.stop()
+        self.query_service.close()
+        self.event_multiplexer.stop_all()
+        if self.api_server:
+            self.api_server.stop()
+        if self.state_sync_server:
+            self.state_sync_server.stop()
     
     def _handle_events(self):
         """
@@ -110,6 +293,20 @@ class MainWindow:
                     self._toggle_fullscreen()
                 elif event.key == pygame.K_F5:
                     self._refresh_display()
+                elif event.key == pygame.K_F3:
+                    self._toggle_performance_hud()
+                elif event.key == pygame.K_F6:
+                    self.runtime_profiler.toggle_cpu_profile()
+                elif event.key == pygame.K_F7:
+                    self.runtime_profiler.take_allocation_snapshot()
+                elif event.key == pygame.K_F8:
+                    self.runtime_profiler.dump_slow_frames()
+                elif event.key == pygame.K_F9 and self.session_replay:
+                    self.session_replay.toggle_pause()
+                elif event.key == pygame.K_F10 and self.session_replay:
+                    # F10 avanza 60 s, Shift+F10 retrocede 60 s
+                    step = -60 if event.mod & pygame.KMOD_SHIFT else 60
+                    self.session_replay.seek(self.session_replay.virtual_seconds + step)
     
     def _update(self, delta_time: int):
         """
@@ -120,13 +317,54 @@ class MainWindow:
         - Efectos de partículas
         - Sincronización con datos externos
         """
-        self.control_panel.update(delta_time)
-        self.planet_display.update(delta_time)
+        profiler = self.frame_profiler
+        with profiler.stage("control_panel.update"):
+            self.control_panel.update(delta_time)
+        with profiler.stage("planet_display.update"):
+            self.planet_display.update(delta_time)
         
-        # Verificar si hay nuevas donaciones procesadas
-        if self.control_panel.has_new_donation():
-            donation_data = self.control_panel.get_new_donation()
-            self._process_new_donation(donation_data)
+        with profiler.stage("ingest"):
+            # Verificar si hay nuevas donaciones procesadas
+            if self.control_panel.has_new_donation():
+                donation_data = self.control_panel.get_new_donation()
+                self._process_new_donation(donation_data)
+            
+            # Procesar donaciones de plataformas externas
+            self._process_multiplexed_events()
+            
+            # Avanzar la reproducción de sesión
+            if self.session_replay:
+                self.session_replay.update(delta_time, max_events=self.max_events_per_frame)
+        
+        # Entregar notificaciones encoladas (sonidos, persistencia, etc.)
+        self.event_bus.dispatch_queued()
+        
+        # Publicar estado para la API local y los overlays de navegador
+        if self._state_dirty:
+            if self.api_server:
+                self.api_server.publish_state(self.planet_system.get_state_summary())
+            if self.state_sync_server:
+                self.state_sync_server.publish(self.planet_system)
+            self._state_dirty = False
+    
+    def _process_multiplexed_events(self):
+        """
+        Procesa donaciones del multiplexor dentro del presupuesto del frame
+        
+        Se corta por número de eventos y por tiempo; lo que no cabe queda
+        en la cola de su fuente para el siguiente frame.
+        """
+        deadline = time.perf_counter() + self.ingest_budget_ms / 1000.0
+        
+        for _ in range(self.max_events_per_frame):
+            event = self.event_multiplexer.next_event()
+            if event is None:
+                break
+            
+            self._process_new_donation(event.to_donation_data())
+            
+            if time.perf_counter() >= deadline:
+                break
     
     def _render(self):
         """
@@ -139,23 +377,32 @@ class MainWindow:
         # Limpiar pantalla con fondo espacial
         self.screen.fill((10, 10, 20))  # Azul espacial muy oscuro
         
+        profiler = self.frame_profiler
+        
         # Renderizar display de planetas en PANTALLA COMPLETA
-        planet_surface = self.planet_display.render()
-        self.screen.blit(planet_surface, (0, 0))
+        with profiler.stage("planet_display.render"):
+            planet_surface = self.planet_display.render()
+            self.screen.blit(planet_surface, (0, 0))
         
         # Renderizar controles OVERLAY pequeño en posición específica
-        control_surface = self.control_panel.render()
-        # Posicionar el overlay pequeño en la zona libre (círculo naranja)
-        overlay_pos = (self.control_panel.overlay_x, self.control_panel.overlay_y)
-        self.screen.blit(control_surface, overlay_pos)
+        with profiler.stage("control_panel.render"):
+            control_surface = self.control_panel.render()
+            # Posicionar el overlay pequeño en la zona libre (círculo naranja)
+            overlay_pos = (self.control_panel.overlay_x, self.control_panel.overlay_y)
+            self.screen.blit(control_surface, overlay_pos)
         
         # NO hay línea divisoria - todo es overlay
         
         # Información de sesión (opcional, en esquina superior izquierda)
-        self._render_session_info()
+        with profiler.stage("session_info"):
+            self._render_session_info()
+        
+        # Panel de rendimiento (F3)
+        self.performance_hud.render(self.screen)
         
         # Actualizar display
-        pygame.display.flip()
+        with profiler.stage("flip"):
+            pygame.display.flip()
     
     def _process_new_donation(self, donation_data: dict):
         """
@@ -169,39 +416,116 @@ class MainWindow:
         donor_name = donation_data["donor_name"]
         gift_type = donation_data["gift_type"]
         custom_value = donation_data.get("custom_value")
+        timestamp = donation_data.get("timestamp")
         
         # Crear planeta o actualizar existente
-        planet = self.planet_system.add_donation(donor_name, gift_type, custom_value)
+        planet = self.planet_system.add_donation(donor_name, gift_type, custom_value, timestamp)
+        
+        # Guardar en base de datos (primero en el journal: un corte a mitad de camino se recupera)
+        with self.frame_profiler.stage("db"):
+            last_donation = planet.donations_history[-1] if planet.donations_history else None
+            journal_seq = self.session_manager.journal_donation(last_donation) if last_donation else None
+            self.session_manager.db_manager.save_planet(planet)
+            if last_donation:
+                self.session_manager.db_manager.save_donation(last_donation, journal_seq)
+        
+        # Notificar el cambio a los suscriptores de la API local
+        if self.api_server:
+            planet_info = planet.get_display_info()
+            del planet_info["position"]
+            self.api_server.publish_event({
+                "type": "planet_changed",
+                "planet": planet_info,
+                "donation_value": planet.donations_history[-1].value if planet.donations_history else 0
+            })
+    
+    def _process_replayed_donation(self, donation: Donation):
+        """Procesa una donación reproducida conservando su hora original"""
+        self._process_new_donation({
+            "donor_name": donation.donor_name,
+            "gift_type": donation.gift_type,
+            "custom_value": donation.value,
+            "timestamp": donation.timestamp
+        })
+    
+    def _reset_for_replay(self):
+        """
+        Reinicia el estado al retroceder en una reproducción
+        
+        Se abre una sesión nueva para no duplicar donaciones en la base.
+        """
+        self.planet_system.reset()
+        self.session_manager.create_new_session()
+        self.query_service.set_session(self.session_manager.session_id)
+        self._session_info_surface = None
+    
+    def _on_planet_event(self, event: PlanetEvent):
+        """Marca como desactualizados el estado publicado y la info de sesión"""
+        self._state_dirty = True
+        self._session_info_surface = None
+    
+    def _on_achievement_unlocked(self, event: PlanetEvent):
+        """
+        Anuncia un logro a los overlays (fuera del camino de la donación)
         
-        # Guardar en base de datos
-        self.session_manager.db_manager.save_planet(planet)
-        if planet.donations_history:
-            last_donation = planet.donations_history[-1]
-            self.session_manager.db_manager.save_donation(last_donation)
+        Las metas de sesión también se anotan en consola; los logros por
+        donador son demasiados para eso.
+        """
+        rule = event.achievement
+        donor = event.planet.donor_name if event.planet is not None else None
+        if rule.session_wide:
+            print(f"Session goal reached: {rule.name}")
+        if self.api_server:
+            self.api_server.publish_event({
+                "type": "achievement_unlocked",
+                "achievement": rule.to_dict(),
+                "donor_name": donor,
+                "session_wide": rule.session_wide
+            })
     
     def _render_session_info(self):
         """
         Renderiza información básica de sesión en esquina superior
         Simplificado para TikTok Live - solo info esencial
+        
+        Las estadísticas se consultan y la etiqueta se rehace solo cuando
+        el sistema de planetas publica un cambio.
         """
+        if self._session_info_surface is None:
+            self._session_info_surface = self._build_session_info()
+        self.screen.blit(self._session_info_surface, (5, 8))
+    
+    def _build_session_info(self) -> pygame.Surface:
+        """Construye la etiqueta de sesión con su fondo"""
         font = pygame.font.Font(None, 20)  # Fuente más pequeña
-        stats = self.session_manager.get_session_stats()
+        with self.frame_profiler.stage("db"):
+            stats = self.session_manager.get_session_stats()
         
         # Info compacta en una línea
         info_text = f"Planetas: {stats['total_planets']} | {stats['total_donations']} coins"
         text_surface = font.render(info_text, True, (255, 255, 255))
         
-        # Fondo semi-transparente para legibilidad
-        text_rect = text_surface.get_rect()
-        text_rect.topleft = (10, 10)
-        background_rect = text_rect.inflate(10, 5)
-        
-        # Superficie con alpha para fondo
-        bg_surface = pygame.Surface(background_rect.size, pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 128))  # Negro semi-transparente
+        # Fondo semi-transparente para legibilidad (margen de 5 px alrededor)
+        background_rect = text_surface.get_rect().inflate(10, 5)
+        surface = pygame.Surface(background_rect.size, pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 128))  # Negro semi-transparente
+        surface.blit(text_surface, (5, 2))
+        return surface
+    
+    def _toggle_performance_hud(self):
+        """
+        Muestra u oculta el HUD de rendimiento
         
-        self.screen.blit(bg_surface, background_rect.topleft)
-        self.screen.blit(text_surface, text_rect.topleft)
+        La instrumentación se activa con el HUD; si profiling.enabled está
+        en la configuración sigue midiendo (y exportando) aunque se oculte.
+        """
+        self.performance_hud.toggle()
+        self.frame_profiler.set_enabled(self.performance_hud.visible or
+                                        config_manager.get("profiling.enabled", False))
+    
+    def _save_performance_metrics(self, record: dict):
+        """Guarda un registro del profiler en la tabla performance_metrics"""
+        self.session_manager.db_manager.save_performance_metrics(record)
     
     def _toggle_fullscreen(self):
         """
@@ -0,0 +1,114 @@
+# Performance HUD - Panel en pantalla con tiempos por etapa del frame
+# Muestra p50/p95/p99 del FrameProfiler sin afectar la captura cuando está oculto
+
+import pygame
+from typing import List, Optional
+from ..core.trend_metrics import TrendAggregator
+from ..utils.frame_profiler import FrameProfiler
+
+class PerformanceHud:
+    """
+    Panel de rendimiento superpuesto (esquina superior derecha)
+    
+    La superficie del panel se reconstruye cada `refresh_ms`, no en cada
+    frame: renderizar texto con fuentes es de lo más caro del frame y el
+    HUD no debe distorsionar lo que mide.
+    
+    Si recibe un TrendAggregator, debajo de la tabla muestra las métricas
+    de momentum (coins y donaciones/min por ventana y donadores en racha);
+    consultarlas es O(1) por ventana, así que caben en el mismo refresco.
+    
+    Futuras mejoras:
+    - Gráfica de barras del último segundo
+    - Colores por etapa que excede su presupuesto
+    """
+    
+    # Orden de presentación de las etapas conocidas
+    STAGE_ORDER = [
+        FrameProfiler.FRAME,
+        "events",
+        "control_panel.update",
+        "planet_display.update",
+        "ingest",
+        "planet_display.render",
+        "control_panel.render",
+        "session_info",
+        "flip",
+        "db"
+    ]
+    
+    def __init__(self, profiler: FrameProfiler, refresh_ms: int = 500,
+                 trends: Optional[TrendAggregator] = None, hot_donors: int = 3):
+        self.profiler = profiler
+        self.refresh_ms = refresh_ms
+        self.trends = trends
+        self.hot_donors = hot_donors
+        self.visible = False
+        self.font = pygame.font.SysFont("consolas,dejavusansmono,couriernew,monospace", 12)
+        self._surface = None
+        self._last_refresh = -refresh_ms
+    
+    def toggle(self):
+        """Muestra u oculta el HUD"""
+        self.visible = not self.visible
+        self._surface = None
+    
+    def render(self, screen: pygame.Surface):
+        """Dibuja el HUD sobre la pantalla si está visible"""
+        if not self.visible:
+            return
+        
+        now = pygame.time.get_ticks()
+        if self._surface is None or now - self._last_refresh >= self.refresh_ms:
+            self._surface = self._build_surface()
+            self._last_refresh = now
+        
+        screen.blit(self._surface, (screen.get_width() - self._surface.get_width() - 10, 10))
+    
+    def _build_surface(self) -> pygame.Surface:
+        """Construye el panel con los percentiles actuales"""
+        summary = self.profiler.get_summary()
+        names = [name for name in self.STAGE_ORDER if name in summary]
+        names += sorted(name for name in summary if name not in self.STAGE_ORDER)
+        
+        rows = [("stage", "p50", "p95", "p99")]
+        for name in names:
+            stats = summary[name]
+            rows.append((name, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"))
+        if len(rows) == 1:
+            rows.append(("collecting...", "", "", ""))
+        
+        # Columnas alineadas a la derecha (la fuente puede no ser monoespaciada)
+        color = (200, 255, 200)
+        rendered = [[self.font.render(cell, True, color) for cell in row] for row in rows]
+        name_width = max(row[0].get_width() for row in rendered) + 10
+        column_width = max(cell.get_width() for row in rendered for cell in row[1:]) + 8
+        trend_lines = [self.font.render(line, True, (255, 220, 140)) for line in self._trend_lines()]
+        line_height = self.font.get_linesize()
+        width = max([name_width + column_width * 3] + [line.get_width() for line in trend_lines]) + 12
+        height = line_height * (len(rendered) + len(trend_lines)) + 8
+        
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for index, row in enumerate(rendered):
+            y = 4 + index * line_height
+            surface.blit(row[0], (6, y))
+            for column, cell in enumerate(row[1:], start=1):
+                surface.blit(cell, (6 + name_width + column_width * column - cell.get_width(), y))
+        for index, line in enumerate(trend_lines, start=len(rendered)):
+            surface.blit(line, (6, 4 + index * line_height))
+        return surface
+    
+    def _trend_lines(self) -> List[str]:
+        """Líneas de momentum: una por ventana y una con los donadores en racha"""
+        if self.trends is None:
+            return []
+        lines = [""]
+        for seconds in self.trends.windows:
+            lines.append(f"last {seconds}s: {self.trends.coins(seconds)} coins, "
+                         f"{self.trends.donations_per_minute(seconds):.1f} donations/min")
+        longest = self.trends.windows[-1]
+        hot = self.trends.hot_donors(longest, self.hot_donors)
+        if hot:
+            lines.append("hot: " + ", ".join(f"{name} ({coins})" for name, coins in hot))
+        return lines
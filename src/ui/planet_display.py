@@ -2,10 +2,28 @@
 # Muestra los planetas visibles para captura en TikTok Live
 
 import pygame
-import math
-from typing import List
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
 from ..core.planet_system import PlanetSystem
-from ..models.planet import Planet
+from ..core.event_bus import PlanetEvent, PlanetEventType
+from ..database.query_service import PlanetDetails, ReadQueryService
+from ..models.planet import Planet, PlanetRenderSnapshot
+
+class _PlanetSprites:
+    """Superficies pre-renderizadas de un planeta para una vista concreta"""
+    
+    __slots__ = ("snapshot", "name_text", "name_background", "value_text", "value_background", "glows", "ring")
+    
+    def __init__(self, snapshot: PlanetRenderSnapshot, name_text: pygame.Surface, name_background: pygame.Surface,
+                 value_text: pygame.Surface, value_background: pygame.Surface,
+                 glows: List[Tuple[pygame.Surface, int]], ring: Optional[pygame.Surface]):
+        self.snapshot = snapshot
+        self.name_text = name_text
+        self.name_background = name_background
+        self.value_text = value_text
+        self.value_background = value_background
+        self.glows = glows
+        self.ring = ring
 
 class PlanetDisplay:
     """
@@ -20,7 +38,8 @@ class PlanetDisplay:
     - Fondos de nebulosas y estrellas animadas
     """
     
-    def __init__(self, planet_system: PlanetSystem, display_width: int, display_height: int, layout_mode: str = "vertical"):
+    def __init__(self, planet_system: PlanetSystem, display_width: int, display_height: int, layout_mode: str = "vertical",
+                 query_service: Optional[ReadQueryService] = None):
         self.planet_system = planet_system
         self.width = display_width
         self.height = display_height
@@ -29,15 +48,7 @@ class PlanetDisplay:
         
         # Configuración visual para layout VERTICAL
         self.background_color = (5, 5, 15)  # Azul espacial más oscuro
-        self.max_visible_planets = 4
-        
-        # Configuración de espaciado VERTICAL
-        if layout_mode == "vertical":
-            self.planet_spacing_y = self.height // (self.max_visible_planets + 1)
-            self.planet_center_x = self.width // 2  # Centrados horizontalmente
-        else:
-            # Fallback al modo horizontal original
-            self.planet_spacing = self.width // (self.max_visible_planets + 1)
+        self._update_layout()
         
         # Configuración de animaciones
         self.animation_speed = 2.0
@@ -49,6 +60,38 @@ class PlanetDisplay:
         self.show_names = True
         self.show_values = True
         self.particle_effects = False  # Deshabilitado por rendimiento en móvil
+        
+        # Fuentes y superficies cacheadas por planeta
+        self.name_font = pygame.font.Font(None, 22)
+        self.value_font = pygame.font.Font(None, 18)
+        self._sprite_cache: Dict[str, _PlanetSprites] = {}
+        
+        # La superficie solo se redibuja cuando el sistema publica cambios
+        self._visible_planets: List[Planet] = planet_system.get_visible_planets()
+        self._dirty = True
+        self._subscription = planet_system.event_bus.subscribe(self._on_planet_event)
+        
+        # Detalles del planeta seleccionado: se consultan en segundo plano
+        # y update() revisa el Future cada frame
+        self.query_service = query_service
+        self.details_font = pygame.font.Font(None, 20)
+        self._selected_donor: Optional[str] = None
+        self._details_future: Optional[Future] = None
+        self._details_surface: Optional[pygame.Surface] = None
+        self._details_stale = False
+    
+    def _update_layout(self):
+        """Calcula el espaciado según el tamaño de la ventana visible del carrusel"""
+        self.max_visible_planets = self.planet_system.max_visible_planets
+        self._sprite_cache_limit = self.max_visible_planets * 4
+        
+        # Configuración de espaciado VERTICAL
+        if self.layout_mode == "vertical":
+            self.planet_spacing_y = self.height // (self.max_visible_planets + 1)
+            self.planet_center_x = self.width // 2  # Centrados horizontalmente
+        else:
+            # Fallback al modo horizontal original
+            self.planet_spacing = self.width // (self.max_visible_planets + 1)
     
     def update(self, delta_time: int):
         """
@@ -65,80 +108,108 @@ class PlanetDisplay:
             self.current_rotation = 0
         
         # Futuras actualizaciones de animaciones de planetas individuales
+        
+        self._poll_details()
+    
+    def _on_planet_event(self, event: PlanetEvent):
+        """Invalida solo lo afectado por un cambio del sistema de planetas"""
+        if event.event_type == PlanetEventType.CAROUSEL_REORDERED:
+            self._visible_planets = self.planet_system.get_visible_planets()
+            if self.planet_system.max_visible_planets != self.max_visible_planets:
+                self._update_layout()
+        elif event.event_type == PlanetEventType.PLANET_EVICTED:
+            self._sprite_cache.pop(event.planet.donor_name, None)
+        elif event.event_type == PlanetEventType.VALUE_CHANGED and self.query_service is not None:
+            # La donación todavía no está en la base: se vuelve a consultar en update()
+            self.query_service.invalidate(event.planet.donor_name)
+            if self._selected_donor is not None and event.planet.donor_name.lower() == self._selected_donor.lower():
+                self._details_stale = True
+        self._dirty = True
+    
+    def invalidate(self):
+        """Fuerza un redibujado completo en el próximo render()"""
+        self._visible_planets = self.planet_system.get_visible_planets()
+        self._dirty = True
+    
+    def close(self):
+        """Cancela la suscripción a los eventos del sistema"""
+        self.planet_system.event_bus.unsubscribe(self._subscription)
     
     def render(self) -> pygame.Surface:
         """
         Renderiza todos los planetas visibles en el carrusel
         
+        Si nada cambió desde el último frame se retorna la superficie
+        anterior tal cual: el contenido solo depende del estado publicado.
+        
         Futuras mejoras de rendering:
         - Shaders para efectos visuales avanzados
         - Capas separadas para diferentes elementos
         - Optimización de rendering para planetas fuera de pantalla
         """
+        if not self._dirty:
+            return self.surface
+        self._dirty = False
+        
         # Limpiar superficie
         self.surface.fill(self.background_color)
         
         # Renderizar fondo estrellado (futuro)
         self._render_background()
         
-        # Obtener planetas visibles
-        visible_planets = self.planet_system.get_visible_planets()
-        
-        # Renderizar cada planeta
-        for i, planet in enumerate(visible_planets):
-            self._render_planet(planet, i)
+        # Renderizar cada planeta visible desde su vista inmutable
+        for i, planet in enumerate(self._visible_planets):
+            self._render_planet(planet.get_render_snapshot(), i)
         
         # Efectos de overlay (futuro)
         self._render_overlay_effects()
         
+        if self._details_surface is not None:
+            self.surface.blit(self._details_surface, (10, 40))
+        
         return self.surface
     
-    def _render_planet(self, planet: Planet, position_index: int):
+    def _slot_position(self, position_index: int) -> Tuple[int, int]:
         """
-        Renderiza un planeta individual en LAYOUT VERTICAL
+        Centro del planeta para una posición del carrusel
         
         Layout vertical: Los planetas se apilan de arriba hacia abajo
         - Más reciente arriba
         - Más antiguo abajo
         - Centrados horizontalmente
         """
-        # Calcular posición VERTICAL
         if self.layout_mode == "vertical":
-            x = self.planet_center_x  # Centrado horizontalmente
-            y = (position_index + 1) * self.planet_spacing_y
-            
             # Ajustar Y para evitar que planetas grandes salgan de pantalla
-            max_y = self.height - 100  # Margen inferior
-            if y > max_y:
-                y = max_y
-        else:
-            # Fallback al modo horizontal
-            x = (position_index + 1) * self.planet_spacing
-            y = self.height // 2
-        
-        # Obtener propiedades visuales del planeta
-        display_info = planet.get_display_info()
-        size = display_info["size"]
-        color = display_info["color"]
+            y = min((position_index + 1) * self.planet_spacing_y, self.height - 100)
+            return self.planet_center_x, y
+        # Fallback al modo horizontal
+        return (position_index + 1) * self.planet_spacing, self.height // 2
+    
+    def _render_planet(self, snapshot: PlanetRenderSnapshot, position_index: int):
+        """
+        Renderiza un planeta individual en LAYOUT VERTICAL
         
-        # Ajustar tamaños para pantalla vertical (más compactos)
-        size = int(size * 0.8)  # Reducir 20% para mejor aprovechamiento del espacio
+        Solo lee la vista de render del planeta; las superficies de texto
+        y efectos se cachean mientras la vista no cambie.
+        """
+        x, y = self._slot_position(position_index)
+        sprites = self._get_sprites(snapshot)
         
         # Renderizar planeta base
-        pygame.draw.circle(self.surface, color, (x, y), size)
+        pygame.draw.circle(self.surface, snapshot.color, (x, y), snapshot.size)
         
         # Efectos visuales adicionales según tipo
-        self._render_planet_effects(planet, x, y, size)
+        self._render_planet_effects(snapshot, sprites, x, y)
         
         # Renderizar nombre del donador (ajustado para vertical)
         if self.show_names:
-            self._render_planet_name(planet, x, y - size - 25)
+            self._blit_label(sprites.name_background, sprites.name_text, x, y + snapshot.name_offset_y)
         
         # Renderizar valor de donaciones
         if self.show_values:
-            self._render_planet_value(planet, x, y + size + 15)
+            self._blit_label(sprites.value_background, sprites.value_text, x, y + snapshot.value_offset_y)
     
-    def _render_planet_effects(self, planet: Planet, x: int, y: int, size: int):
+    def _render_planet_effects(self, snapshot: PlanetRenderSnapshot, sprites: '_PlanetSprites', x: int, y: int):
         """
         Renderiza efectos especiales según el tipo de planeta
         
@@ -150,87 +221,62 @@ class PlanetDisplay:
         - Stellar System: Múltiples estrellas orbitando
         - Galaxy: Forma espiral con brazos
         """
-        planet_type = planet.planet_type
-        
-        if planet_type.value == "star":
-            # Efecto de brillo para estrellas
-            for i in range(3):
-                alpha = 50 - (i * 15)
-                glow_size = size + (i * 10)
-                # Crear superficie temporal con alpha
-                glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surface, (*planet.color, alpha), (glow_size, glow_size), glow_size)
-                self.surface.blit(glow_surface, (x - glow_size, y - glow_size))
-        
-        elif planet_type.value == "jupiter":
+        # Efecto de brillo para estrellas
+        for glow_surface, radius in sprites.glows:
+            self.surface.blit(glow_surface, (x - radius, y - radius))
+        
+        if sprites.ring is not None:
             # Anillos para Júpiter
-            ring_color = (200, 150, 100, 100)
-            ring_surface = pygame.Surface((size * 3, size // 4), pygame.SRCALPHA)
-            pygame.draw.ellipse(ring_surface, ring_color, ring_surface.get_rect())
-            self.surface.blit(ring_surface, (x - size * 1.5, y - size // 8))
-        
-        elif planet_type.value == "galaxy":
-            # Efecto espiral para galaxias (simplificado)
-            for angle in range(0, 360, 30):
-                spiral_x = x + math.cos(math.radians(angle)) * (size * 0.7)
-                spiral_y = y + math.sin(math.radians(angle)) * (size * 0.3)
-                pygame.draw.circle(self.surface, (255, 255, 255, 150), (int(spiral_x), int(spiral_y)), 3)
+            self.surface.blit(sprites.ring, (x - snapshot.size * 1.5, y - snapshot.size // 8))
+        
+        # Efecto espiral para galaxias (simplificado)
+        for offset_x, offset_y in snapshot.spiral_offsets:
+            pygame.draw.circle(self.surface, (255, 255, 255, 150), (x + offset_x, y + offset_y), 3)
     
-    def _render_planet_name(self, planet: Planet, x: int, y: int):
+    def _blit_label(self, background: pygame.Surface, text: pygame.Surface, x: int, y: int):
+        """Dibuja una etiqueta centrada con su fondo semi-transparente"""
+        self.surface.blit(background, (x - background.get_width() // 2, y - background.get_height() // 2))
+        self.surface.blit(text, (x - text.get_width() // 2, y - text.get_height() // 2))
+    
+    def _get_sprites(self, snapshot: PlanetRenderSnapshot) -> '_PlanetSprites':
+        """Superficies cacheadas de un planeta; se regeneran al cambiar su vista"""
+        sprites = self._sprite_cache.get(snapshot.donor_name)
+        if sprites is None or sprites.snapshot is not snapshot:
+            sprites = self._build_sprites(snapshot)
+            if len(self._sprite_cache) >= self._sprite_cache_limit:
+                self._sprite_cache.clear()
+            self._sprite_cache[snapshot.donor_name] = sprites
+        return sprites
+    
+    def _build_sprites(self, snapshot: PlanetRenderSnapshot) -> '_PlanetSprites':
         """
-        Renderiza el nombre del donador - OPTIMIZADO para vertical
+        Prepara etiquetas y efectos de un planeta
         
         Mejoras para TikTok Live:
         - Fuente más pequeña para pantallas móviles
         - Fondo semi-transparente para legibilidad
-        - Centrado horizontal
-        """
-        font = pygame.font.Font(None, 22)  # Fuente más pequeña
-        text_surface = font.render(planet.donor_name, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(x, y))
-        
-        # Fondo semi-transparente para mejor legibilidad
-        bg_rect = text_rect.inflate(8, 4)
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 128))  # Negro semi-transparente
-        
-        self.surface.blit(bg_surface, bg_rect.topleft)
-        self.surface.blit(text_surface, text_rect)
-    
-    def _render_planet_value(self, planet: Planet, x: int, y: int):
-        """
-        Renderiza el valor total - OPTIMIZADO para vertical
-        
-        Mejoras para móvil:
-        - Formato más compacto
-        - Colores según valor (verde > amarillo > rojo)
         """
-        font = pygame.font.Font(None, 18)  # Fuente más pequeña
-        
-        # Color del texto según valor
-        if planet.total_value >= 1000:
-            color = (255, 215, 0)  # Dorado para valores altos
-        elif planet.total_value >= 100:
-            color = (144, 238, 144)  # Verde claro
-        else:
-            color = (200, 200, 200)  # Gris claro
-        
-        # Formato compacto del valor
-        if planet.total_value >= 1000:
-            value_text = f"{planet.total_value/1000:.1f}K"
-        else:
-            value_text = f"{planet.total_value}"
-        
-        text_surface = font.render(value_text, True, color)
-        text_rect = text_surface.get_rect(center=(x, y))
-        
-        # Fondo semi-transparente
-        bg_rect = text_rect.inflate(6, 3)
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 100))
-        
-        self.surface.blit(bg_surface, bg_rect.topleft)
-        self.surface.blit(text_surface, text_rect)
+        name_text = self.name_font.render(snapshot.name_label, True, (255, 255, 255))
+        name_background = pygame.Surface(name_text.get_rect().inflate(8, 4).size, pygame.SRCALPHA)
+        name_background.fill((0, 0, 0, 128))  # Negro semi-transparente
+        
+        value_text = self.value_font.render(snapshot.value_label, True, snapshot.value_color)
+        value_background = pygame.Surface(value_text.get_rect().inflate(6, 3).size, pygame.SRCALPHA)
+        value_background.fill((0, 0, 0, 100))
+        
+        # Efecto de brillo para estrellas
+        glows = []
+        for radius, color in snapshot.glow_layers:
+            glow_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(glow_surface, color, (radius, radius), radius)
+            glows.append((glow_surface, radius))
+        
+        ring = None
+        if snapshot.ring_size is not None:
+            ring = pygame.Surface(snapshot.ring_size, pygame.SRCALPHA)
+            pygame.draw.ellipse(ring, (200, 150, 100, 100), ring.get_rect())
+        
+        return _PlanetSprites(snapshot, name_text, name_background, value_text, value_background, glows, ring)
     
     def _render_background(self):
         """
@@ -269,7 +315,6 @@ class PlanetDisplay:
         Maneja eventos específicos del display de planetas
         
         Futuros controles:
-        - Click en planeta para ver detalles
         - Scroll para hacer zoom
         - Arrastrar para rotar vista
         """
@@ -278,13 +323,83 @@ class PlanetDisplay:
             # Verificar si se hizo click en algún planeta
             self._handle_planet_click(mouse_x, mouse_y)
     
+    def _planet_at(self, mouse_x: int, mouse_y: int) -> Optional[Planet]:
+        """Planeta visible bajo el cursor (círculo del planeta con 6 px de margen)"""
+        for i, planet in enumerate(self._visible_planets):
+            x, y = self._slot_position(i)
+            radius = planet.get_render_snapshot().size + 6
+            if (mouse_x - x) ** 2 + (mouse_y - y) ** 2 <= radius * radius:
+                return planet
+        return None
+    
     def _handle_planet_click(self, mouse_x: int, mouse_y: int):
         """
         Maneja clicks en planetas individuales
         
+        Un clic en un planeta pide sus detalles al ReadQueryService (sin
+        esperar a la base) y muestra el panel cuando el Future se resuelve;
+        un clic fuera de los planetas lo cierra.
+        
         Futuras acciones:
-        - Mostrar detalles del donador
         - Centrar planeta en vista
-        - Mostrar historial de donaciones
         """
-        pass
+        planet = self._planet_at(mouse_x, mouse_y)
+        if planet is None or self.query_service is None:
+            if self._details_surface is not None:
+                self._dirty = True
+            self._selected_donor = None
+            self._details_future = None
+            self._details_surface = None
+            return
+        
+        self._selected_donor = planet.donor_name
+        self._details_stale = False
+        self._details_future = self.query_service.planet_details(planet.donor_name)
+        if not self._details_future.done():
+            self._details_surface = self._build_details_panel([planet.donor_name, "Cargando..."])
+            self._dirty = True
+        self._poll_details()
+    
+    def _poll_details(self):
+        """Muestra los detalles cuando la consulta termina (llamado cada frame)"""
+        if self._details_stale and self._selected_donor is not None:
+            self._details_stale = False
+            self._details_future = self.query_service.planet_details(self._selected_donor)
+        future = self._details_future
+        if future is None or not future.done():
+            return
+        self._details_future = None
+        if future.cancelled() or future.exception() is not None:
+            lines = [self._selected_donor, "Error leyendo la base de datos"]
+        elif future.result() is None:
+            lines = [self._selected_donor, "Sin datos guardados todavía"]
+        else:
+            lines = self._details_lines(future.result())
+        self._details_surface = self._build_details_panel(lines)
+        self._dirty = True
+    
+    @staticmethod
+    def _details_lines(details: PlanetDetails) -> List[str]:
+        lines = [
+            details.donor_name,
+            f"#{details.rank} de {details.total_planets} | {details.total_value} coins",
+            f"{details.donation_count} donaciones",
+        ]
+        if details.first_seen is not None:
+            lines.append(f"Primera: {details.first_seen.strftime('%H:%M:%S')}")
+        if details.last_seen is not None:
+            lines.append(f"Última: {details.last_seen.strftime('%H:%M:%S')}")
+        top_gifts = sorted(details.gift_counts.items(), key=lambda item: item[1], reverse=True)[:3]
+        lines.extend(f"  {gift.replace('_', ' ')} x{count}" for gift, count in top_gifts)
+        return lines
+    
+    def _build_details_panel(self, lines: List[str]) -> pygame.Surface:
+        """Panel semi-transparente con una línea de texto por renglón"""
+        texts = [self.details_font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in texts) + 16
+        line_height = self.details_font.get_linesize()
+        panel = pygame.Surface((width, line_height * len(texts) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, text in enumerate(texts):
+            panel.blit(text, (8, 6 + i * line_height))
+        return panel
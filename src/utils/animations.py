@@ -2,6 +2,7 @@
 # Proporciona herramientas para crear transiciones y efectos suaves
 
 import math
+import random
 import pygame
 from typing import Tuple, Callable
 
@@ -231,8 +232,8 @@ class ParticleSystem:
                 break
             
             # Ángulo aleatorio
-            angle = math.radians(math.random() * 360)
-            speed = speed_range[0] + math.random() * (speed_range[1] - speed_range[0])
+            angle = math.radians(random.random() * 360)
+            speed = speed_range[0] + random.random() * (speed_range[1] - speed_range[0])
             
             velocity_x = math.cos(angle) * speed
             velocity_y = math.sin(angle) * speed
@@ -243,9 +244,9 @@ class ParticleSystem:
                 'vx': velocity_x,
                 'vy': velocity_y,
                 'life': 1.0,
-                'max_life': 1.0 + math.random() * 2.0,
+                'max_life': 1.0 + random.random() * 2.0,
                 'color': color,
-                'size': 2 + math.random() * 3
+                'size': 2 + random.random() * 3
             }
             self.particles.append(particle)
     
@@ -74,6 +74,85 @@ class ConfigManager:
                 "font_size_small": 16,
                 "panel_width": 400,
                 "enable_quick_buttons": True
+            },
+            "sources": {
+                "max_events_per_frame": 50,
+                "ingest_budget_ms": 4,
+                "enable_fake_sources": False,
+                "fake_rate_per_second": 5,
+                "youtube_coins_per_usd": 75,
+                "twitch_coins_per_bit": 0.75,
+                "platforms": {
+                    "tiktok": {"weight": 3, "rate_per_second": 30, "burst": 60},
+                    "youtube": {"weight": 2, "rate_per_second": 15, "burst": 30},
+                    "twitch": {"weight": 2, "rate_per_second": 15, "burst": 30}
+                }
+            },
+            "api": {
+                "enabled": False,
+                "host": "127.0.0.1",
+                "port": 8765,
+                "max_batch_size": 1000,
+                "weight": 2,
+                "rate_per_second": 0,
+                "token": ""
+            },
+            "state_sync": {
+                "enabled": False,
+                "host": "127.0.0.1",
+                "port": 8766,
+                "keyframe_interval_seconds": 5
+            },
+            "profiling": {
+                "enabled": False,
+                "window_frames": 600,
+                "export_interval_seconds": 10,
+                "export_path": None,
+                "save_to_database": False,
+                "output_dir": "profiles",
+                "cpu_profile_seconds": 10,
+                "slow_frames_to_dump": 20
+            },
+            "trends": {
+                "bucket_seconds": 1,
+                "windows_seconds": [60, 300],
+                "hot_donors": 3
+            },
+            "achievements": {
+                "enabled": True,
+                "streak_gap_seconds": 30,
+                "rules": None
+            },
+            "database": {
+                "path": "sessions.db",
+                "auto_backup": True,
+                "backup_interval_minutes": 30,
+                "max_backup_files": 10,
+                "backup_dir": "backups",
+                "backup_pages_per_step": 64,
+                "backup_step_sleep_ms": 10
+            },
+            "export": {
+                "directory": "exports",
+                "format": "jsonl",
+                "compress": False,
+                "chunk_size": 5000
+            },
+            "retention": {
+                "enabled": False,
+                "keep_days": 90,
+                "archive_dir": "archives",
+                "rows_per_step": 250,
+                "step_budget_ms": 4,
+                "idle_seconds": 10,
+                "vacuum_pages_per_step": 128
+            },
+            "journal": {
+                "enabled": True,
+                "directory": "journal",
+                "commit_interval_ms": 20,
+                "segment_mb": 16,
+                "snapshot_interval_seconds": 300
             }
         }
     
@@ -0,0 +1,236 @@
+# Frame Profiler - Instrumentación de tiempo por etapa del frame
+# Histogramas móviles con percentiles y exportación periódica a JSONL
+
+import bisect
+import datetime
+import heapq
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+def _build_bucket_edges(minimum_ms: float = 0.01, maximum_ms: float = 1000.0, ratio: float = 1.15) -> List[float]:
+    """Límites superiores geométricos de los buckets (resolución ~15%)"""
+    edges = []
+    edge = minimum_ms
+    while edge < maximum_ms:
+        edges.append(round(edge, 4))
+        edge *= ratio
+    edges.append(maximum_ms)
+    return edges
+
+BUCKET_EDGES_MS = _build_bucket_edges()
+
+class RollingHistogram:
+    """
+    Histograma de los últimos `window` valores en buckets geométricos
+    
+    Agregar un valor es O(1): se incrementa su bucket y se decrementa el
+    del valor que sale de la ventana. Los percentiles recorren los buckets
+    (O(número de buckets)) y retornan el límite superior del bucket.
+    """
+    
+    __slots__ = ("window", "counts", "ring", "max_ms")
+    
+    def __init__(self, window: int = 600):
+        self.window = window
+        self.counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.ring: deque = deque()
+        self.max_ms = 0.0
+    
+    def add(self, value_ms: float):
+        """Agrega una muestra en milisegundos"""
+        bucket = bisect.bisect_left(BUCKET_EDGES_MS, value_ms)
+        self.counts[bucket] += 1
+        self.ring.append(bucket)
+        if len(self.ring) > self.window:
+            self.counts[self.ring.popleft()] -= 1
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+    
+    def __len__(self) -> int:
+        return len(self.ring)
+    
+    def percentile(self, fraction: float) -> float:
+        """Percentil aproximado (límite superior del bucket) en ms"""
+        total = len(self.ring)
+        if total == 0:
+            return 0.0
+        rank = max(1, int(fraction * total + 0.999999))
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return BUCKET_EDGES_MS[bucket] if bucket < len(BUCKET_EDGES_MS) else round(self.max_ms, 3)
+        return BUCKET_EDGES_MS[-1]
+    
+    def summary(self) -> Dict:
+        """p50/p95/p99 de la ventana y máximo desde el último reset_max()"""
+        return {
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max_ms, 3)
+        }
+    
+    def reset_max(self):
+        """Reinicia el máximo (al inicio de cada intervalo de exportación)"""
+        self.max_ms = 0.0
+
+class _StageTimer:
+    """Context manager que acumula el tiempo de una etapa en el frame actual"""
+    
+    __slots__ = ("profiler", "name", "start")
+    
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000.0
+        current = self.profiler.current_stages
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+class _NullStage:
+    """Context manager vacío usado cuando el profiler está deshabilitado"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class FrameProfiler:
+    """
+    Mide cuánto del presupuesto de cada frame consume cada etapa
+    
+    Uso en el loop:
+        profiler.begin_frame()
+        with profiler.stage("events"):
+            ...
+        profiler.end_frame()
+    
+    Una etapa puede abrirse varias veces por frame (p. ej. "db"); los
+    tiempos se suman. Las etapas pueden anidarse, por lo que la suma de
+    etapas no necesariamente coincide con el total del frame.
+    
+    Deshabilitado, stage() retorna un context manager compartido y
+    begin/end_frame retornan de inmediato: sin asignaciones ni relojes.
+    """
+    
+    FRAME = "frame"
+    
+    def __init__(self, window_frames: int = 600, export_interval: float = 10.0,
+                 export_path: Optional[str] = None,
+                 export_callback: Optional[Callable[[Dict], None]] = None):
+        self.enabled = False
+        self.window_frames = window_frames
+        self.export_interval = export_interval
+        self.export_path = export_path
+        self.export_callback = export_callback
+        
+        self.histograms: Dict[str, RollingHistogram] = {}
+        self.current_stages: Dict[str, float] = {}
+        # Últimos frames con su desglose: (hora, total_ms, {etapa: ms})
+        self.recent_frames: deque = deque(maxlen=window_frames)
+        self.frames_in_interval = 0
+        self._frame_start = 0.0
+        self._next_export = 0.0
+    
+    def set_enabled(self, enabled: bool):
+        """Activa o desactiva la instrumentación"""
+        if enabled and not self.enabled:
+            self._next_export = time.monotonic() + self.export_interval
+        self.enabled = enabled
+        self.current_stages = {}
+        self._frame_start = time.perf_counter()
+    
+    def stage(self, name: str):
+        """Context manager que mide una etapa del frame actual"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+    
+    def begin_frame(self):
+        """Marca el inicio de un frame"""
+        if not self.enabled:
+            return
+        self.current_stages = {}
+        self._frame_start = time.perf_counter()
+    
+    def end_frame(self):
+        """Cierra el frame: registra total y etapas, y exporta si toca"""
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        self._histogram(self.FRAME).add(frame_ms)
+        for name, elapsed in self.current_stages.items():
+            self._histogram(name).add(elapsed)
+        self.recent_frames.append((time.time(), frame_ms, self.current_stages))
+        self.frames_in_interval += 1
+        
+        if self.export_interval > 0 and time.monotonic() >= self._next_export:
+            self.export()
+    
+    def _histogram(self, name: str) -> RollingHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram(self.window_frames)
+        return histogram
+    
+    def slowest_frames(self, count: int = 20) -> List[Dict]:
+        """Los `count` frames más lentos de la ventana con su desglose por etapa"""
+        slowest = heapq.nlargest(count, self.recent_frames, key=lambda frame: frame[1])
+        return [
+            {
+                "at": datetime.datetime.fromtimestamp(at).isoformat(timespec="milliseconds"),
+                "frame_ms": round(frame_ms, 3),
+                "stages": {name: round(elapsed, 3)
+                           for name, elapsed in sorted(stages.items(), key=lambda item: -item[1])}
+            }
+            for at, frame_ms, stages in slowest
+        ]
+    
+    def get_summary(self) -> Dict[str, Dict]:
+        """Percentiles por etapa ("frame" es el total)"""
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+    
+    def export(self) -> Dict:
+        """
+        Escribe un registro con los percentiles actuales
+        
+        Se agrega una línea al archivo JSONL (si hay export_path) y se
+        entrega el registro a export_callback (p. ej. la tabla
+        performance_metrics de la base de datos).
+        """
+        record = {
+            "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "frames": self.frames_in_interval,
+            "window_frames": self.window_frames,
+            "stages": self.get_summary()
+        }
+        
+        if self.export_path:
+            try:
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            except OSError as e:
+                print(f"Error exporting performance metrics: {e}")
+        if self.export_callback:
+            self.export_callback(record)
+        
+        for histogram in self.histograms.values():
+            histogram.reset_max()
+        self.frames_in_interval = 0
+        self._next_export = time.monotonic() + self.export_interval
+        return record
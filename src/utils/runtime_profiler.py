@@ -0,0 +1,174 @@
+# Runtime Profiler - Perfilado bajo demanda durante el live
+# cProfile por N segundos, diffs de tracemalloc y volcado de frames lentos
+
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Callable, Optional
+from .frame_profiler import FrameProfiler
+
+class RuntimeProfiler:
+    """
+    Herramientas de diagnóstico activadas por teclas sin detener el stream
+    
+    - toggle_cpu_profile(): cProfile del hilo de render durante N segundos
+    - take_allocation_snapshot(): snapshot de tracemalloc comparado con el anterior
+    - dump_slow_frames(): los frames más lentos recientes con su desglose
+    
+    El hilo de render solo activa/desactiva la captura; ordenar y escribir
+    los resultados (lo costoso) ocurre en un hilo aparte. Todos los
+    archivos llevan la fecha y hora en el nombre.
+    """
+    
+    def __init__(self, frame_profiler: FrameProfiler, output_dir: str = "profiles",
+                 profile_seconds: float = 10.0, slow_frames: int = 20, traceback_depth: int = 10):
+        self.frame_profiler = frame_profiler
+        self.output_dir = output_dir
+        self.profile_seconds = profile_seconds
+        self.slow_frames = slow_frames
+        self.traceback_depth = traceback_depth
+        
+        self._cpu_profile: Optional[cProfile.Profile] = None
+        self._cpu_profile_ends = 0.0
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracemalloc = False
+    
+    @property
+    def cpu_profiling(self) -> bool:
+        """Indica si hay un perfilado de CPU en curso"""
+        return self._cpu_profile is not None
+    
+    def toggle_cpu_profile(self):
+        """Inicia un perfilado de profile_seconds o detiene el que está en curso"""
+        if self._cpu_profile is not None:
+            self._stop_cpu_profile()
+            return
+        self._cpu_profile = cProfile.Profile()
+        self._cpu_profile_ends = time.monotonic() + self.profile_seconds
+        self._cpu_profile.enable()
+        print(f"CPU profiling started ({self.profile_seconds:g} s)")
+    
+    def update(self):
+        """Detiene el perfilado de CPU al vencer su duración (llamar cada frame)"""
+        if self._cpu_profile is not None and time.monotonic() >= self._cpu_profile_ends:
+            self._stop_cpu_profile()
+    
+    def _stop_cpu_profile(self, background: bool = True):
+        profile = self._cpu_profile
+        profile.disable()
+        self._cpu_profile = None
+        base_path = self._output_path("cpu_profile", "")
+        if background:
+            self._in_background(lambda: self._write_cpu_profile(profile, base_path))
+        else:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._write_cpu_profile(profile, base_path)
+    
+    def _write_cpu_profile(self, profile: cProfile.Profile, base_path: str):
+        """Guarda el perfil binario (.prof) y un resumen legible (.txt)"""
+        profile.dump_stats(base_path + ".prof")
+        buffer = io.StringIO()
+        stats = pstats.Stats(profile, stream=buffer)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(20)
+        with open(base_path + ".txt", "w", encoding="utf-8") as f:
+            f.write(buffer.getvalue())
+        print(f"CPU profile written to {base_path}.prof / .txt")
+    
+    def take_allocation_snapshot(self):
+        """
+        Toma un snapshot de memoria y lo compara con el anterior
+        
+        La primera vez inicia tracemalloc y solo guarda la línea base;
+        mientras está activo tracemalloc agrega costo a cada asignación.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_depth)
+            self._started_tracemalloc = True
+            self._last_snapshot = tracemalloc.take_snapshot()
+            print("tracemalloc started, baseline snapshot taken")
+            return
+        
+        snapshot = tracemalloc.take_snapshot()
+        previous, self._last_snapshot = self._last_snapshot, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        path = self._output_path("alloc_diff", ".txt")
+        self._in_background(lambda: self._write_allocation_diff(snapshot, previous, current, peak, path))
+    
+    def stop_allocation_tracking(self):
+        """Detiene tracemalloc si lo inició este profiler"""
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracemalloc = False
+        self._last_snapshot = None
+    
+    def _write_allocation_diff(self, snapshot: tracemalloc.Snapshot, previous: Optional[tracemalloc.Snapshot],
+                               current: int, peak: int, path: str):
+        """Escribe el diff por línea y el top actual de asignaciones"""
+        lines = [f"traced memory: current={current / 1024:.1f} KB peak={peak / 1024:.1f} KB", ""]
+        if previous is not None:
+            lines.append("Top growth since previous snapshot:")
+            for stat in snapshot.compare_to(previous, "lineno")[:30]:
+                lines.append(f"  {stat}")
+            lines.append("")
+        lines.append("Top allocations:")
+        for stat in snapshot.statistics("lineno")[:20]:
+            lines.append(f"  {stat}")
+        largest = snapshot.statistics("traceback")[:1]
+        if largest:
+            lines.append("")
+            lines.append("Largest allocation traceback:")
+            lines.extend(f"  {line}" for line in largest[0].traceback.format())
+        
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Allocation diff written to {path}")
+    
+    def dump_slow_frames(self):
+        """Guarda los frames más lentos de la ventana del FrameProfiler"""
+        if not self.frame_profiler.enabled:
+            # Sin instrumentación no hay desglose: activarla para el próximo volcado
+            self.frame_profiler.set_enabled(True)
+            print("Frame instrumentation enabled; dump again once frames are collected")
+            return
+        
+        record = {
+            "dumped_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "window_frames": len(self.frame_profiler.recent_frames),
+            "summary": self.frame_profiler.get_summary(),
+            "slowest": self.frame_profiler.slowest_frames(self.slow_frames)
+        }
+        path = self._output_path("slow_frames", ".json")
+        self._in_background(lambda: self._write_json(record, path))
+    
+    def _write_json(self, record: dict, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        print(f"Slow frames written to {path}")
+    
+    def close(self):
+        """Cierra capturas en curso al salir (el perfil pendiente se escribe aquí mismo)"""
+        if self._cpu_profile is not None:
+            self._stop_cpu_profile(background=False)
+        self.stop_allocation_tracking()
+    
+    def _output_path(self, prefix: str, extension: str) -> str:
+        """Ruta con fecha y hora para un archivo de resultados"""
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return os.path.join(self.output_dir, f"{prefix}_{stamp}{extension}")
+    
+    def _in_background(self, task: Callable[[], None]):
+        """Ejecuta la escritura fuera del hilo de render"""
+        def run():
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                task()
+            except Exception as e:
+                print(f"Error writing profiling results: {e}")
+        threading.Thread(target=run, name="profiler-writer", daemon=True).start()
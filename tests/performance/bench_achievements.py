@@ -0,0 +1,67 @@
+# Achievements Benchmarks - Motor de logros con miles de reglas
+# Costo por donación de las tablas compiladas frente a evaluar cada regla
+
+import random
+
+from bench_utils import BenchmarkContext, benchmark, generate_donation_stream, generate_donor_names, measure
+
+from src.core.achievements import AchievementEngine, AchievementRule
+
+def _generate_rules(count: int, seed: int):
+    """Reglas aleatorias repartidas entre todas las métricas"""
+    rng = random.Random(seed)
+    metrics = AchievementRule.DONOR_METRICS + AchievementRule.SESSION_METRICS
+    return [AchievementRule(f"rule_{index}", f"Rule {index}", rng.choice(metrics), rng.randrange(1, 100000))
+            for index in range(count)]
+
+def _donation_events(ctx: BenchmarkContext):
+    """Donaciones como (donador, total anterior, total nuevo, hora) a 100 por segundo"""
+    donors = generate_donor_names(ctx.scale(5000, 1000), ctx.seed)
+    totals = {}
+    events = []
+    for index, (donor, _gift, value) in enumerate(generate_donation_stream(ctx.scale(20000, 3000), donors, ctx.seed)):
+        old = totals.get(donor, 0)
+        totals[donor] = old + (value or 1)
+        events.append((donor, old, totals[donor], index * 0.01))
+    return events
+
+def _per_donation(result: dict, count: int) -> dict:
+    """Normaliza un resultado de measure() a ms por donación"""
+    for key in ("median", "min", "p95", "mean"):
+        result[key] = round(result[key] / count, 6)
+    result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+    result["unit"] = "ms/donation"
+    return result
+
+def _engine_benchmark(ctx: BenchmarkContext, rule_count: int):
+    rules = _generate_rules(rule_count, ctx.seed)
+    events = _donation_events(ctx)
+    engine = AchievementEngine(rules)
+    
+    def run():
+        for donor, old, new, at in events:
+            engine.on_donation(donor, old, new, at)
+    
+    result = _per_donation(measure(run, repeat=ctx.scale(5, 3), setup=engine.reset), len(events))
+    result["unlocked_per_run"] = engine.unlocked_count
+    return result
+
+@benchmark("achievements.on_donation[rules=1000]")
+def bench_achievements_1000(ctx: BenchmarkContext):
+    return _engine_benchmark(ctx, 1000)
+
+@benchmark("achievements.on_donation[rules=10000]")
+def bench_achievements_10000(ctx: BenchmarkContext):
+    return _engine_benchmark(ctx, ctx.scale(10000, 3000))
+
+@benchmark("achievements.naive_scan[rules=1000]")
+def bench_achievements_naive(ctx: BenchmarkContext):
+    # Referencia: comparar cada regla en cada donación (como si todas fueran de coins)
+    rules = _generate_rules(1000, ctx.seed)
+    events = _donation_events(ctx)[:ctx.scale(2000, 300)]
+    
+    def run():
+        for _donor, old, new, _at in events:
+            [rule for rule in rules if old < rule.threshold <= new]
+    
+    return _per_donation(measure(run, repeat=ctx.scale(5, 3)), len(events))
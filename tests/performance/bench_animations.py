@@ -0,0 +1,35 @@
+# Animation Benchmarks - Costo de actualización de Animator y ParticleSystem
+# Mide update() con cientos de animaciones y partículas activas
+
+from bench_utils import BenchmarkContext, benchmark, init_headless_pygame, measure
+
+@benchmark("animator.update[animations=500]", group="animations")
+def bench_animator_update(ctx: BenchmarkContext):
+    init_headless_pygame()
+    from src.utils.animations import Animator, AnimationEasing
+    
+    animator = Animator()
+    
+    def setup():
+        animator.clear_animations()
+        for index in range(500):
+            animator.animate_value(0, 100, duration=10_000 + index, easing=AnimationEasing.ease_out_cubic)
+            animator.animate_position((0, 0), (100, 100), duration=10_000 + index)
+    
+    return measure(lambda: animator.update(16), repeat=ctx.scale(7, 3),
+                   number=ctx.scale(100, 20), setup=setup)
+
+@benchmark("particle_system.update[particles=1000]", group="animations")
+def bench_particle_update(ctx: BenchmarkContext):
+    init_headless_pygame()
+    from src.utils.animations import ParticleSystem
+    
+    particles = ParticleSystem(max_particles=1000)
+    
+    def setup():
+        particles.clear()
+        particles.emit_burst((360, 460), 1000)
+    
+    # Con 16 ms por frame las partículas viven ~60 frames
+    return measure(lambda: particles.update(0.016), repeat=ctx.scale(7, 3),
+                   number=ctx.scale(30, 10), setup=setup)
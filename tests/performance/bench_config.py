@@ -0,0 +1,21 @@
+# Config Benchmarks - Costo de acceso a la configuración
+# ConfigManager.get se llama desde caminos calientes (por frame/por evento)
+
+from bench_utils import BenchmarkContext, benchmark, measure
+
+from src.utils.config import config_manager
+
+@benchmark("config.get[shallow]", group="config")
+def bench_config_get_shallow(ctx: BenchmarkContext):
+    return measure(lambda: config_manager.get("display"), repeat=ctx.scale(7, 3),
+                   number=ctx.scale(100_000, 10_000))
+
+@benchmark("config.get[nested]", group="config")
+def bench_config_get_nested(ctx: BenchmarkContext):
+    return measure(lambda: config_manager.get("sources.platforms.tiktok.weight"),
+                   repeat=ctx.scale(7, 3), number=ctx.scale(100_000, 10_000))
+
+@benchmark("config.get[missing]", group="config")
+def bench_config_get_missing(ctx: BenchmarkContext):
+    return measure(lambda: config_manager.get("display.not_a_key", 0),
+                   repeat=ctx.scale(7, 3), number=ctx.scale(100_000, 10_000))
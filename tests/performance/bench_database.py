@@ -0,0 +1,546 @@
+# Database Benchmarks - Latencia de guardado y carga en SQLite
+# Mide guardado, carga, importación, exportación, migración, historial, compactación, detalles y snapshots
+
+import csv
+import datetime
+import os
+import sqlite3
+import shutil
+import tempfile
+
+from bench_utils import BenchmarkContext, benchmark, generate_donation_stream, generate_donor_names, measure
+
+from src.core.donation_importer import DonationImporter
+from src.core.planet_snapshot import PlanetSnapshot, snapshot_path
+from src.core.planet_system import PlanetSystem
+from src.core.session_manager import SessionManager
+from src.database.backup_scheduler import BackupScheduler
+from src.database.donation_journal import DonationJournal
+from src.database.query_service import ReadQueryService
+from src.database.database_manager import DatabaseManager
+from src.database.schema import to_epoch_us
+from src.database.session_compactor import SessionCompactor
+from src.database.session_exporter import SessionExporter
+from src.models.donation import Donation
+from src.models.planet import PlanetType
+
+START_US = to_epoch_us(datetime.datetime(2025, 8, 1, 20, 0))
+
+class _TempDatabase:
+    """Base de datos temporal que se elimina al salir"""
+    
+    def __enter__(self) -> DatabaseManager:
+        self.directory = tempfile.mkdtemp(prefix="planets_bench_")
+        self.db_manager = DatabaseManager(os.path.join(self.directory, "bench.db"))
+        self.db_manager.initialize_session_database("bench_session")
+        return self.db_manager
+    
+    def __exit__(self, *exc):
+        self.db_manager.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+@benchmark("database.save_donation", group="database")
+def bench_save_donation(ctx: BenchmarkContext):
+    with _TempDatabase() as db_manager:
+        donation = Donation("bench_donor", "rose")
+        return measure(lambda: db_manager.save_donation(donation),
+                       repeat=ctx.scale(200, 30))
+
+@benchmark("database.save_planet", group="database")
+def bench_save_planet(ctx: BenchmarkContext):
+    with _TempDatabase() as db_manager:
+        planet_system = PlanetSystem()
+        planet = planet_system.add_donation("bench_donor", "rose", 1)
+        return measure(lambda: db_manager.save_planet(planet),
+                       repeat=ctx.scale(200, 30))
+
+@benchmark("database.save_donation[during_backup]", group="database")
+def bench_save_donation_during_backup(ctx: BenchmarkContext):
+    """Latencia del escritor de la sesión mientras corre un backup por pasos"""
+    with _TempDatabase() as db_manager:
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        stream = generate_donation_stream(ctx.scale(200000, 20000), donors, ctx.seed)
+        db_manager.bulk_import_donations([[(donor, gift, value, START_US) for donor, gift, value in stream]])
+        
+        scheduler = BackupScheduler(db_manager.db_path, os.path.join(os.path.dirname(db_manager.db_path), "backups"),
+                                    pages_per_step=16, step_sleep_ms=5)
+        scheduler.start_backup()
+        donation = Donation("bench_donor", "rose")
+        try:
+            return measure(lambda: db_manager.save_donation(donation), repeat=ctx.scale(200, 30))
+        finally:
+            scheduler.stop()
+
+@benchmark("database.load_session_planets", group="database")
+def bench_load_session_planets(ctx: BenchmarkContext):
+    with _TempDatabase() as db_manager:
+        donors = generate_donor_names(ctx.scale(500, 100), ctx.seed)
+        planet_system = PlanetSystem()
+        for donor, gift, value in generate_donation_stream(ctx.scale(5000, 1000), donors, ctx.seed):
+            planet = planet_system.add_donation(donor, gift, value)
+            db_manager.save_donation(planet.donations_history[-1])
+        for planet in planet_system.planets:
+            db_manager.save_planet(planet)
+        
+        return measure(db_manager.load_session_planets, repeat=ctx.scale(7, 3))
+
+
+@benchmark("database.import_donation_log[rows=100000]", group="database")
+def bench_import_donation_log(ctx: BenchmarkContext):
+    """Importación de un CSV completo (parseo, PlanetSystem y base), en ms por fila"""
+    rows = ctx.scale(100000, 10000)
+    with _TempDatabase() as db_manager:
+        path = db_manager.db_path + ".csv"
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        with open(path, "w", newline="", encoding="utf-8") as log_file:
+            writer = csv.writer(log_file)
+            writer.writerow(["donor_name", "gift_type", "value"])
+            writer.writerows(generate_donation_stream(rows, donors, ctx.seed))
+        
+        sessions = iter(range(1000))
+        importer = DonationImporter(PlanetSystem(), db_manager)
+        
+        def setup():
+            # Sesión y planetas nuevos en cada repetición
+            db_manager.initialize_session_database(f"import_{next(sessions)}")
+            importer.planet_system = PlanetSystem()
+        
+        result = measure(lambda: importer.import_file(path), repeat=ctx.scale(3, 2), setup=setup)
+        for key in ("median", "min", "p95", "mean"):
+            result[key] = round(result[key] / rows, 6)
+        result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+        result["unit"] = "ms/row"
+        return result
+
+
+def _export_benchmark(ctx: BenchmarkContext, file_format: str, extension: str):
+    """Exportación de las donaciones de una sesión, en ms por fila"""
+    rows = ctx.scale(100000, 10000)
+    with _TempDatabase() as db_manager:
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        stream = list(generate_donation_stream(rows, donors, ctx.seed))
+        db_manager.bulk_import_donations([[(donor, gift, value, START_US + index * 1000)
+                                           for index, (donor, gift, value) in enumerate(stream)]])
+        
+        exporter = SessionExporter(db_manager.db_path, "bench_session")
+        path = db_manager.db_path + extension
+        result = measure(lambda: exporter.export("donations", path, file_format), repeat=ctx.scale(3, 2))
+        for key in ("median", "min", "p95", "mean"):
+            result[key] = round(result[key] / rows, 6)
+        result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+        result["unit"] = "ms/row"
+        return result
+
+@benchmark("database.export_session[csv,rows=100000]", group="database")
+def bench_export_csv(ctx: BenchmarkContext):
+    return _export_benchmark(ctx, "csv", ".csv")
+
+@benchmark("database.export_session[jsonl.gz,rows=100000]", group="database")
+def bench_export_jsonl_gzip(ctx: BenchmarkContext):
+    return _export_benchmark(ctx, "jsonl", ".jsonl.gz")
+
+@benchmark("database.export_session[npz,rows=100000]", group="database")
+def bench_export_npz(ctx: BenchmarkContext):
+    return _export_benchmark(ctx, "npz", ".npz")
+
+
+# Esquema de texto anterior a la versión 2 (para medir migración y lecturas "antes")
+_LEGACY_SCHEMA = """
+    CREATE TABLE planets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, donor_name TEXT NOT NULL,
+        total_value INTEGER NOT NULL, planet_type TEXT NOT NULL, created_at TEXT NOT NULL,
+        last_updated TEXT NOT NULL, position_x INTEGER DEFAULT 0, position_y INTEGER DEFAULT 0,
+        UNIQUE(session_id, donor_name));
+    CREATE TABLE donations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, donor_name TEXT NOT NULL,
+        gift_type TEXT NOT NULL, value INTEGER NOT NULL, timestamp TEXT NOT NULL);
+    CREATE INDEX idx_donations_session_time ON donations (session_id, timestamp);
+"""
+
+def _build_legacy_database(path: str, ctx: BenchmarkContext, rows: int):
+    """Base con el esquema de texto: una sesión con `rows` donaciones y sus planetas"""
+    donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+    start = datetime.datetime(2025, 8, 1, 20, 0)
+    totals = {}
+    connection = sqlite3.connect(path)
+    connection.executescript(_LEGACY_SCHEMA)
+    with connection:
+        donations = []
+        for index, (donor, gift, value) in enumerate(generate_donation_stream(rows, donors, ctx.seed)):
+            timestamp = (start + datetime.timedelta(milliseconds=index)).isoformat()
+            donations.append(("session_20250801_200000", donor, gift, value, timestamp))
+            totals[donor] = totals.get(donor, 0) + value
+        connection.executemany("INSERT INTO donations (session_id, donor_name, gift_type, value, timestamp) "
+                               "VALUES (?, ?, ?, ?, ?)", donations)
+        # Todos los tipos reales, para que la migración recorra cada valor de planet_type
+        planet_types = [planet_type.value for planet_type in PlanetType]
+        connection.executemany("INSERT INTO planets (session_id, donor_name, total_value, planet_type, created_at, "
+                               "last_updated) VALUES (?, ?, ?, ?, ?, ?)",
+                               [("session_20250801_200000", donor, total, planet_types[index % len(planet_types)],
+                                 start.isoformat(), start.isoformat())
+                                for index, (donor, total) in enumerate(totals.items())])
+    connection.close()
+
+def _per_row(result: dict, rows: int) -> dict:
+    for key in ("median", "min", "p95", "mean"):
+        result[key] = round(result[key] / rows, 6)
+    result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+    result["unit"] = "ms/row"
+    return result
+
+@benchmark("database.migrate_schema_v1[rows=200000]", group="database")
+def bench_migrate_schema(ctx: BenchmarkContext):
+    """Migración en el lugar al esquema normalizado (incluye VACUUM), en ms por donación"""
+    rows = ctx.scale(200000, 20000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    path = os.path.join(directory, "legacy.db")
+    sizes = {}
+    
+    def setup():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        _build_legacy_database(path, ctx, rows)
+        sizes["before"] = os.path.getsize(path)
+    
+    try:
+        result = _per_row(measure(lambda: DatabaseManager.upgrade_schema(path), repeat=ctx.scale(3, 2), setup=setup), rows)
+        result["size_before_mb"] = round(sizes["before"] / 1e6, 2)
+        result["size_after_mb"] = round(os.path.getsize(path) / 1e6, 2)
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _legacy_scan(connection: sqlite3.Connection, session_id: str, chunk_size: int = 1000) -> int:
+    """Lectura por páginas del esquema de texto, como iter_session_donations antes de la v2"""
+    last_key = ("", -1)
+    count = 0
+    while True:
+        rows = connection.execute("""
+            SELECT id, donor_name, gift_type, value, timestamp FROM donations
+            WHERE session_id = ? AND (timestamp, id) > (?, ?)
+            ORDER BY timestamp ASC, id ASC
+            LIMIT ?
+        """, (session_id, last_key[0], last_key[1], chunk_size)).fetchall()
+        for row in rows:
+            donation = Donation(row[1], row[2], row[3])
+            donation.timestamp = datetime.datetime.fromisoformat(row[4])
+            count += 1
+        if len(rows) < chunk_size:
+            return count
+        last_key = (rows[-1][4], rows[-1][0])
+
+@benchmark("database.scan_session[schema=v1,rows=200000]", group="database")
+def bench_scan_session_legacy(ctx: BenchmarkContext):
+    rows = ctx.scale(200000, 20000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        path = os.path.join(directory, "legacy.db")
+        _build_legacy_database(path, ctx, rows)
+        connection = sqlite3.connect(path)
+        result = measure(lambda: _legacy_scan(connection, "session_20250801_200000"), repeat=ctx.scale(3, 2))
+        connection.close()
+        return _per_row(result, rows)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+@benchmark("database.scan_session[schema=v2,rows=200000]", group="database")
+def bench_scan_session(ctx: BenchmarkContext):
+    rows = ctx.scale(200000, 20000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        path = os.path.join(directory, "legacy.db")
+        _build_legacy_database(path, ctx, rows)
+        db_manager = DatabaseManager(path)
+        db_manager.initialize_session_database("session_20250801_200000")
+        
+        def scan():
+            for _ in db_manager.iter_session_donations("session_20250801_200000"):
+                pass
+        
+        result = measure(scan, repeat=ctx.scale(3, 2))
+        db_manager.close()
+        return _per_row(result, rows)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+HISTORY_SESSIONS = 730  # Dos años de un live por día
+
+def _history_benchmark(ctx: BenchmarkContext, query) -> dict:
+    """Mide query(db_manager) sobre una base con HISTORY_SESSIONS sesiones de dos horas"""
+    sessions = ctx.scale(HISTORY_SESSIONS, 60)
+    rows = ctx.scale(500, 200)
+    donors = generate_donor_names(ctx.scale(5000, 500), ctx.seed)
+    stream = list(generate_donation_stream(rows, donors, ctx.seed))
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        db_manager = DatabaseManager(os.path.join(directory, "history.db"))
+        for day in range(sessions):
+            db_manager.initialize_session_database(f"session_{day:04d}")
+            start = START_US + day * 86_400_000_000
+            step = 7_200_000_000 // rows
+            db_manager.bulk_import_donations([[(donor, gift, value, start + index * step)
+                                               for index, (donor, gift, value) in enumerate(stream)]])
+        result = measure(lambda: query(db_manager), repeat=ctx.scale(20, 5))
+        db_manager.close()
+        result["sessions"] = sessions
+        result["rows"] = sessions * rows
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _history_scan(db_manager: DatabaseManager):
+    """Historial calculado desde donations (sin la tabla sessions materializada)"""
+    db_manager.connection.execute("""
+        SELECT sessions.name, MIN(timestamp_us), MAX(timestamp_us), COUNT(*), SUM(value), COUNT(DISTINCT donor_id)
+        FROM donations JOIN sessions ON sessions.id = donations.session_id
+        GROUP BY donations.session_id ORDER BY MIN(timestamp_us) DESC LIMIT 50
+    """).fetchall()
+
+def _chart_scan(db_manager: DatabaseManager):
+    """Donaciones por intervalo de 5 minutos calculadas desde donations"""
+    db_manager.connection.execute("""
+        SELECT timestamp_us / 300000000, COUNT(*), SUM(value) FROM donations
+        WHERE session_id = ? GROUP BY 1 ORDER BY 1
+    """, (db_manager._session_key,)).fetchall()
+
+@benchmark("database.session_history[sessions=730]", group="database")
+def bench_session_history(ctx: BenchmarkContext):
+    return _history_benchmark(ctx, lambda db_manager: db_manager.get_session_history(50))
+
+@benchmark("database.session_history[scan_donations]", group="database")
+def bench_session_history_scan(ctx: BenchmarkContext):
+    return _history_benchmark(ctx, _history_scan)
+
+@benchmark("database.session_chart[bucket=5min]", group="database")
+def bench_session_chart(ctx: BenchmarkContext):
+    return _history_benchmark(ctx, lambda db_manager: db_manager.get_session_rollup(
+        db_manager.current_session_id, bucket_minutes=5))
+
+@benchmark("database.session_chart[scan_donations]", group="database")
+def bench_session_chart_scan(ctx: BenchmarkContext):
+    return _history_benchmark(ctx, _chart_scan)
+
+@benchmark("database.open_session[sessions=730]", group="database")
+def bench_open_session(ctx: BenchmarkContext):
+    """Abrir una sesión nueva con dos años de historial en la base (debe ser plano)"""
+    opened = iter(range(1_000_000))
+    return _history_benchmark(ctx, lambda db_manager: db_manager.initialize_session_database(
+        f"session_new_{next(opened)}"))
+
+@benchmark("database.compaction_step[rows=250]", group="database")
+def bench_compaction_step(ctx: BenchmarkContext):
+    """Un paso de SessionCompactor (resumen, archivo .jsonl.gz y borrado de 250 donaciones)"""
+    rows = ctx.scale(200000, 20000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        db_manager = DatabaseManager(os.path.join(directory, "bench.db"))
+        db_manager.initialize_session_database("session_20250801_200000")
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        stream = generate_donation_stream(rows, donors, ctx.seed)
+        db_manager.bulk_import_donations([[(donor, gift, value, START_US + index * 10_000)
+                                           for index, (donor, gift, value) in enumerate(stream)]])
+        db_manager.initialize_session_database("bench_session")
+        size_before = os.path.getsize(db_manager.db_path)
+        
+        compactor = SessionCompactor(db_manager, retention_days=30, archive_dir=os.path.join(directory, "archives"),
+                                     rows_per_step=250)
+        result = measure(compactor.step, repeat=ctx.scale(200, 30))
+        compactor.run()
+        db_manager.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        result["size_before_mb"] = round(size_before / 1e6, 2)
+        result["size_after_mb"] = round(os.path.getsize(db_manager.db_path) / 1e6, 2)
+        db_manager.close()
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _details_benchmark(ctx: BenchmarkContext, measure_service) -> dict:
+    """Sesión de 200k donaciones con un donador de 20k; measure_service(service, donor) mide"""
+    rows = ctx.scale(200000, 20000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        db_manager = DatabaseManager(os.path.join(directory, "bench.db"))
+        db_manager.initialize_session_database("bench_session")
+        planet_system = PlanetSystem()
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        whale = donors[0]
+        batch = planet_system.begin_batch(keep_history=False)
+        chunk = []
+        for index, (donor, gift, value) in enumerate(generate_donation_stream(rows, donors, ctx.seed)):
+            donor = whale if index % 10 == 0 else donor
+            batch.add(donor, gift, value, None)
+            chunk.append((donor, gift, value, START_US + index * 10_000))
+        db_manager.bulk_import_donations([chunk], planets=batch.finish)
+        batch.finish()
+        
+        service = ReadQueryService(db_manager.db_path, "bench_session")
+        try:
+            result = measure_service(service, whale)
+        finally:
+            service.close()
+            db_manager.close()
+        result["donor_donations"] = rows // 10
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+@benchmark("database.planet_details[query,donations=20000]", group="database")
+def bench_planet_details_query(ctx: BenchmarkContext):
+    """Consulta completa en el hilo de lectura (ranking e historial de un donador grande)"""
+    return _details_benchmark(ctx, lambda service, donor: measure(
+        lambda: service.planet_details(donor).result(), repeat=ctx.scale(10, 3),
+        setup=lambda: service.invalidate(donor)))
+
+@benchmark("database.planet_details[ui_request]", group="database")
+def bench_planet_details_request(ctx: BenchmarkContext):
+    """Costo en el hilo de render: pedir los detalles sin cache y revisar el Future"""
+    def request(service: ReadQueryService, donor: str):
+        future = service.planet_details(donor)
+        future.done()
+        return future
+    
+    def run(service: ReadQueryService, donor: str) -> dict:
+        pending = []
+        result = measure(lambda: pending.append(request(service, donor)), repeat=ctx.scale(20, 5),
+                         setup=lambda: service.invalidate(donor))
+        for future in pending:
+            future.result()
+        return result
+    
+    return _details_benchmark(ctx, run)
+
+@benchmark("database.save_donation[journal]", group="database")
+def bench_save_donation_journal(ctx: BenchmarkContext):
+    """Donación en vivo con journal: append al buffer y commit sin fsync (synchronous=NORMAL)"""
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    try:
+        session_manager = SessionManager(os.path.join(directory, "bench.db"),
+                                         journal_dir=os.path.join(directory, "journal"))
+        donation = Donation("bench_donor", "rose")
+        try:
+            return measure(lambda: session_manager.db_manager.save_donation(
+                donation, session_manager.journal_donation(donation)), repeat=ctx.scale(200, 30))
+        finally:
+            session_manager.close_session()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+@benchmark("database.journal_append", group="database")
+def bench_journal_append(ctx: BenchmarkContext):
+    """Costo de DonationJournal.append en el hilo principal (el fsync va en el hilo del journal)"""
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    journal = DonationJournal(directory, "bench_session")
+    try:
+        result = measure(lambda: journal.append("bench_donor", "rose", 1, START_US),
+                         repeat=ctx.scale(50, 10), number=1000)
+        journal.sync()
+        result["commits"] = journal.commits
+        result["records_per_commit"] = round(journal.records_written / max(1, journal.commits), 1)
+        return result
+    finally:
+        journal.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+def _recovery_benchmark(ctx: BenchmarkContext, with_snapshot: bool) -> dict:
+    """
+    Arranque tras un corte: sesión de 100k donaciones en la base y 10k
+    más solo en el journal; mide retomar la sesión, reconstruir los
+    planetas (desde cero o desde un snapshot al final de lo guardado) y
+    reaplicar la cola
+    """
+    rows = ctx.scale(100000, 10000)
+    tail = rows // 10
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    seed_dir = os.path.join(directory, "seed")
+    work_dir = os.path.join(directory, "work")
+    os.makedirs(seed_dir)
+    try:
+        session_manager = SessionManager(os.path.join(seed_dir, "bench.db"), journal_dir=os.path.join(seed_dir, "journal"))
+        donors = generate_donor_names(ctx.scale(10000, 1000), ctx.seed)
+        stream = list(generate_donation_stream(rows + tail, donors, ctx.seed))
+        saved = []
+        for index, (donor, gift, value) in enumerate(stream[:rows]):
+            seq = session_manager.journal.append(donor, gift, value, START_US + index * 10_000)
+            saved.append((donor, gift, value, START_US + index * 10_000))
+        session_manager.db_manager.bulk_import_donations([saved], journal_seq=seq)
+        if with_snapshot:
+            planet_system = PlanetSystem()
+            for donor, gift, value, timestamp_us in saved:
+                planet_system.add_donation(donor, gift, value, datetime.datetime.fromtimestamp(timestamp_us / 1_000_000))
+            PlanetSnapshot.capture(planet_system, session_manager.session_id, session_manager.db_manager.last_donation_id,
+                                   seq).write(snapshot_path(session_manager.journal_dir, session_manager.session_id))
+        for index, (donor, gift, value) in enumerate(stream[rows:], rows):
+            session_manager.journal.append(donor, gift, value, START_US + index * 10_000)
+        # Corte: la base queda cerrada sin borrar el journal
+        session_manager.journal.close()
+        session_manager.db_manager.close()
+        
+        def restore_crashed_state():
+            shutil.rmtree(work_dir, ignore_errors=True)
+            shutil.copytree(seed_dir, work_dir)
+        
+        def recover():
+            recovered = SessionManager(os.path.join(work_dir, "bench.db"), journal_dir=os.path.join(work_dir, "journal"))
+            recovered.recover(PlanetSystem())
+            recovered.close_session()
+        
+        result = measure(recover, repeat=ctx.scale(5, 3), setup=restore_crashed_state)
+        result["saved_donations"] = rows
+        result["journal_tail"] = tail
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+@benchmark("database.journal_recovery[donations=100000]", group="database")
+def bench_journal_recovery(ctx: BenchmarkContext):
+    return _recovery_benchmark(ctx, with_snapshot=False)
+
+@benchmark("database.journal_recovery[snapshot,donations=100000]", group="database")
+def bench_journal_recovery_snapshot(ctx: BenchmarkContext):
+    return _recovery_benchmark(ctx, with_snapshot=True)
+
+def _snapshot_system(ctx: BenchmarkContext, donors: int) -> PlanetSystem:
+    """PlanetSystem con un planeta por donador y una segunda donación para la décima parte"""
+    planet_system = PlanetSystem()
+    names = generate_donor_names(donors, ctx.seed)
+    stream = generate_donation_stream(donors, names, ctx.seed)
+    for name, (_, gift, value) in zip(names, stream):
+        planet_system.add_donation(name, gift, value)
+    for name, (_, gift, value) in zip(names[::10], generate_donation_stream(donors // 10, names, ctx.seed + 1)):
+        planet_system.add_donation(name, gift, value)
+    return planet_system
+
+@benchmark("database.planet_snapshot_write[donors=100000]", group="database")
+def bench_planet_snapshot_write(ctx: BenchmarkContext):
+    """Captura (hilo principal) y escritura atómica con fsync (hilo de fondo) de un snapshot"""
+    donors = ctx.scale(100000, 10000)
+    planet_system = _snapshot_system(ctx, donors)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    path = os.path.join(directory, "bench.snap")
+    try:
+        snapshots = []
+        capture = measure(lambda: snapshots.append(PlanetSnapshot.capture(planet_system, "bench_session")),
+                          repeat=ctx.scale(7, 3))
+        written = []
+        result = measure(lambda: written.append(snapshots[-1].write(path)), repeat=ctx.scale(7, 3))
+        result["capture_ms"] = capture["median"]
+        result["snapshot_bytes"] = written[-1]
+        result["bytes_per_planet"] = round(written[-1] / len(planet_system.planets), 1)
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+@benchmark("database.planet_snapshot_restore[donors=100000]", group="database")
+def bench_planet_snapshot_restore(ctx: BenchmarkContext):
+    """Lectura, verificación y restauración de un snapshot en un PlanetSystem vacío"""
+    donors = ctx.scale(100000, 10000)
+    directory = tempfile.mkdtemp(prefix="planets_bench_")
+    path = os.path.join(directory, "bench.snap")
+    try:
+        PlanetSnapshot.capture(_snapshot_system(ctx, donors), "bench_session").write(path)
+        result = measure(lambda: PlanetSnapshot.read(path).restore(PlanetSystem()), repeat=ctx.scale(7, 3))
+        result["planets"] = donors
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,72 @@
+# Leaderboard Benchmarks - Ranking incremental del modo competencia
+# Actualización, top-K y rank con 100k donadores
+
+import random
+
+from bench_utils import BenchmarkContext, benchmark, measure
+
+from src.core.leaderboard import Leaderboard
+
+def _populated_leaderboard(donor_count: int, seed: int) -> Leaderboard:
+    """Ranking con donor_count donadores de valores aleatorios"""
+    rng = random.Random(seed)
+    leaderboard = Leaderboard(seed=seed)
+    for donor in range(donor_count):
+        leaderboard.update(donor, donor, rng.randrange(1, 100000))
+    return leaderboard
+
+def _per_operation(result: dict, count: int) -> dict:
+    """Normaliza un resultado de measure() a ms por operación"""
+    for key in ("median", "min", "p95", "mean"):
+        result[key] = round(result[key] / count, 6)
+    result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+    result["unit"] = "ms/op"
+    return result
+
+@benchmark("leaderboard.update[donors=100000]")
+def bench_leaderboard_update(ctx: BenchmarkContext):
+    donor_count = ctx.scale(100000, 10000)
+    leaderboard = _populated_leaderboard(donor_count, ctx.seed)
+    rng = random.Random(ctx.seed + 1)
+    # Donaciones repetidas: el valor solo crece, como en un live
+    updates = [(rng.randrange(donor_count), rng.randrange(1, 500)) for _ in range(ctx.scale(5000, 1000))]
+    
+    def run():
+        for donor, value in updates:
+            leaderboard.update(donor, donor, leaderboard.value(donor) + value)
+    
+    return _per_operation(measure(run, repeat=ctx.scale(5, 3)), len(updates))
+
+@benchmark("leaderboard.top10[donors=100000]")
+def bench_leaderboard_top(ctx: BenchmarkContext):
+    leaderboard = _populated_leaderboard(ctx.scale(100000, 10000), ctx.seed)
+    
+    def run():
+        for _ in range(1000):
+            leaderboard.top(10)
+    
+    return _per_operation(measure(run, repeat=ctx.scale(7, 3)), 1000)
+
+@benchmark("leaderboard.rank[donors=100000]")
+def bench_leaderboard_rank(ctx: BenchmarkContext):
+    donor_count = ctx.scale(100000, 10000)
+    leaderboard = _populated_leaderboard(donor_count, ctx.seed)
+    rng = random.Random(ctx.seed + 2)
+    queries = [rng.randrange(donor_count) for _ in range(ctx.scale(5000, 1000))]
+    
+    def run():
+        for donor in queries:
+            leaderboard.rank(donor)
+    
+    return _per_operation(measure(run, repeat=ctx.scale(5, 3)), len(queries))
+
+@benchmark("leaderboard.sorted_baseline[donors=100000]")
+def bench_leaderboard_sorted_baseline(ctx: BenchmarkContext):
+    # Referencia: ordenar todos los donadores en cada frame
+    rng = random.Random(ctx.seed)
+    values = {donor: rng.randrange(1, 100000) for donor in range(ctx.scale(100000, 10000))}
+    
+    def run():
+        sorted(values.items(), key=lambda item: -item[1])[:10]
+    
+    return measure(run, repeat=ctx.scale(5, 3))
@@ -0,0 +1,122 @@
+# Planet System Benchmarks - Rendimiento de la lógica central de planetas
+# Throughput de add_donation según el número de donadores
+
+from bench_utils import BenchmarkContext, benchmark, generate_donation_stream, generate_donor_names, measure
+
+from src.core.planet_system import PlanetSystem
+from src.core.trend_metrics import TrendAggregator
+
+def _populated_system(donor_count: int, seed: int) -> PlanetSystem:
+    """Crea un sistema con donor_count planetas ya existentes"""
+    planet_system = PlanetSystem()
+    for name in generate_donor_names(donor_count, seed):
+        planet_system.add_donation(name, "rose", 1)
+    return planet_system
+
+def _per_donation(result: dict, count: int) -> dict:
+    """Normaliza un resultado de measure() a ms por donación"""
+    for key in ("median", "min", "p95", "mean"):
+        result[key] = round(result[key] / count, 6)
+    result["ops_per_sec"] = round(1000.0 / result["median"], 1) if result["median"] else None
+    result["unit"] = "ms/donation"
+    return result
+
+def _per_query(result: dict, count: int) -> dict:
+    """Normaliza un resultado de measure() a ms por consulta"""
+    for key in ("median", "min", "p95", "mean"):
+        result[key] = round(result[key] / count, 6)
+    result["unit"] = "ms/query"
+    return result
+
+def _add_donation_benchmark(ctx: BenchmarkContext, donor_count: int):
+    donors = generate_donor_names(donor_count, ctx.seed)
+    planet_system = _populated_system(donor_count, ctx.seed)
+    stream = list(generate_donation_stream(ctx.scale(2000, 300), donors, ctx.seed))
+    
+    def run():
+        for donor, gift, value in stream:
+            planet_system.add_donation(donor, gift, value)
+    
+    return _per_donation(measure(run, repeat=ctx.scale(5, 3)), len(stream))
+
+@benchmark("planet_system.add_donation[donors=100]")
+def bench_add_donation_100(ctx: BenchmarkContext):
+    return _add_donation_benchmark(ctx, 100)
+
+@benchmark("planet_system.add_donation[donors=1000]")
+def bench_add_donation_1000(ctx: BenchmarkContext):
+    return _add_donation_benchmark(ctx, 1000)
+
+@benchmark("planet_system.add_donation[donors=10000]")
+def bench_add_donation_10000(ctx: BenchmarkContext):
+    return _add_donation_benchmark(ctx, ctx.scale(10000, 3000))
+
+@benchmark("planet_system.add_donation[donors=10000,visible=500]")
+def bench_add_donation_wall(ctx: BenchmarkContext):
+    # Vista tipo muro: ventana visible grande
+    donors = generate_donor_names(ctx.scale(10000, 3000), ctx.seed)
+    planet_system = PlanetSystem(max_visible_planets=500)
+    for name in donors:
+        planet_system.add_donation(name, "rose", 1)
+    stream = list(generate_donation_stream(ctx.scale(2000, 300), donors, ctx.seed))
+    
+    def run():
+        for donor, gift, value in stream:
+            planet_system.add_donation(donor, gift, value)
+    
+    return _per_donation(measure(run, repeat=ctx.scale(5, 3)), len(stream))
+
+@benchmark("trend_metrics.record")
+def bench_trend_record(ctx: BenchmarkContext):
+    # Reloj virtual: 50 donaciones por segundo durante varias ventanas
+    now = [0.0]
+    trends = TrendAggregator(clock=lambda: now[0])
+    donors = generate_donor_names(500, ctx.seed)
+    stream = list(generate_donation_stream(ctx.scale(20000, 3000), donors, ctx.seed))
+    
+    def run():
+        for donor, _gift, value in stream:
+            now[0] += 0.02
+            trends.record(donor, value or 1)
+    
+    return _per_donation(measure(run, repeat=ctx.scale(5, 3)), len(stream))
+
+@benchmark("trend_metrics.summary[active_donors=500]")
+def bench_trend_summary(ctx: BenchmarkContext):
+    # Lo que consulta el HUD en cada refresco
+    trends = TrendAggregator()
+    for index, donor in enumerate(generate_donor_names(500, ctx.seed)):
+        trends.record(donor, index % 50 + 1)
+    return measure(trends.get_summary, repeat=ctx.scale(200, 50))
+
+@benchmark("planet_system.suggest_donors[donors=50000]")
+def bench_suggest_donors(ctx: BenchmarkContext):
+    # Lo que consulta el panel de control en cada tecla
+    donors = generate_donor_names(ctx.scale(50000, 10000), ctx.seed)
+    planet_system = PlanetSystem()
+    for name in donors:
+        planet_system.add_donation(name, "rose", 1)
+    prefixes = ["a", "s", donors[0][:2], donors[1][:3], donors[2][:5], "zzz"]
+    
+    def run():
+        for prefix in prefixes:
+            planet_system.suggest_donors(prefix, 5)
+    
+    return _per_query(measure(run, repeat=ctx.scale(200, 50)), len(prefixes))
+
+@benchmark("planet_system.suggest_donors[old_prefix,donors=50000]")
+def bench_suggest_donors_old_prefix(ctx: BenchmarkContext):
+    # Peor caso para recorrer la recencia: los que coinciden con "z" son los más viejos
+    total = ctx.scale(50000, 10000)
+    planet_system = PlanetSystem()
+    for index in range(600):
+        planet_system.add_donation(f"zz{index}", "rose", 1)
+    for index in range(total - 600):
+        planet_system.add_donation(f"a{index}", "rose", 1)
+    prefixes = ["z", "zz", "zz1", "a"]
+    
+    def run():
+        for prefix in prefixes:
+            planet_system.suggest_donors(prefix, 5)
+    
+    return _per_query(measure(run, repeat=ctx.scale(200, 50)), len(prefixes))
@@ -0,0 +1,67 @@
+# Rendering Benchmarks - Tiempo de frame de PlanetDisplay en SDL sin ventana
+# Render de 4 planetas de cada tipo y del overlay del panel de control
+
+from bench_utils import BenchmarkContext, benchmark, init_headless_pygame, measure
+
+from src.models.planet import Planet, PlanetType
+
+# Valor mínimo que produce cada tipo de planeta
+TYPE_VALUES = {planet_type: threshold for threshold, planet_type in Planet.TYPE_THRESHOLDS.items()}
+
+def _render_benchmark(ctx: BenchmarkContext, planet_type: PlanetType):
+    init_headless_pygame()
+    from src.core.planet_system import PlanetSystem
+    from src.ui.planet_display import PlanetDisplay
+    
+    planet_system = PlanetSystem()
+    for index in range(4):
+        planet_system.add_donation(f"{planet_type.value}_{index}", "custom", TYPE_VALUES[planet_type])
+    
+    # Mismo tamaño que la ventana vertical en una pantalla 1080p
+    display = PlanetDisplay(planet_system, display_width=720, display_height=918, layout_mode="vertical")
+    display.render()  # Calentar cachés de fuentes
+    
+    def full_redraw():
+        # Sin cambios render() reutiliza la superficie: forzar el redibujado
+        display.invalidate()
+        display.render()
+    
+    return measure(full_redraw, repeat=ctx.scale(7, 3), number=ctx.scale(50, 10))
+
+def _register(planet_type: PlanetType):
+    @benchmark(f"planet_display.render[4x{planet_type.value}]", group="rendering")
+    def bench(ctx: BenchmarkContext):
+        return _render_benchmark(ctx, planet_type)
+    return bench
+
+for _planet_type in PlanetType:
+    _register(_planet_type)
+
+def _control_panel(typed: str):
+    init_headless_pygame()
+    from src.core.planet_system import PlanetSystem
+    from src.ui.control_panel import ControlPanel
+    
+    panel = ControlPanel(PlanetSystem(), 720, 918)
+    panel._activate_field("donor_name")
+    panel.input_fields["donor_name"].value = typed
+    panel.render()
+    return panel
+
+@benchmark("control_panel.render[idle]", group="rendering")
+def bench_control_panel_idle(ctx: BenchmarkContext):
+    # Caso normal: nada cambió desde el frame anterior
+    panel = _control_panel("donor")
+    return measure(panel.render, repeat=ctx.scale(7, 3), number=ctx.scale(1000, 200))
+
+@benchmark("control_panel.render[rebuild]", group="rendering")
+def bench_control_panel_rebuild(ctx: BenchmarkContext):
+    # Al escribir o parpadear el cursor se recompone el overlay
+    panel = _control_panel("donor")
+    field = panel.input_fields["donor_name"]
+    
+    def rebuild():
+        field.cursor_visible = not field.cursor_visible
+        panel.render()
+    
+    return measure(rebuild, repeat=ctx.scale(7, 3), number=ctx.scale(200, 50))
@@ -0,0 +1,117 @@
+# Benchmark Utilities - Medición y generadores de datos sintéticos
+# Herramientas compartidas por la suite de benchmarks de rendimiento
+
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Registro global de benchmarks: nombre -> (función, grupo)
+BENCHMARKS: Dict[str, Tuple[Callable[["BenchmarkContext"], Dict], str]] = {}
+
+def benchmark(name: str, group: str = "core"):
+    """Decorador que registra una función de benchmark"""
+    def register(func):
+        BENCHMARKS[name] = (func, group)
+        return func
+    return register
+
+class BenchmarkContext:
+    """
+    Parámetros de ejecución compartidos por los benchmarks
+    
+    quick reduce repeticiones y tamaños para ejecuciones rápidas (CI).
+    """
+    
+    def __init__(self, quick: bool = False, seed: int = 1234):
+        self.quick = quick
+        self.seed = seed
+    
+    def scale(self, full: int, quick: int) -> int:
+        """Elige un tamaño según el modo"""
+        return quick if self.quick else full
+
+def measure(func: Callable[[], None], repeat: int = 7, number: int = 1,
+            setup: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Mide func `repeat` veces, cada una ejecutando `number` operaciones
+    
+    Retorna estadísticas en milisegundos por operación. Se reporta la
+    mediana como valor principal (más estable que la media).
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1000.0 / number)
+    return summarize(samples)
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Resume una lista de muestras (ms/op)"""
+    ordered = sorted(samples_ms)
+    median = statistics.median(ordered)
+    p95 = percentile(ordered, 0.95)
+    return {
+        "unit": "ms/op",
+        "median": round(median, 6),
+        "min": round(ordered[0], 6),
+        "p95": round(p95, 6),
+        "mean": round(statistics.fmean(ordered), 6),
+        "ops_per_sec": round(1000.0 / median, 1) if median > 0 else None,
+        "samples": len(ordered)
+    }
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def generate_donor_names(count: int, seed: int = 1234) -> List[str]:
+    """Genera nombres de donadores únicos con aspecto realista"""
+    rnd = random.Random(seed)
+    prefixes = ["star", "luna", "cosmo", "nova", "astro", "orbit", "nebula", "comet", "solar", "pixel"]
+    suffixes = ["fan", "gamer", "live", "tv", "queen", "king", "xx", "pro", "mx", "_oficial"]
+    names = []
+    for index in range(count):
+        names.append(f"{rnd.choice(prefixes)}{rnd.choice(suffixes)}{index}")
+    return names
+
+def generate_donation_stream(count: Optional[int], donors: List[str], seed: int = 1234,
+                             hot_fraction: float = 0.1) -> Iterator[Tuple[str, str, int]]:
+    """
+    Genera (donador, regalo, valor) con una distribución de live real
+    
+    Un pequeño grupo de donadores "calientes" concentra la mayoría de
+    regalos; los valores siguen una distribución de cola larga. Con
+    count=None el flujo es infinito.
+    """
+    rnd = random.Random(seed)
+    hot = donors[:max(1, int(len(donors) * hot_fraction))]
+    gifts = [("rose", 1), ("perfume", 5), ("glow_stick", 10), ("heart_me", 25),
+             ("birthday_cake", 50), ("motorcycle", 100), ("sports_car", 500), ("yacht", 1000)]
+    weights = [50, 20, 10, 8, 5, 4, 2, 1]
+    emitted = 0
+    while count is None or emitted < count:
+        emitted += 1
+        donor = rnd.choice(hot) if rnd.random() < 0.7 else rnd.choice(donors)
+        gift, value = rnd.choices(gifts, weights)[0]
+        yield donor, gift, value
+
+def init_headless_pygame():
+    """Inicializa pygame sin ventana real (SDL dummy)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    return pygame
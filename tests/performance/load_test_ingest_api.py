@@ -0,0 +1,140 @@
+# Load Test - Prueba de carga de la API local de ingesta
+# Reporta peticiones por segundo y latencias p50/p95/p99
+#
+# Uso:
+#   python tests/performance/load_test_ingest_api.py --spawn
+#   python tests/performance/load_test_ingest_api.py --port 8765 --mode batch --batch-size 100
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.api.ingest_server import IngestApiServer
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano sobre una lista ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def build_request(host: str, port: int, mode: str, batch_size: int, counter: int, token: str = "") -> bytes:
+    """Construye la petición HTTP cruda para el modo elegido"""
+    if mode == "single":
+        path = "/donations"
+        body = json.dumps({"donor_name": f"load_{counter % 5000}", "value": 1 + counter % 50})
+    elif mode == "batch":
+        path = "/donations/batch"
+        body = json.dumps([{"donor_name": f"load_{(counter + i) % 5000}", "value": 1}
+                           for i in range(batch_size)])
+    else:
+        path = "/donations/stream"
+        body = "\n".join(json.dumps({"donor_name": f"load_{(counter + i) % 5000}", "value": 1})
+                         for i in range(batch_size))
+    data = body.encode("utf-8")
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\n{auth}"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n")
+    return head.encode("latin-1") + data
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Lee una respuesta completa y retorna el código de estado"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    if length:
+        await reader.readexactly(length)
+    return status
+
+async def client_worker(host: str, port: int, mode: str, batch_size: int,
+                        requests: int, latencies: List[float], errors: List[int], token: str = ""):
+    """Cliente keep-alive que envía peticiones en serie"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for counter in range(requests):
+            payload = build_request(host, port, mode, batch_size, counter, token)
+            start = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, connections: int, total_requests: int,
+                   mode: str, batch_size: int, token: str = ""):
+    """Lanza los clientes concurrentes y reporta resultados"""
+    latencies: List[float] = []
+    errors: List[int] = []
+    per_client = max(1, total_requests // connections)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client_worker(host, port, mode, batch_size, per_client, latencies, errors, token)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    completed = len(latencies)
+    donations = completed * (1 if mode == "single" else batch_size)
+    print(f"mode={mode} connections={connections} requests={completed} errors={len(errors)}")
+    print(f"elapsed:        {elapsed:.2f} s")
+    print(f"requests/sec:   {completed / elapsed:,.0f}")
+    print(f"donations/sec:  {donations / elapsed:,.0f}")
+    print(f"latency p50:    {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"latency p95:    {percentile(latencies, 0.95) * 1000:.2f} ms")
+    print(f"latency p99:    {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+def spawn_server(max_batch_size: int) -> IngestApiServer:
+    """Inicia un servidor en proceso con un consumidor que vacía la cola"""
+    server = IngestApiServer(port=0, max_batch_size=max_batch_size)
+    server.source.max_queue_size = 10_000_000
+    if not server.start():
+        sys.exit("could not start ingest server")
+    
+    def drain():
+        while True:
+            if server.source.pop_event() is None:
+                time.sleep(0.001)
+    threading.Thread(target=drain, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the local ingest API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="start an in-process server")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--mode", choices=("single", "batch", "stream"), default="single")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--token", default="", help="api.token of the server, if it requires one")
+    args = parser.parse_args()
+    
+    port = args.port
+    server = None
+    if args.spawn:
+        server = spawn_server(max(args.batch_size, 1000))
+        port = server.port
+    
+    try:
+        asyncio.run(run_load(args.host, port, args.connections, args.requests,
+                             args.mode, args.batch_size, args.token))
+    finally:
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Run Benchmarks - Ejecuta la suite de rendimiento y compara con baselines
+# Detecta regresiones en los caminos calientes de la aplicación
+#
+# Uso:
+#   python tests/performance/run_benchmarks.py run [--quick] [--filter database] [--output results.json]
+#   python tests/performance/run_benchmarks.py save-baseline [--name local]
+#   python tests/performance/run_benchmarks.py compare [--baseline baselines/local.json] [--threshold 0.15]
+
+import argparse
+import datetime
+import glob
+import importlib
+import json
+import os
+import platform
+import sys
+import traceback
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import BENCHMARKS, BenchmarkContext
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+def load_benchmark_modules():
+    """Importa todos los bench_*.py para registrar sus benchmarks"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(directory, "bench_*.py"))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        if module_name != "bench_utils":
+            importlib.import_module(module_name)
+
+def run_suite(ctx: BenchmarkContext, name_filter: Optional[str] = None) -> Dict:
+    """Ejecuta los benchmarks registrados y retorna el documento de resultados"""
+    load_benchmark_modules()
+    results = {}
+    
+    for name, (func, group) in sorted(BENCHMARKS.items()):
+        if name_filter and name_filter not in name and name_filter != group:
+            continue
+        print(f"  {name:<50}", end="", flush=True)
+        try:
+            result = func(ctx)
+        except ImportError as e:
+            # Dependencia opcional ausente (p. ej. pygame en un servidor)
+            results[name] = {"skipped": str(e)}
+            print(f"skipped ({e})")
+            continue
+        except Exception as e:
+            traceback.print_exc()
+            results[name] = {"error": repr(e)}
+            print("error")
+            continue
+        result["group"] = group
+        results[name] = result
+        print(f"{result['median']:>12.4f} {result['unit']}")
+    
+    return {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": ctx.quick
+        },
+        "results": results
+    }
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> int:
+    """
+    Compara medianas y reporta regresiones mayores que threshold
+    
+    Retorna el número de regresiones encontradas.
+    """
+    regressions = 0
+    print(f"\n{'benchmark':<50}{'baseline':>12}{'current':>12}{'change':>10}")
+    
+    for name, base in sorted(baseline["results"].items()):
+        now = current["results"].get(name)
+        if "median" not in base or not now or "median" not in now:
+            continue
+        if base.get("unit") != now.get("unit"):
+            print(f"{name:<50}{'unit mismatch':>34}")
+            continue
+        
+        change = (now["median"] - base["median"]) / base["median"] if base["median"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  improved"
+        print(f"{name:<50}{base['median']:>12.4f}{now['median']:>12.4f}{change:>+10.1%}{flag}")
+    
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        print(f"\nmissing in current run: {', '.join(missing)}")
+    
+    print(f"\n{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+def write_json(path: str, document: Dict):
+    """Guarda un documento de resultados"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nwritten {path}")
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    common.add_argument("--filter", help="only benchmarks whose name or group contains this text")
+    
+    parser = argparse.ArgumentParser(description="Performance benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = subparsers.add_parser("run", parents=[common], help="run the suite")
+    run_parser.add_argument("--output", help="write results to this JSON file")
+    
+    save_parser = subparsers.add_parser("save-baseline", parents=[common], help="run the suite and store a baseline")
+    save_parser.add_argument("--name", default=platform.node() or "local")
+    
+    compare_parser = subparsers.add_parser("compare", parents=[common], help="compare against a baseline")
+    compare_parser.add_argument("--baseline", help="baseline JSON (default: baselines/<host>.json)")
+    compare_parser.add_argument("--current", help="existing results JSON instead of running the suite")
+    compare_parser.add_argument("--threshold", type=float, default=0.15,
+                                help="relative slowdown that counts as a regression (default 0.15)")
+    
+    args = parser.parse_args()
+    ctx = BenchmarkContext(quick=args.quick)
+    
+    if args.command == "run":
+        document = run_suite(ctx, args.filter)
+        if args.output:
+            write_json(args.output, document)
+    
+    elif args.command == "save-baseline":
+        document = run_suite(ctx, args.filter)
+        write_json(os.path.join(BASELINE_DIR, f"{args.name}.json"), document)
+    
+    elif args.command == "compare":
+        baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{platform.node() or 'local'}.json")
+        if not os.path.exists(baseline_path):
+            sys.exit(f"baseline not found: {baseline_path} (run save-baseline first)")
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        
+        if args.current:
+            with open(args.current, encoding="utf-8") as f:
+                current = json.load(f)
+        else:
+            current = run_suite(ctx, args.filter)
+        
+        if baseline["meta"].get("machine") != current["meta"].get("machine"):
+            print("warning: baseline was recorded on a different machine")
+        
+        if compare_results(baseline, current, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
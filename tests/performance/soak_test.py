@@ -0,0 +1,365 @@
+# Soak Test - Prueba de resistencia de sesiones largas
+# Conduce el loop real de MainWindow sin ventana con un live simulado comprimido en el tiempo
+#
+# Uso:
+#   python tests/performance/soak_test.py                      # 10 h de live en 10 min
+#   python tests/performance/soak_test.py --hours 6 --minutes 5 --rate 3
+#   python tests/performance/soak_test.py --report soak.json --max-rss-growth-mb 30
+#
+# El reloj del live es virtual: avanza `compresión` veces más rápido que
+# el reloj real y las donaciones llegan con su hora virtual. El loop se
+# ejecuta sin límite de FPS para medir el costo real de cada frame. Si la
+# aplicación no sostiene el ritmo, el reloj virtual se retrasa y la prueba
+# dura más que el presupuesto (ver effective_compression en el reporte).
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import generate_donation_stream, generate_donor_names, percentile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from src.core.session_manager import SessionManager
+from src.ui.main_window import MainWindow
+
+def read_rss_mb() -> Optional[float]:
+    """Memoria residente actual del proceso en MB (None si no se puede medir)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def database_size_mb(db_path: str) -> float:
+    """Tamaño de la base más sus archivos auxiliares (WAL, journal)"""
+    total = 0
+    for suffix in ("", "-wal", "-journal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            total += os.path.getsize(db_path + suffix)
+    return total / (1024 * 1024)
+
+def count_surfaces() -> int:
+    """Número de pygame.Surface vivas (recorre el heap, solo en muestreos)"""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, pygame.Surface))
+
+class SoakLimits:
+    """Límites de crecimiento y deriva que hacen fallar la prueba"""
+    
+    def __init__(self, max_rss_growth_mb: float = 50.0, max_heap_growth_mb: float = 25.0,
+                 max_frame_p99_drift: float = 1.5, max_db_mb: float = 200.0,
+                 max_surface_growth: int = 50):
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.max_heap_growth_mb = max_heap_growth_mb
+        self.max_frame_p99_drift = max_frame_p99_drift
+        self.max_db_mb = max_db_mb
+        self.max_surface_growth = max_surface_growth
+    
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+class SoakRunner:
+    """
+    Ejecuta una sesión larga simulada sobre la MainWindow real
+    
+    Cada `sample_minutes` de tiempo virtual se toma una muestra de RSS,
+    heap de Python (tracemalloc), percentiles de frame, tamaño de la base
+    y contadores del sistema de planetas. La línea base para medir
+    crecimiento es la primera muestra tras el calentamiento, así no se
+    penaliza la memoria que el proceso reserva al arrancar.
+    """
+    
+    def __init__(self, hours: float = 10.0, minutes: float = 10.0, rate: float = 2.0,
+                 donors: int = 5000, sample_minutes: float = 30.0, warmup_fraction: float = 0.1,
+                 use_tracemalloc: bool = True, seed: int = 1234, db_path: Optional[str] = None):
+        self.virtual_seconds_total = hours * 3600.0
+        self.real_seconds_budget = minutes * 60.0
+        self.compression = self.virtual_seconds_total / self.real_seconds_budget
+        self.rate = rate
+        self.donor_count = donors
+        self.sample_seconds = sample_minutes * 60.0
+        self.warmup_fraction = warmup_fraction
+        self.use_tracemalloc = use_tracemalloc
+        self.seed = seed
+        
+        self._temp_dir = None
+        if db_path is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="planets_soak_")
+            db_path = os.path.join(self._temp_dir, "soak.db")
+        self.db_path = db_path
+        
+        self.samples: List[Dict] = []
+        self.frame_times_ms: List[float] = []
+        self.donations_applied = 0
+        self._baseline_snapshot = None
+        self._final_snapshot = None
+    
+    def run(self) -> Dict:
+        """Ejecuta la sesión simulada y retorna el documento del reporte"""
+        if self.use_tracemalloc:
+            tracemalloc.start(10)
+        
+        session_manager = SessionManager(self.db_path)
+        window = MainWindow(session_manager)
+        
+        rnd = random.Random(self.seed)
+        stream = generate_donation_stream(None, generate_donor_names(self.donor_count, self.seed), self.seed)
+        session_start = datetime.datetime(2025, 1, 1, 20, 0, 0)
+        next_arrival = rnd.expovariate(self.rate)
+        next_sample = 0.0
+        window_frames: List[float] = []
+        window_ingest: List[float] = []
+        
+        started = time.perf_counter()
+        last_frame = started
+        virtual = 0.0
+        try:
+            while window.running and virtual < self.virtual_seconds_total:
+                frame_start = time.perf_counter()
+                target = min(virtual + (frame_start - last_frame) * self.compression, self.virtual_seconds_total)
+                
+                # Donaciones vencidas en el reloj virtual, con los mismos topes
+                # por frame (cantidad y tiempo) que la ingesta real; si la app
+                # no da abasto, el reloj virtual se retrasa en vez de acumular cola
+                deadline = frame_start + window.ingest_budget_ms / 1000.0
+                applied = 0
+                while (next_arrival <= target and applied < window.max_events_per_frame
+                       and (applied == 0 or time.perf_counter() < deadline)):
+                    donor, gift, value = next(stream)
+                    window._process_new_donation({
+                        "donor_name": donor,
+                        "gift_type": gift,
+                        "custom_value": value,
+                        "timestamp": session_start + datetime.timedelta(seconds=next_arrival)
+                    })
+                    self.donations_applied += 1
+                    applied += 1
+                    next_arrival += rnd.expovariate(self.rate)
+                virtual = target if next_arrival > target else next_arrival
+                ingest_ms = (time.perf_counter() - frame_start) * 1000.0
+                
+                window.step(int((frame_start - last_frame) * 1000))
+                last_frame = frame_start
+                
+                frame_ms = (time.perf_counter() - frame_start) * 1000.0
+                self.frame_times_ms.append(frame_ms)
+                window_frames.append(frame_ms)
+                window_ingest.append(ingest_ms)
+                
+                if virtual >= next_sample:
+                    self._take_sample(window, virtual, time.perf_counter() - started, window_frames, window_ingest)
+                    window_frames = []
+                    window_ingest = []
+                    next_sample += self.sample_seconds
+            
+            if window_frames:
+                self._take_sample(window, virtual, time.perf_counter() - started, window_frames, window_ingest)
+        finally:
+            window.shutdown()
+            session_manager.close_session()
+            if self.use_tracemalloc:
+                self._final_snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+        
+        return self._build_report(time.perf_counter() - started)
+    
+    def _take_sample(self, window: MainWindow, virtual: float, real: float,
+                     frames: List[float], ingest: List[float]):
+        """Registra una muestra de memoria, frames y tamaño de datos"""
+        ordered = sorted(frames)
+        sample = {
+            "virtual_hours": round(virtual / 3600.0, 3),
+            "real_seconds": round(real, 1),
+            "frames": len(frames),
+            "frame_p50_ms": round(percentile(ordered, 0.50), 3),
+            "frame_p95_ms": round(percentile(ordered, 0.95), 3),
+            "frame_p99_ms": round(percentile(ordered, 0.99), 3),
+            "ingest_p99_ms": round(percentile(sorted(ingest), 0.99), 3),
+            "rss_mb": read_rss_mb(),
+            "db_mb": round(database_size_mb(self.db_path), 3),
+            "planets": len(window.planet_system.planets),
+            "history_entries": sum(len(planet.donations_history) for planet in window.planet_system.planets),
+            "surfaces": count_surfaces(),
+            "donations": self.donations_applied
+        }
+        
+        if self.use_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            sample["heap_mb"] = round(tracemalloc.get_traced_memory()[0] / (1024 * 1024), 3)
+            sample["top_allocators"] = [
+                {"where": str(stat.traceback[0]), "kb": round(stat.size / 1024, 1), "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:5]
+            ]
+            if self._baseline_snapshot is None and virtual >= self.virtual_seconds_total * self.warmup_fraction:
+                self._baseline_snapshot = snapshot
+        
+        if sample["rss_mb"] is not None:
+            sample["rss_mb"] = round(sample["rss_mb"], 2)
+        self.samples.append(sample)
+        print(f"  {sample['virtual_hours']:>6.2f} h  real={sample['real_seconds']} s  rss={sample['rss_mb']} MB  "
+              f"heap={sample.get('heap_mb', '-')} MB  p99={sample['frame_p99_ms']} ms  "
+              f"db={sample['db_mb']} MB  planets={sample['planets']}  history={sample['history_entries']}",
+              flush=True)
+    
+    def _baseline_sample(self) -> Dict:
+        """Primera muestra posterior al calentamiento"""
+        threshold = self.virtual_seconds_total * self.warmup_fraction / 3600.0
+        for sample in self.samples:
+            if sample["virtual_hours"] >= threshold:
+                return sample
+        return self.samples[0]
+    
+    def _build_report(self, real_seconds: float) -> Dict:
+        """Arma el documento del reporte con muestras y crecimiento"""
+        ordered = sorted(self.frame_times_ms)
+        report = {
+            "meta": {
+                "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "virtual_hours": round(self.virtual_seconds_total / 3600.0, 2),
+                "real_seconds": round(real_seconds, 1),
+                "compression": round(self.compression, 1),
+                "effective_compression": round(self.virtual_seconds_total / real_seconds, 1) if real_seconds else None,
+                "donation_rate_per_second": self.rate,
+                "donor_pool": self.donor_count,
+                "donations": self.donations_applied,
+                "frames": len(self.frame_times_ms),
+                "tracemalloc": self.use_tracemalloc
+            },
+            "frames": {
+                "p50_ms": round(percentile(ordered, 0.50), 3),
+                "p95_ms": round(percentile(ordered, 0.95), 3),
+                "p99_ms": round(percentile(ordered, 0.99), 3),
+                "max_ms": round(ordered[-1], 3) if ordered else 0.0
+            },
+            "samples": self.samples
+        }
+        
+        if self._baseline_snapshot is not None and self._final_snapshot is not None:
+            report["top_growth"] = [
+                {"where": str(stat.traceback[0]), "kb_diff": round(stat.size_diff / 1024, 1),
+                 "count_diff": stat.count_diff}
+                for stat in self._final_snapshot.compare_to(self._baseline_snapshot, "lineno")[:10]
+            ]
+        return report
+    
+    def evaluate(self, report: Dict, limits: SoakLimits) -> List[str]:
+        """Compara crecimiento y deriva con los límites; retorna las fallas"""
+        failures = []
+        if not self.samples:
+            return ["no samples were taken"]
+        
+        baseline = self._baseline_sample()
+        last = self.samples[-1]
+        growth = {}
+        
+        if baseline["rss_mb"] is not None and last["rss_mb"] is not None:
+            growth["rss_mb"] = round(last["rss_mb"] - baseline["rss_mb"], 2)
+            if growth["rss_mb"] > limits.max_rss_growth_mb:
+                failures.append(f"RSS grew {growth['rss_mb']} MB (limit {limits.max_rss_growth_mb} MB)")
+        
+        if "heap_mb" in last and "heap_mb" in baseline:
+            growth["heap_mb"] = round(last["heap_mb"] - baseline["heap_mb"], 3)
+            if growth["heap_mb"] > limits.max_heap_growth_mb:
+                failures.append(f"Python heap grew {growth['heap_mb']} MB (limit {limits.max_heap_growth_mb} MB)")
+        
+        if baseline["frame_p99_ms"] > 0:
+            growth["frame_p99_drift"] = round(last["frame_p99_ms"] / baseline["frame_p99_ms"], 3)
+            if growth["frame_p99_drift"] > limits.max_frame_p99_drift:
+                failures.append(f"frame p99 drifted x{growth['frame_p99_drift']} "
+                                f"({baseline['frame_p99_ms']} -> {last['frame_p99_ms']} ms, "
+                                f"limit x{limits.max_frame_p99_drift})")
+        
+        if last["db_mb"] > limits.max_db_mb:
+            failures.append(f"database reached {last['db_mb']} MB (limit {limits.max_db_mb} MB)")
+        
+        growth["surfaces"] = last["surfaces"] - baseline["surfaces"]
+        if growth["surfaces"] > limits.max_surface_growth:
+            failures.append(f"live surfaces grew by {growth['surfaces']} (limit {limits.max_surface_growth})")
+        
+        growth["history_entries"] = last["history_entries"] - baseline["history_entries"]
+        report["growth"] = growth
+        report["limits"] = limits.to_dict()
+        report["failures"] = failures
+        report["passed"] = not failures
+        return failures
+    
+    def cleanup(self):
+        """Elimina la base temporal"""
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test for long live sessions")
+    parser.add_argument("--hours", type=float, default=10.0, help="simulated live duration (default 10)")
+    parser.add_argument("--minutes", type=float, default=10.0, help="real time budget (default 10)")
+    parser.add_argument("--rate", type=float, default=2.0, help="donations per simulated second (default 2)")
+    parser.add_argument("--donors", type=int, default=5000, help="size of the donor pool (default 5000)")
+    parser.add_argument("--sample-minutes", type=float, default=30.0,
+                        help="simulated minutes between samples (default 30)")
+    parser.add_argument("--warmup", type=float, default=0.1,
+                        help="fraction of the run excluded from growth baselines (default 0.1)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip Python heap tracking (faster)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--db", help="database path (default: temporary file)")
+    parser.add_argument("--report", default="soak_report.json", help="report JSON path")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0)
+    parser.add_argument("--max-heap-growth-mb", type=float, default=25.0)
+    parser.add_argument("--max-frame-p99-drift", type=float, default=1.5,
+                        help="allowed ratio between final and baseline frame p99")
+    parser.add_argument("--max-db-mb", type=float, default=200.0)
+    parser.add_argument("--max-surface-growth", type=int, default=50)
+    args = parser.parse_args()
+    
+    limits = SoakLimits(args.max_rss_growth_mb, args.max_heap_growth_mb, args.max_frame_p99_drift,
+                        args.max_db_mb, args.max_surface_growth)
+    runner = SoakRunner(hours=args.hours, minutes=args.minutes, rate=args.rate, donors=args.donors,
+                        sample_minutes=args.sample_minutes, warmup_fraction=args.warmup,
+                        use_tracemalloc=not args.no_tracemalloc, seed=args.seed, db_path=args.db)
+    
+    print(f"soak: {args.hours} h simulated in {args.minutes} min (x{runner.compression:.0f})")
+    try:
+        report = runner.run()
+        failures = runner.evaluate(report, limits)
+    finally:
+        runner.cleanup()
+        pygame.quit()
+    
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\nframes={report['meta']['frames']} donations={report['meta']['donations']} "
+          f"p50={report['frames']['p50_ms']} ms p99={report['frames']['p99_ms']} ms")
+    print(f"growth: {report['growth']}")
+    for entry in report.get("top_growth", [])[:5]:
+        print(f"  {entry['kb_diff']:>+10.1f} KB  {entry['where']}")
+    print(f"report written to {args.report}")
+    
+    if failures:
+        print("\nFAILED")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nPASSED")
+
+if __name__ == "__main__":
+    main()